@@ -1,22 +1,32 @@
 # Copyright (c) 2025 tree_division
 # Licensed under the MIT License
 
-import pygame
-
 from pygame.sprite import Sprite
 
+import transform_cache
+
+# 每一关外星人的着色（按等级循环），None表示原色
+LEVEL_TINTS = (None, (255, 190, 190), (190, 255, 190), (190, 200, 255), (255, 255, 160))
+
 
 class Alien(Sprite):
     """A class to represent a single alien in the fleet."""
 
+    # 外星人数量随舰队规模增长，属性放在__slots__中。pygame的Sprite没有定义__slots__，
+    # 实例仍然有__dict__，但它保持为空（只在被访问时才创建）；
+    # 图像由图集共享，屏幕尺寸从settings读取，不再每个外星人保存一份
+    __slots__ = ('_Sprite__g', 'settings', 'base_image', 'image', 'rect', 'x', 'y',
+                 'dive_path', 'dive_frame')
+
     def __init__(self, ai_game):
         """Initialize the alien and set its starting position."""
         super().__init__()
-        self.screen = ai_game.screen
         self.settings = ai_game.settings
 
         # Load the alien image and set its rect attribute.
-        self.image = pygame.image.load('images/alien.png')
+        # 所有外星人共享同一张图像（图集中的子表面或这一关着色后的图像）
+        self.base_image = ai_game.alien_image
+        self.image = self.base_image
         self.rect = self.image.get_rect()
 
         # Start each new alien near the top left of the screen.
@@ -26,12 +36,40 @@ class Alien(Sprite):
         # Store the alien's exact horizontal position.
         self.x = float(self.rect.x)
 
+        # 在队形中的位置(x, y)；俯冲时rect在此基础上加上路径表中的偏移
+        self.y = self.rect.y
+        self.dive_path = None
+        self.dive_frame = 0
+
     def check_edges(self):
         """Return True if alien is at edge of screen."""
-        screen_rect = self.screen.get_rect()
-        return (self.rect.right >= screen_rect.right) or (self.rect.left <= 0)
+        # 按队形中的位置和大小判断；俯冲时rect是旋转后的图像，不影响舰队转向
+        return (self.x + self.base_image.get_width() >= self.settings.screen_width
+                or self.x <= 0)
+
+    def start_dive(self, path):
+        """开始沿预先计算好的路径俯冲"""
+        self.dive_path = path
+        self.dive_frame = 0
 
     def update(self):
         """Move the alien right or left."""
+        # 队形位置照常移动，俯冲结束时正好回到队形中
         self.x += self.settings.alien_speed * self.settings.fleet_direction
-        self.rect.x = self.x
\ No newline at end of file
+        if self.dive_path is None:
+            self.rect.x = self.x
+            self.rect.y = self.y
+            return
+
+        offset_x, offset_y, angle = self.dive_path[self.dive_frame]
+        self.dive_frame += 1
+        if self.dive_frame == len(self.dive_path) or not self.settings.rotate_divers:
+            angle = 0
+        if self.dive_frame == len(self.dive_path):
+            self.dive_path = None
+
+        # 旋转后的图像来自缓存；图像尺寸会变化，保持中心位置不变
+        self.image = transform_cache.get(self.base_image, angle)
+        width, height = self.base_image.get_size()
+        self.rect = self.image.get_rect(center=(self.x + offset_x + width / 2,
+                                                self.y + offset_y + height / 2))
\ No newline at end of file
@@ -1,9 +1,16 @@
 # Copyright (c) 2025 tree_division
 # Licensed under the MIT License
 
+import argparse
+import asyncio
+import os
 import sys
-from time import sleep
+from time import perf_counter, sleep
 
+# 用于统计启动耗时（包括导入pygame等模块的时间）
+_IMPORT_START = perf_counter()
+
+import numpy as np
 import pygame
 
 from settings import Settings
@@ -11,10 +18,32 @@ from game_stats import GameStats
 from scoreboard import Scoreboard
 from button import Button
 from ship import Ship
-from bullet import Bullet
-from alien import Alien
+from bullet import BULLET, spawn_bullet
+from alien import Alien, LEVEL_TINTS
+from ecs import (World, movement_system, make_culling_system, make_render_system,
+                 render_commands, draw_commands)
+from enemy_fire import ENEMY_PROJECTILE, EnemyFire
+from particles import ParticleSystem
+from starfield import Starfield
+from dive import DiveController
+from spectator import Frame, SpectatorServer, make_points
+from simulation import RenderSnapshot, SimulationThread
+from async_loop import BackgroundTasks
+from sampling_profiler import SamplingProfiler
+from metrics_server import GameMetrics, MetricsServer
+from input_system import FIRE, LEFT, RIGHT, InputSystem
+import asset_pack
+import collision
+import sprite_atlas
+import transform_cache
 from sound import SoundManager
 from data_manager import DataManager
+from renderer import create_renderer
+from frame_capture import FrameCapture
+from frame_governor import FrameGovernor
+from startup_profiler import StartupProfiler
+import telemetry
+from telemetry import TelemetryRecorder
 
 class SettingsGUI:
     """设置GUI主类"""
@@ -25,24 +54,18 @@ class SettingsGUI:
         self.sound_manager = ai_game.sound_manager
         self.visible = False
         
-        # 初始化字体
-        self._init_fonts()
+        # 字体在第一次打开设置界面时才初始化
+        self.fonts_loaded = False
         
         # 创建UI组件
         self._create_ui_components()
         
     def _init_fonts(self):
         """Initialize fonts"""
-        try:
-            # 使用Consolas等宽字体
-            self.title_font = pygame.font.SysFont("Consolas", 36, bold=True)
-            self.font = pygame.font.SysFont("Consolas", 24)
-            self.small_font = pygame.font.SysFont("Consolas", 18)
-        except:
-            # 如果Consolas不可用，使用默认字体
-            self.title_font = pygame.font.SysFont(None, 36, bold=True)
-            self.font = pygame.font.SysFont(None, 24)
-            self.small_font = pygame.font.SysFont(None, 18)
+        # 使用Consolas等宽字体（资源包中有时从资源包加载）
+        self.title_font = asset_pack.load_font("Consolas", 36, bold=True)
+        self.font = asset_pack.load_font("Consolas", 24)
+        self.small_font = asset_pack.load_font("Consolas", 18)
         
     def _create_ui_components(self):
         screen_width = self.settings.screen_width
@@ -60,20 +83,23 @@ class SettingsGUI:
     def draw(self):
         if not self.visible:
             return
+
+        screen = self.ai_game.renderer.begin_overlay()
             
-        # Draw semi-transparent background
-        overlay = pygame.Surface((self.settings.screen_width, self.settings.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))  # Semi-transparent black
-        self.screen.blit(overlay, (0, 0))
+        # Draw semi-transparent background（高负载时省略）
+        if not self.ai_game.governor.under_load:
+            overlay = pygame.Surface((self.settings.screen_width, self.settings.screen_height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 180))  # Semi-transparent black
+            screen.blit(overlay, (0, 0))
         
         # Draw panel background
-        pygame.draw.rect(self.screen, (50, 50, 70), self.panel_rect, border_radius=15)
-        pygame.draw.rect(self.screen, (100, 100, 130), self.panel_rect, 3, border_radius=15)
+        pygame.draw.rect(screen, (50, 50, 70), self.panel_rect, border_radius=15)
+        pygame.draw.rect(screen, (100, 100, 130), self.panel_rect, 3, border_radius=15)
         
         # Draw title
         title_text = self.title_font.render("Game Settings", True, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.panel_rect.centerx, self.panel_rect.y + 40))
-        self.screen.blit(title_text, title_rect)
+        screen.blit(title_text, title_rect)
         
         # Draw settings information with proper spacing
         start_y = self.panel_rect.y + 90
@@ -99,11 +125,11 @@ class SettingsGUI:
         for i, info in enumerate(settings_info):
             text_surface = self.font.render(info, True, (255, 255, 255))
             text_rect = text_surface.get_rect(midleft=(self.panel_rect.x + 40, start_y + i * line_height))
-            self.screen.blit(text_surface, text_rect)
+            screen.blit(text_surface, text_rect)
         
         # Draw separator line
         separator_y = start_y + len(settings_info) * line_height + 20
-        pygame.draw.line(self.screen, (100, 100, 100), 
+        pygame.draw.line(screen, (100, 100, 100), 
                         (self.panel_rect.x + 40, separator_y),
                         (self.panel_rect.x + self.panel_rect.width - 40, separator_y), 2)
         
@@ -118,7 +144,7 @@ class SettingsGUI:
             color = (180, 180, 255) if i < 2 else (200, 200, 200)
             text_surface = self.small_font.render(instruction, True, color)
             text_rect = text_surface.get_rect(center=(self.panel_rect.centerx, instructions_y + i * 22))
-            self.screen.blit(text_surface, text_rect)
+            screen.blit(text_surface, text_rect)
         
     def handle_event(self, event):
         if not self.visible:
@@ -140,6 +166,9 @@ class SettingsGUI:
         
     def show(self):
         """Show settings interface"""
+        if not self.fonts_loaded:
+            self._init_fonts()
+            self.fonts_loaded = True
         self.visible = True
         
     def hide(self):
@@ -149,58 +178,320 @@ class SettingsGUI:
 class AlienInvasion:
     """Overall class to manage game assets and behavior."""
 
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init()
-        self.clock = pygame.time.Clock()
-        self.settings = Settings()
+    def __init__(self, renderer=None, render_scale=None, lazy_init=None,
+                 profile_startup=False, record=False, profile=False):
+        """Initialize the game, and create game resources.
+
+        renderer, render_scale: 覆盖config.json中的渲染设置（基准测试时使用）
+        lazy_init: 覆盖config.json中的延迟初始化设置
+        profile_startup: 第一帧显示后打印各启动阶段的耗时
+        record: 从第一帧开始录制画面
+        profile: 从启动开始运行采样分析器
+        """
+        self.startup = StartupProfiler(_IMPORT_START)
+        self.startup.add_stage("imports", perf_counter() - _IMPORT_START)
+        self.profile_startup = profile_startup
+
+        with self.startup.stage("settings"):
+            self.settings = Settings()
+        self.lazy_init = self.settings.lazy_init if lazy_init is None else lazy_init
+
+        # 延迟模式只初始化显示（包括事件）和字体模块，混音器等到第一次需要时再初始化
+        with self.startup.stage("pygame init"):
+            if self.lazy_init:
+                pygame.display.init()
+                pygame.font.init()
+            else:
+                pygame.init()
+
+        # 帧率控制：落后时跳过渲染而不是拖慢游戏逻辑
+        self.governor = FrameGovernor(self.settings.target_fps,
+                                      self.settings.max_frame_skip)
+
+        # 输入：过滤不需要的事件，每帧生成一个输入快照
+        self.input = InputSystem()
         
         # 创建数据管理器
-        self.data_manager = DataManager()
+        with self.startup.stage("data manager"):
+            self.data_manager = DataManager(lazy=self.lazy_init, background=True)
 
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height))
-        pygame.display.set_caption("Alien Invasion")
+        # 创建渲染后端；游戏代码通过它绘制，而不是直接blit到display表面
+        with self.startup.stage("display"):
+            self.renderer = create_renderer(
+                renderer or self.settings.renderer,
+                (self.settings.screen_width, self.settings.screen_height),
+                "Alien Invasion",
+                render_scale=render_scale or self.settings.render_scale,
+                scale_filter=self.settings.scale_filter)
+            self.screen = self.renderer.screen
+            self.starfield = self._create_starfield()
 
         # 创建音效管理器实例
-        self.sound_manager = SoundManager(self.settings)
+        with self.startup.stage("sound"):
+            self.sound_manager = SoundManager(self.settings, lazy=self.lazy_init)
+
+        # 遥测：记录每局中的射击、击杀、被击中和升级事件
+        self.telemetry = TelemetryRecorder(self.settings.telemetry_enabled,
+                                           self.settings.telemetry_directory)
 
         # Create an instance to store game statistics,
         #   and create a scoreboard.
-        self.stats = GameStats(self)
-        self.sb = Scoreboard(self)
+        with self.startup.stage("scoreboard"):
+            self.stats = GameStats(self)
+            self.sb = Scoreboard(self)
+
+        # 精确碰撞：矩形重叠之后再比较图像的不透明像素
+        if self.settings.collision_mode not in collision.COLLISION_MODES:
+            print(f"警告: 未知的碰撞模式 '{self.settings.collision_mode}'，改用 precise")
+        self.precise_collisions = self.settings.collision_mode != 'rect'
+
+        with self.startup.stage("ship and fleet"):
+            self.ship = Ship(self)
+            self.aliens = pygame.sprite.Group()
 
-        self.ship = Ship(self)
-        self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
+            # 子弹等大量的简单实体放在World中，由系统按固定顺序批量处理。
+            # 碰撞检测检查的是这一帧的整段路径，必须在剔除离开屏幕的实体之前
+            self.world = World()
+            # 矩形（子弹路径）比较的总次数（运行指标）；遮罩比较由collision模块计数
+            self.collision_checks = 0
+            self.bullet_sprite = self.world.register_sprite(color=self.settings.bullet_color)
+            self.enemy_fire = EnemyFire(self)
+            self.world.add_system('movement', movement_system)
+            self.world.add_system('collision', lambda world: self._check_bullet_alien_collisions())
+            self.world.add_system('ship collision', self.enemy_fire.ship_collision_system)
+            self.world.add_system('culling', make_culling_system(
+                self.settings.screen_width, self.settings.screen_height))
+            # 外星人的射击
+            self.world.add_system('enemy fire', self.enemy_fire.fire_system)
 
-        self._create_fleet()
+            # 粒子效果在固定大小的数组中，由World按顺序更新和绘制
+            self.particles = ParticleSystem(self.settings.particles_enabled,
+                                            self.settings.max_particles,
+                                            self.settings.particle_spawn_budget)
+            self.world.add_system('particles', self.particles.update)
+
+            self.world.add_system('render', make_render_system(self.renderer), phase='render')
+            self.world.add_system('particle render', self.particles.draw_system(self.renderer),
+                                  phase='render')
+
+            # 遮罩在加载图像时计算一次，所有精灵共用；
+            # 外星人的图像随等级着色、俯冲时旋转，它们的遮罩在_prepare_alien_image中计算
+            if self.precise_collisions:
+                for image in (self.ship.image, self.enemy_fire.image):
+                    collision.get_mask(image)
+
+            # 舰队边界：分别记录最左、最右、最下方的外星人。
+            # 整个舰队同步移动，边界外星人只在被消灭时才需要重新查找。
+            self.fleet_left = None
+            self.fleet_right = None
+            self.fleet_bottom = None
+
+            # 俯冲攻击；路径表在每一波舰队生成时计算
+            self.dive = DiveController(self)
+
+            # 旋转、着色后的外星人图像缓存
+            transform_cache.configure(self.settings.transform_cache_kb * 1024,
+                                      self.settings.transform_angle_step)
+            self.alien_image = sprite_atlas.get_image('alien')
+
+            self._create_fleet()
+
+        # 观战：每帧把游戏状态发布给另一个进程中的观战窗口
+        self.spectator = self._create_spectator_server()
+
+        # 录制画面（F5开始/停止）
+        self.capture = None
+
+        # 多线程模式下的模拟线程（见run_game_threaded）
+        self.simulation = None
+        # 模拟线程请求的鼠标指针状态，由主线程执行（SDL的窗口和指针函数只能在主线程中调用）
+        self.pending_cursor = None
+        # 异步主循环中的后台任务（见run_game_async）
+        self.background = None
+        # 上次加载或保存时config.json的修改时间
+        self.config_mtime = None
+
+        # 采样分析器（F6开始/停止）
+        self.profiler = None
+        if profile:
+            self._toggle_profiler()
+
+        # 运行指标：游戏线程更新计数器，服务器线程只读取
+        self.metrics, self.metrics_server = self._create_metrics_server()
+        if record:
+            self._toggle_capture()
 
         # Start Alien Invasion in an inactive state.
         self.game_active = False
 
-        # Make the Play button.
-        self.play_button = Button(self, "Play")
-        
-        # 添加统计信息按钮
-        self.stats_button = Button(self, "Stats")
-        self.stats_button.rect.y += 60  # 在Play按钮下方
-        
-        # 添加设置按钮
-        self.settings_button = Button(self, "Settings")
-        self.settings_button.rect.y += 120  # 在Stats按钮下方
-        
-        # 添加设置GUI
-        self.settings_gui = SettingsGUI(self)
+        with self.startup.stage("buttons"):
+            # Make the Play button.
+            self.play_button = Button(self, "Play")
+            
+            # 添加统计信息按钮
+            self.stats_button = Button(self, "Stats")
+            self.stats_button.rect.y += 60  # 在Play按钮下方
+            
+            # 添加设置按钮
+            self.settings_button = Button(self, "Settings")
+            self.settings_button.rect.y += 120  # 在Stats按钮下方
         
-        # 添加按键状态跟踪
-        self.keys_pressed = set()
+        # 添加设置GUI（字体在第一次打开时才加载）
+        with self.startup.stage("settings GUI"):
+            self.settings_gui = SettingsGUI(self)
+
+        # 统计界面的字体，第一次显示统计信息时才加载
+        self.stats_fonts = None
         
         # 是否显示统计信息
         self.showing_stats = False
         
-        # 加载保存的设置
-        self._load_saved_settings()
+        # 加载保存的设置；延迟模式下等到第一帧显示之后
+        if not self.lazy_init:
+            with self.startup.stage("saved settings"):
+                self._load_saved_settings()
+
+    def _on_first_frame(self):
+        """第一帧显示到屏幕上之后调用"""
+        self.startup.mark_first_frame()
+        if self.lazy_init:
+            self._load_saved_settings()
+        if self.profile_startup:
+            self.startup.report()
+
+    def _create_starfield(self):
+        """按当前背景色预先绘制星空；关闭时返回None，改用纯色清屏"""
+        if not self.settings.starfield:
+            return None
+        return Starfield((self.settings.screen_width, self.settings.screen_height),
+                         self.settings.bg_color)
+
+    def _create_spectator_server(self):
+        """启用观战时开始监听；地址不可用时只打印警告"""
+        if not self.settings.spectator_enabled:
+            return None
+        settings = self.settings
+        meta = (settings.screen_width, settings.screen_height,
+                *self.ship.rect.size, *self.alien_image.get_size(),
+                settings.bullet_width, settings.bullet_height,
+                self.enemy_fire.size, self.enemy_fire.size)
+        try:
+            server = SpectatorServer(settings.spectator_address, meta,
+                                     settings.spectator_keyframe_interval,
+                                     settings.spectator_max_bytes_per_second,
+                                     settings.spectator_max_clients)
+        except OSError as e:
+            print(f"警告: 无法在 {settings.spectator_address} 上开启观战 ({e})")
+            return None
+        print(f"观战地址: {settings.spectator_address}")
+        return server
+
+    def _publish_spectator_frame(self):
+        """把这一帧的状态交给观战线程（只复制坐标，不等待网络）"""
+        world = self.world
+        positions = world.position[:world.count]
+        kinds = world.kind[:world.count]
+        frame = Frame(
+            self.governor.frames,
+            (self.stats.score, self.stats.level, max(0, self.stats.ships_left),
+             self.game_active, self.ship.rect.x, self.ship.rect.y),
+            (make_points(positions[kinds == BULLET]),
+             make_points(positions[kinds == ENEMY_PROJECTILE]),
+             make_points([alien.rect.topleft for alien in self.aliens])))
+        self.spectator.publish(frame)
+
+    def _reload_config(self):
+        """重新读取config.json"""
+        old_color = self.settings.bg_color
+        self.settings = Settings()
+        self.sound_manager = SoundManager(self.settings, lazy=self.lazy_init)
+        self.sb = Scoreboard(self)
+        self.starfield = self._create_starfield()
+        print(f"配置已重新加载，背景颜色从 {old_color} 变为 {self.settings.bg_color}")
+
+    def _toggle_capture(self):
+        """开始或停止录制画面"""
+        if self.capture is not None:
+            self.capture.close()
+            print(f"录制已停止: {self.capture.path} {self.capture.get_metrics()}")
+            self.capture = None
+            return
+        settings = self.settings
+        try:
+            self.capture = FrameCapture(self.screen.get_size(), settings.capture_format,
+                                        settings.capture_every, settings.capture_directory,
+                                        settings.capture_command, settings.capture_queue_size,
+                                        settings.target_fps)
+        except (IOError, OSError, ValueError) as e:
+            print(f"警告: 无法开始录制 ({e})")
+            return
+        print(f"开始录制: {self.capture.path}")
+
+    def _create_metrics_server(self):
+        """启用运行指标时在本机地址上开始监听；端口不可用时只打印警告"""
+        if not self.settings.metrics_enabled:
+            return None, None
+        metrics = GameMetrics()
+        try:
+            server = MetricsServer(metrics.registry, self.settings.metrics_port)
+        except OSError as e:
+            print(f"警告: 无法在端口 {self.settings.metrics_port} 上提供运行指标 ({e})")
+            return None, None
+        self.governor.frame_histogram = metrics.frame_seconds
+        self.data_manager.write_histogram = metrics.write_seconds
+        self.input.latency = metrics.input_latency
+        print(f"运行指标: http://{server.address[0]}:{server.address[1]}/metrics")
+        return metrics, server
+
+    def _update_metrics(self):
+        """每帧把游戏状态写入指标"""
+        metrics = self.metrics
+        world = self.world
+        metrics.fps.set(round(self.governor.achieved_fps, 1))
+        metrics.frames.value = self.governor.frames
+        metrics.entities['bullet'].set(world.count_kind(BULLET))
+        metrics.entities['enemy_projectile'].set(world.count_kind(ENEMY_PROJECTILE))
+        metrics.entities['alien'].set(len(self.aliens))
+        metrics.entities['particle'].set(self.particles.get_metrics()['active'])
+        checks = self.collision_checks + collision.mask_checks
+        metrics.collision_checks_frame.set(checks - metrics.collision_checks.value)
+        metrics.collision_checks.value = checks
+        metrics.audio_voices.set(self.sound_manager.busy_channels())
+        metrics.level.set(self.stats.level)
+        metrics.score.set(self.stats.score)
+        metrics.game_active.set(int(self.game_active))
+
+    def _toggle_profiler(self):
+        """开始采样，或者停止并写出火焰图和pstats文件"""
+        if self.profiler is not None:
+            try:
+                folded_path, pstats_path = self.profiler.stop()
+            except (IOError, OSError) as e:
+                print(f"错误: 无法保存分析结果 ({e})")
+            else:
+                print(f"分析结果 ({self.profiler.sample_count} 次采样): {folded_path}, {pstats_path}")
+            self.profiler = None
+            return
+        self.profiler = SamplingProfiler(self.settings.profiler_interval_ms / 1000,
+                                         self.settings.profiler_directory)
+        self.profiler.start()
+        print("采样分析已开始，再按F6停止")
+
+    def _quit(self):
+        """保存设置，停止观战、录制、分析和指标服务，然后退出"""
+        self.data_manager.save_settings(
+            self.settings.bg_color, 
+            self.settings.sound_enabled
+        )
+        if self.spectator is not None:
+            self.spectator.close()
+        if self.capture is not None:
+            self._toggle_capture()
+        if self.profiler is not None:
+            self._toggle_profiler()
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+        sys.exit()
 
     def _load_saved_settings(self):
         """加载保存的游戏设置 - 确保不覆盖配置文件中的背景颜色"""
@@ -218,31 +509,161 @@ class AlienInvasion:
     def run_game(self):
         """Start the main loop for the game."""
         while True:
+            self.governor.begin_frame()
             self._check_events()
+            self._simulate()
+
+            # 落后于计划时只跳过渲染，游戏逻辑保持全速
+            if self.governor.should_render():
+                self._update_screen()
+            self.governor.end_frame()
+
+    def run_game_threaded(self):
+        """游戏逻辑在模拟线程中以固定频率运行，主线程处理事件并绘制最新的快照"""
+        self.simulation = simulation = SimulationThread(self)
+        simulation.start()
+        seen = rendered = 0
+        try:
+            while True:
+                with simulation.lock:
+                    self._check_events()
+                    if self.pending_cursor is not None:
+                        pygame.mouse.set_visible(self.pending_cursor)
+                        self.pending_cursor = None
+                seen, snapshot = simulation.snapshots.wait(seen, self.governor.frame_time)
+                simulation.check()
+                if snapshot is None or seen == rendered:
+                    continue
+                if self.settings_gui.visible or self.showing_stats:
+                    # 设置和统计界面直接读取游戏状态，绘制时需要持有锁
+                    with simulation.lock:
+                        self._update_screen()
+                else:
+                    self._draw_snapshot(snapshot)
+                simulation.record_render(seen, rendered)
+                rendered = seen
+        finally:
+            simulation.stop()
+
+    def run_game_async(self):
+        """在asyncio事件循环中运行主循环，I/O和周期性工作作为后台任务"""
+        asyncio.run(self._run_async())
+
+    async def _run_async(self):
+        self.background = background = BackgroundTasks(
+            self.settings.background_budget_ms / 1000)
+        # 游戏数据改在事件循环的后台线程中写入
+        default_writer = self.data_manager.writer
+        self.data_manager.writer = background.submit
+        # 延迟初始化的混音器和音效在后台加载，不等到第一次播放声音
+        background.spawn(background.run_blocking(self.sound_manager._ensure_loaded))
+        self.config_mtime = self._config_mtime()
+        background.every(1.0, self._watch_config)
+
+        governor = self.governor
+        try:
+            while True:
+                governor.begin_frame()
+                self._check_events()
+                self._simulate()
+                if governor.should_render():
+                    self._update_screen()
+                # 到下一帧时间点之前运行后台任务
+                await background.end_frame(governor.finish_frame())
+        finally:
+            background.close()
+            self.data_manager.writer = default_writer
+
+    @staticmethod
+    def _config_mtime():
+        try:
+            return os.path.getmtime('config.json')
+        except OSError:
+            return None
 
-            if self.game_active and not self.settings_gui.visible:
-                self._update_ship_movement()
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
+    async def _watch_config(self):
+        """config.json被修改后，在不在游戏中时重新加载"""
+        mtime = await self.background.run_blocking(self._config_mtime)
+        if mtime == self.config_mtime or self.game_active:
+            return
+        await self.background.budget.checkpoint()
+        self.config_mtime = mtime
+        self._reload_config()
+
+    def _simulate(self):
+        """一帧游戏逻辑（不包括事件处理和渲染）"""
+        if self.starfield is not None:
+            self.starfield.update()
+
+        # 每帧只取一次输入；不在游戏中时按键也被取走，不会留到开始游戏时
+        controls = self.input.snapshot()
+        if self.game_active and not self.settings_gui.visible:
+            self._apply_input(controls)
+            self.ship.update()
+            self._update_entities()
+            self._update_aliens()
+            self.telemetry.tick()
+        if self.spectator is not None:
+            self._publish_spectator_frame()
+        if self.metrics is not None:
+            self._update_metrics()
+
+    def _make_snapshot(self):
+        """在模拟线程中生成这一帧的渲染快照"""
+        sb = self.sb
+        sb.update_hud(self.governor.hud_update_allowed())
+        hud = ((sb.score_image, sb.score_rect.topleft),
+               (sb.high_score_image, sb.high_score_rect.topleft),
+               (sb.level_image, sb.level_rect.topleft),
+               *((ship.image, ship.rect.topleft) for ship in sb.ships))
+        return RenderSnapshot(
+            self.governor.frames,
+            self.starfield.offsets() if self.starfield is not None else None,
+            render_commands(self.world),
+            self.particles.render_commands(),
+            (self.ship.image, self.ship.rect.topleft),
+            tuple((alien.image, alien.rect.topleft) for alien in self.aliens),
+            hud,
+            self.game_active,
+            self.input.tick)
+
+    def _draw_snapshot(self, snapshot):
+        """在主线程中绘制渲染快照，和_update_screen绘制的内容相同"""
+        renderer = self.renderer
+        if snapshot.background is not None and self.starfield is not None:
+            self.starfield.draw(renderer, snapshot.background)
+        else:
+            renderer.clear(self.settings.bg_color)
+
+        draw_commands(renderer, snapshot.entities)
+        draw_commands(renderer, snapshot.particles)
+        renderer.blit(*snapshot.ship)
+        for image, position in snapshot.aliens:
+            renderer.blit(image, position)
+        for image, position in snapshot.hud:
+            renderer.blit(image, position)
+
+        if not snapshot.game_active:
+            self.play_button.draw_button()
+            self.stats_button.draw_button()
+            self.settings_button.draw_button()
 
-            self._update_screen()
-            self.clock.tick(60)
+        if self.capture is not None:
+            self.capture.capture(self.screen)
+        renderer.present()
+        self.input.presented(snapshot.input_tick)
+        if self.startup.first_frame is None:
+            self._on_first_frame()
 
     def _check_events(self):
         """Respond to keypresses and mouse events."""
-        for event in pygame.event.get():
+        # 移动和射击键由InputSystem记录，在_simulate中按输入快照处理
+        for event in self.input.poll():
             if event.type == pygame.QUIT:
                 # 游戏退出前保存设置
-                self.data_manager.save_settings(
-                    self.settings.bg_color, 
-                    self.settings.sound_enabled
-                )
-                sys.exit()
+                self._quit()
             elif event.type == pygame.KEYDOWN:
                 self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
                 # 先检查设置GUI
@@ -272,26 +693,19 @@ class AlienInvasion:
         if button_clicked:
             self.settings_gui.show()
 
-    def _update_ship_movement(self):
-        """基于当前按下的键更新飞船移动状态"""
-        # 获取所有当前按下的键
-        current_keys = pygame.key.get_pressed()
-        
-        # 重置移动状态
-        self.ship.moving_right = False
-        self.ship.moving_left = False
-        
-        # 检查方向键
-        if current_keys[pygame.K_RIGHT]:
-            self.ship.moving_right = True
-        if current_keys[pygame.K_LEFT]:
-            self.ship.moving_left = True
-            
-        # 检查WASD键
-        if current_keys[pygame.K_d]:
-            self.ship.moving_right = True
-        if current_keys[pygame.K_a]:
-            self.ship.moving_left = True
+    def _apply_input(self, controls):
+        """按这一帧的输入快照移动飞船和射击"""
+        self.ship.moving_right = controls.is_down(RIGHT)
+        self.ship.moving_left = controls.is_down(LEFT)
+        for _ in range(controls.presses(FIRE)):
+            self._fire_bullet()
+
+    def _set_cursor_visible(self, visible):
+        """显示或隐藏鼠标指针；多线程模式下交给主线程执行"""
+        if self.simulation is not None:
+            self.pending_cursor = visible
+        else:
+            pygame.mouse.set_visible(visible)
 
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks Play."""
@@ -309,9 +723,12 @@ class AlienInvasion:
             self.sb.prep_level()
             self.sb.prep_ships()
             self.game_active = True
+            self.telemetry.start_game()
+            self.enemy_fire.reset()
+            self.particles.clear()
 
             # Get rid of any remaining bullets and aliens.
-            self.bullets.empty()
+            self.world.clear()
             self.aliens.empty()
 
             # Create a new fleet and center the ship.
@@ -323,19 +740,13 @@ class AlienInvasion:
                 self.sound_manager.play_background_music()
 
             # Hide the mouse cursor.
-            pygame.mouse.set_visible(False)
+            self._set_cursor_visible(False)
 
     def _check_keydown_events(self, event):
         """Respond to keypresses."""
         if event.key == pygame.K_q:
             # 退出前保存设置
-            self.data_manager.save_settings(
-                self.settings.bg_color, 
-                self.settings.sound_enabled
-            )
-            sys.exit()
-        elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
+            self._quit()
         elif event.key == pygame.K_m:  # 添加静音切换功能
             self.settings.sound_enabled = not self.settings.sound_enabled
             if self.settings.sound_enabled:
@@ -343,17 +754,30 @@ class AlienInvasion:
             else:
                 self.sound_manager.pause_background_music()
         elif event.key == pygame.K_F1:  # 重新加载配置
-            old_color = self.settings.bg_color
-            self.settings = Settings()
-            self.sound_manager = SoundManager(self.settings)
-            self.sb = Scoreboard(self)
-            print(f"配置已重新加载，背景颜色从 {old_color} 变为 {self.settings.bg_color}")
+            self._reload_config()
         elif event.key == pygame.K_F2:  # 保存配置
             self.settings.save_config()
+            # 自己保存的修改不需要重新加载（见_watch_config）
+            self.config_mtime = self._config_mtime()
         elif event.key == pygame.K_F3:  # 调试：重置飞船移动状态
+            self.input.release_all()
             self.ship.moving_right = False
             self.ship.moving_left = False
             print("飞船移动状态已重置")
+        elif event.key == pygame.K_F4:  # 调试：显示帧率统计
+            print(f"帧率统计: {self.governor.get_metrics()}")
+            print(f"系统耗时(ms): {self.world.get_timings()}")
+            print(f"粒子: {self.particles.get_metrics()}")
+            print(f"图像变换缓存: {transform_cache.get_metrics()}")
+            if self.simulation is not None:
+                print(f"模拟线程: {self.simulation.get_metrics()}")
+            if self.background is not None:
+                print(f"后台任务: {self.background.get_metrics()}")
+            print(f"输入延迟: {self.input.get_metrics()}")
+        elif event.key == pygame.K_F5:  # 开始/停止录制画面
+            self._toggle_capture()
+        elif event.key == pygame.K_F6:  # 开始/停止采样分析
+            self._toggle_profiler()
         elif event.key == pygame.K_s and not self.game_active:  # 显示统计信息
             self.showing_stats = True
         elif event.key == pygame.K_ESCAPE:  # ESC键处理
@@ -368,72 +792,93 @@ class AlienInvasion:
             print("游戏数据已重置")
         elif event.key == pygame.K_TAB and not self.game_active:  # TAB键打开设置
             self.settings_gui.show()
-        
-        # 方向键处理
-        elif event.key == pygame.K_RIGHT:
-            self.ship.moving_right = True
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
-        elif event.key == pygame.K_d:  # WASD支持
-            self.ship.moving_right = True
-        elif event.key == pygame.K_a:  # WASD支持
-            self.ship.moving_left = True
-
-    def _check_keyup_events(self, event):
-        """Respond to key releases."""
-        # 我们不再在这里处理移动键的释放，而是在_update_ship_movement中处理
-        pass
 
     def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
+        """Create a new bullet if the limit allows."""
+        if self.world.count_kind(BULLET) < self.settings.bullets_allowed:
+            spawn_bullet(self)
+            self.stats.bullets_fired += 1
+            self.telemetry.record(telemetry.SHOT, self.ship.rect.centerx,
+                                  self.ship.rect.top)
             # 播放射击音效
             self.sound_manager.play_shoot()
 
-    def _update_bullets(self):
-        """Update position of bullets and get rid of old bullets."""
-        # Update bullet positions.
-        self.bullets.update()
-
-        # Get rid of bullets that have disappeared.
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
-
-        self._check_bullet_alien_collisions()
+    def _update_entities(self):
+        """按顺序运行World的系统：移动、碰撞、剔除、敌方射击、粒子"""
+        if self.settings.engine_trail and (self.ship.moving_left or self.ship.moving_right):
+            self.particles.engine_trail(self.ship.rect.centerx, self.ship.rect.bottom)
+        self.world.run('update')
 
     def _check_bullet_alien_collisions(self):
         """Respond to bullet-alien collisions."""
-        # Remove any bullets and aliens that have collided.
-        collisions = pygame.sprite.groupcollide(
-                self.bullets, self.aliens, True, True)
-
-        if collisions:
-            # 播放外星人爆炸音效
-            self.sound_manager.play_alien_explosion()
-            for aliens in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
-            self.sb.prep_score()
-            self.sb.check_high_score()
+        bullets = self.world.indices(BULLET)
+        if len(bullets) and self.aliens:
+            # 所有子弹这一帧经过的路径和所有外星人的矩形一次性比较，
+            # 子弹速度再快也不会穿过外星人
+            aliens = self.aliens.sprites()
+            alien_rects = np.array([alien.rect for alien in aliens], np.float32)
+            times = self.world.sweep(bullets, alien_rects)
+            hit_bullets, hit_aliens = np.nonzero(np.isfinite(times))
+            self.collision_checks += times.size
+            if len(hit_bullets) and self.precise_collisions:
+                # 只对矩形已经重叠的子弹和外星人比较遮罩
+                precise = np.array([self._bullet_hits_alien(bullets[b], aliens[a])
+                                    for b, a in zip(hit_bullets, hit_aliens)], bool)
+                hit_bullets, hit_aliens = hit_bullets[precise], hit_aliens[precise]
+
+            if len(hit_bullets):
+                # 每颗子弹只击中路径上最先碰到的外星人
+                order = np.lexsort((times[hit_bullets, hit_aliens], hit_bullets))
+                hit_bullets, hit_aliens = hit_bullets[order], hit_aliens[order]
+                _, first = np.unique(hit_bullets, return_index=True)
+                hit_bullets, hit_aliens = hit_bullets[first], hit_aliens[first]
+
+                # Remove any bullets and aliens that have collided.
+                self.world.kill(bullets[hit_bullets])
+                killed = [aliens[i] for i in np.unique(hit_aliens)]
+                self.aliens.remove(*killed)
+
+                # 播放外星人爆炸音效
+                self.sound_manager.play_alien_explosion()
+                self.stats.score += self.settings.alien_points * len(killed)
+                self.stats.aliens_killed += len(killed)
+                for alien in killed:
+                    self.telemetry.record(telemetry.KILL, alien.rect.centerx,
+                                          alien.rect.centery, self.stats.level)
+                    self.particles.explosion(alien.rect.centerx, alien.rect.centery)
+                self._update_fleet_extents([killed])
+                self.sb.request_score_update()
 
         if not self.aliens:
+            # Increase level.（先升级，新舰队使用新等级的颜色）
+            self.stats.level += 1
+            self.sb.prep_level()
+
             # Destroy existing bullets and create new fleet.
-            self.bullets.empty()
+            self.world.clear()
             self._create_fleet()
             self.settings.increase_speed()
 
-            # Increase level.
-            self.stats.level += 1
-            self.sb.prep_level()
+            self.telemetry.record(telemetry.LEVEL_UP, value=self.stats.level)
             # 播放等级提升音效
             self.sound_manager.play_level_up()
 
+    def _bullet_hits_alien(self, bullet, alien):
+        """子弹（纯色矩形）这一帧扫过的区域是否碰到外星人图像的不透明像素"""
+        position = self.world.position[bullet]
+        velocity = self.world.velocity[bullet]
+        width, height = self.world.collider[bullet] + np.abs(velocity)
+        return collision.masks_overlap(collision.get_mask(alien.image), alien.rect,
+                                       collision.solid_mask(width, height),
+                                       np.minimum(position, position - velocity))
+
     def _ship_hit(self):
         """Respond to the ship being hit by an alien."""
         # 播放飞船被击中音效
         self.sound_manager.play_ship_hit()
+        self.telemetry.record(telemetry.SHIP_HIT, self.ship.rect.centerx,
+                              self.ship.rect.centery, self.stats.ships_left)
+        self.particles.ship_hit(self.ship.rect.centerx, self.ship.rect.centery)
         
         if self.stats.ships_left > 0:
             # Decrement ships_left, and update scoreboard.
@@ -441,7 +886,7 @@ class AlienInvasion:
             self.sb.prep_ships()
 
             # Get rid of any remaining bullets and aliens.
-            self.bullets.empty()
+            self.world.clear()
             self.aliens.empty()
 
             # Create a new fleet and center the ship.
@@ -456,15 +901,21 @@ class AlienInvasion:
             # 停止背景音乐
             self.sound_manager.stop_background_music()
             self.game_active = False
-            pygame.mouse.set_visible(True)
+
+            # 保存本局记录和遥测数据
+            self.stats.record_game_session()
+            self.telemetry.finish_game(self.stats.score, self.stats.level)
+            self._set_cursor_visible(True)
 
     def _update_aliens(self):
         """Check if the fleet is at an edge, then update positions."""
         self._check_fleet_edges()
+        self.dive.update()
         self.aliens.update()
 
         # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
+        self.collision_checks += len(self.aliens)
+        if collision.spritecollideany(self.ship, self.aliens, self.precise_collisions):
             self._ship_hit()
 
         # Look for aliens hitting the bottom of the screen.
@@ -472,14 +923,19 @@ class AlienInvasion:
 
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= self.settings.screen_height:
-                # Treat this the same as if the ship got hit.
-                self._ship_hit()
-                break
+        if self.fleet_bottom is None:
+            return
+        # 按队形中的位置和大小判断（俯冲时rect是旋转后的图像）；俯冲的外星人撞到飞船由碰撞检测处理
+        bottom = self.fleet_bottom.y + self.fleet_bottom.base_image.get_height()
+        if bottom >= self.settings.screen_height:
+            # Treat this the same as if the ship got hit.
+            self._ship_hit()
 
     def _create_fleet(self):
         """Create the fleet of aliens."""
+        self.fleet_left = self.fleet_right = self.fleet_bottom = None
+        self._prepare_alien_image()
+
         # Create an alien and keep adding aliens until there's no room left.
         # Spacing between aliens is one alien width and one alien height.
         alien = Alien(self)
@@ -495,54 +951,103 @@ class AlienInvasion:
             current_x = alien_width
             current_y += 2 * alien_height
 
+        self.dive.load_wave()
+
+    def _prepare_alien_image(self):
+        """按当前等级选择外星人的颜色，并预先生成俯冲时需要的旋转图像和它们的碰撞遮罩"""
+        tint = None
+        if self.settings.level_tint:
+            tint = LEVEL_TINTS[(self.stats.level - 1) % len(LEVEL_TINTS)]
+        self.alien_image = transform_cache.get(sprite_atlas.get_image('alien'), tint=tint)
+
+        images = [self.alien_image]
+        if (self.settings.prewarm_transforms and self.settings.rotate_divers
+                and self.dive.enabled):
+            angles = range(0, 360, transform_cache.angle_step())
+            transform_cache.prewarm(self.alien_image, angles=angles)
+            images += [transform_cache.get(self.alien_image, angle) for angle in angles]
+
+        # 碰撞时使用的就是这些图像，遮罩在这里算好，不留到游戏中第一次碰撞检测时
+        if self.precise_collisions:
+            for image in images:
+                collision.get_mask(image)
+
     def _create_alien(self, x_position, y_position):
         """Create an alien and place it in the fleet."""
         new_alien = Alien(self)
         new_alien.x = x_position
         new_alien.rect.x = x_position
-        new_alien.rect.y = y_position
+        new_alien.rect.y = new_alien.y = y_position
         self.aliens.add(new_alien)
+        self._extend_fleet_extents(new_alien)
+
+    def _extend_fleet_extents(self, alien):
+        """新外星人加入舰队时更新边界（按队形中的位置，所有外星人大小相同）"""
+        if self.fleet_left is None or alien.x < self.fleet_left.x:
+            self.fleet_left = alien
+        if self.fleet_right is None or alien.x > self.fleet_right.x:
+            self.fleet_right = alien
+        if self.fleet_bottom is None or alien.y > self.fleet_bottom.y:
+            self.fleet_bottom = alien
+
+    def _update_fleet_extents(self, killed_groups):
+        """外星人被消灭后，仅当边界外星人被消灭时才重新计算边界"""
+        boundary = (self.fleet_left, self.fleet_right, self.fleet_bottom)
+        for aliens in killed_groups:
+            if any(alien in boundary for alien in aliens):
+                break
+        else:
+            return
+
+        self.fleet_left = self.fleet_right = self.fleet_bottom = None
+        for alien in self.aliens.sprites():
+            self._extend_fleet_extents(alien)
 
     def _check_fleet_edges(self):
         """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
+        if self.fleet_left is None:
+            return
+        if self.fleet_right.check_edges() or self.fleet_left.check_edges():
+            self._change_fleet_direction()
 
     def _change_fleet_direction(self):
         """Drop the entire fleet and change the fleet's direction."""
         for alien in self.aliens.sprites():
+            alien.y += self.settings.fleet_drop_speed
             alien.rect.y += self.settings.fleet_drop_speed
         self.settings.fleet_direction *= -1
 
+    def _load_stats_fonts(self):
+        """加载统计界面使用的字体"""
+        # 使用Consolas字体
+        return (asset_pack.load_font("Consolas", 48, bold=True),
+                asset_pack.load_font("Consolas", 32),
+                asset_pack.load_font("Consolas", 20),
+                asset_pack.load_font("Consolas", 24))
+
     def _draw_statistics(self):
         """绘制统计信息界面"""
-        # 半透明背景
-        s = pygame.Surface((self.settings.screen_width, self.settings.screen_height), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 200))  # 半透明黑色
-        self.screen.blit(s, (0, 0))
+        screen = self.renderer.begin_overlay()
+
+        # 半透明背景；高负载时改用不透明填充，省去整屏的alpha混合
+        if self.governor.under_load:
+            screen.fill((0, 0, 0))
+        else:
+            s = pygame.Surface((self.settings.screen_width, self.settings.screen_height), pygame.SRCALPHA)
+            s.fill((0, 0, 0, 200))  # 半透明黑色
+            screen.blit(s, (0, 0))
         
         # 获取统计数据
         stats = self.data_manager.get_statistics()
         
-        # 使用Consolas字体
-        try:
-            title_font = pygame.font.SysFont("Consolas", 48, bold=True)
-            font = pygame.font.SysFont("Consolas", 32)
-            small_font = pygame.font.SysFont("Consolas", 20)
-            hint_font = pygame.font.SysFont("Consolas", 24)
-        except:
-            # 如果Consolas不可用，使用默认字体
-            title_font = pygame.font.SysFont(None, 48, bold=True)
-            font = pygame.font.SysFont(None, 32)
-            small_font = pygame.font.SysFont(None, 20)
-            hint_font = pygame.font.SysFont(None, 24)
+        if self.stats_fonts is None:
+            self.stats_fonts = self._load_stats_fonts()
+        title_font, font, small_font, hint_font = self.stats_fonts
         
         # 标题
         title = title_font.render("Game Statistics", True, (255, 255, 255))
         title_rect = title.get_rect(center=(self.settings.screen_width // 2, 50))
-        self.screen.blit(title, title_rect)
+        screen.blit(title, title_rect)
         
         # 主要统计数据
         y_pos = 120
@@ -560,13 +1065,35 @@ class AlienInvasion:
         
         for text in stats_texts:
             text_surface = font.render(text, True, (255, 255, 255))
-            self.screen.blit(text_surface, (100, y_pos))
+            screen.blit(text_surface, (100, y_pos))
             y_pos += line_height
+
+        # 右侧：分数分布和滚动统计
+        analytics_x = self.settings.screen_width // 2 + 80
+        analytics_y = 120
+        analytics_texts = [
+            f"Score Std Dev: {stats['score_std_dev']}",
+            f"Last 7 Avg: {stats['rolling_average_7']}",
+            f"Last 30 Avg: {stats['rolling_average_30']}",
+            f"Median / P90: {stats['score_p50']} / {stats['score_p90']}",
+            f"P99 Score: {stats['score_p99']}",
+            "Best Per Level:"
+        ]
+        for text in analytics_texts:
+            text_surface = font.render(text, True, (255, 255, 255))
+            screen.blit(text_surface, (analytics_x, analytics_y))
+            analytics_y += line_height
+
+        # 只显示最高的5个等级
+        for level, score in list(stats['best_per_level'].items())[-5:]:
+            level_surface = small_font.render(f"Level {level}: {score}", True, (200, 200, 200))
+            screen.blit(level_surface, (analytics_x + 20, analytics_y))
+            analytics_y += 30
         
         # 最近游戏记录
         y_pos += 20
         recent_title = font.render("Recent Games:", True, (255, 255, 255))
-        self.screen.blit(recent_title, (100, y_pos))
+        screen.blit(recent_title, (100, y_pos))
         y_pos += line_height
         
         for i, game in enumerate(stats['recent_games']):
@@ -574,29 +1101,33 @@ class AlienInvasion:
                 break
             game_text = f"{game['date']} - Score: {game['score']}, Level: {game['level']}, Kills: {game['aliens_killed']}"
             game_surface = small_font.render(game_text, True, (200, 200, 200))
-            self.screen.blit(game_surface, (120, y_pos))
+            screen.blit(game_surface, (120, y_pos))
             y_pos += 30
         
         # 提示文字
         hint_text = hint_font.render("Press ESC to return", True, (150, 150, 255))
         hint_rect = hint_text.get_rect(center=(self.settings.screen_width // 2, self.settings.screen_height - 50))
-        self.screen.blit(hint_text, hint_rect)
+        screen.blit(hint_text, hint_rect)
 
     def _update_screen(self):
         """Update images on the screen, and flip to the new screen."""
-        self.screen.fill(self.settings.bg_color)
+        # 星空背景覆盖整个画面，代替清屏
+        if self.starfield is not None:
+            self.starfield.draw(self.renderer)
+        else:
+            self.renderer.clear(self.settings.bg_color)
         
         if self.settings_gui.visible:
             self.settings_gui.draw()
         elif self.showing_stats:
             self._draw_statistics()
         else:
-            for bullet in self.bullets.sprites():
-                bullet.draw_bullet()
+            self.world.run('render')
             self.ship.blitme()
-            self.aliens.draw(self.screen)
+            self.renderer.draw_sprites(self.aliens)
 
             # Draw the score information.
+            self.sb.update_hud(self.governor.hud_update_allowed())
             self.sb.show_score()
 
             # Draw the play button if the game is inactive.
@@ -605,10 +1136,36 @@ class AlienInvasion:
                 self.stats_button.draw_button()
                 self.settings_button.draw_button()
 
-        pygame.display.flip()
+        if self.capture is not None:
+            self.capture.capture(self.screen)
+        self.renderer.present()
+        self.input.presented()
+        if self.startup.first_frame is None:
+            self._on_first_frame()
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Alien Invasion")
+    parser.add_argument('--lazy-init', action='store_true', default=None,
+                        help="延迟初始化混音器、隐藏界面的字体和游戏数据")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="第一帧显示后打印各启动阶段的耗时")
+    parser.add_argument('--record', action='store_true',
+                        help="从启动开始录制画面（格式见config.json中的capture）")
+    parser.add_argument('--threaded', action='store_true', default=None,
+                        help="在单独的线程中运行游戏逻辑，主线程只负责事件和渲染")
+    parser.add_argument('--asyncio', action='store_true', default=None,
+                        help="使用asyncio主循环，数据保存等I/O在后台任务中执行")
+    parser.add_argument('--profile', action='store_true',
+                        help="从启动开始采样分析，退出（或按F6）时写出火焰图和pstats文件")
+    args = parser.parse_args()
+
     # Make a game instance, and run the game.
-    ai = AlienInvasion()
-    ai.run_game()
\ No newline at end of file
+    ai = AlienInvasion(lazy_init=args.lazy_init, profile_startup=args.profile_startup,
+                       record=args.record, profile=args.profile)
+    if args.threaded or ai.settings.threaded_simulation:
+        ai.run_game_threaded()
+    elif args.asyncio or ai.settings.async_loop:
+        ai.run_game_async()
+    else:
+        ai.run_game()
\ No newline at end of file
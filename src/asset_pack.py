@@ -0,0 +1,208 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+"""打包的资源文件
+
+把图集、图片、音效和字体打包成一个带索引的文件assets.pack，运行时用mmap打开：
+图片按显示格式（BGRA，即小端机器上的ARGB8888）保存原始像素，直接用frombuffer创建表面；
+音效保存为混音器格式的原始采样，不需要解码和重采样；字体保存原始的字体文件。
+启动时只需打开一个文件，没有解码。资源包节省的是打开文件和解码的时间，不是内存复制：
+图集转换为显示格式（convert_alpha）时会复制像素，字体和音效也由pygame复制到自己的内存中。
+资源包不存在时游戏照常从单独的文件加载。
+用法: python asset_pack.py  （修改图片、音效后重新生成）
+"""
+
+import io
+import json
+import mmap
+import os
+
+import pygame
+
+PACK_FILE = 'assets.pack'
+MAGIC = b'AIPACK01'
+# 每个资源的起始位置按16字节对齐
+ALIGNMENT = 16
+IMAGE_FORMAT = 'BGRA'
+SOUNDS_DIR = 'sounds'
+# 打包的字体（按系统字体名查找）
+FONTS = ('Consolas',)
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class AssetPack:
+    """用mmap打开的只读资源包
+
+    读取索引和取出资源数据的切片时不复制；由这些数据创建表面以外的对象（字体、音效）时，
+    pygame会复制一份。
+    """
+
+    def __init__(self, path=PACK_FILE):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise
+        if self.data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} 不是资源包文件")
+
+        header_start = len(MAGIC) + 4
+        header_length = int.from_bytes(self.data[len(MAGIC):header_start], 'little')
+        self.index = json.loads(self.data[header_start:header_start + header_length])
+        self.data_start = _align(header_start + header_length)
+        self.view = memoryview(self.data)
+
+    def _blob(self, entry):
+        """资源数据在映射内存上的视图（不复制）"""
+        start = self.data_start + entry["offset"]
+        return self.view[start:start + entry["length"]]
+
+    def image(self, name):
+        """返回图片表面（像素直接引用资源包的内存，convert_alpha之后才是独立的副本），
+        没有时返回None"""
+        entry = self.index["images"].get(name)
+        if entry is None:
+            return None
+        return pygame.image.frombuffer(self._blob(entry), tuple(entry["size"]), entry["format"])
+
+    def sprites(self):
+        """图集中每个精灵的位置"""
+        return self.index.get("sprites", {})
+
+    def mixer_format(self):
+        """打包音效时使用的混音器格式 (frequency, size, channels)，没有音效时为None"""
+        mixer = self.index.get("mixer")
+        return tuple(mixer) if mixer else None
+
+    def has_sound(self, filename):
+        return filename in self.index["sounds"]
+
+    def sound(self, filename):
+        """返回音效（采样被复制到混音器的内存中）；混音器格式和打包时不同时返回None"""
+        entry = self.index["sounds"].get(filename)
+        if entry is None or pygame.mixer.get_init() != self.mixer_format():
+            return None
+        return pygame.mixer.Sound(buffer=self._blob(entry))
+
+    def font(self, name, size):
+        """返回字体（字体文件经BytesIO复制一份），没有时返回None"""
+        entry = self.index["fonts"].get(name)
+        if entry is None:
+            return None
+        return pygame.font.Font(io.BytesIO(self._blob(entry)), size)
+
+    def close(self):
+        if hasattr(self, 'view'):
+            self.view.release()
+        if hasattr(self, 'data'):
+            self.data.close()
+        self.file.close()
+
+
+_pack = None
+_opened = False
+
+
+def get_pack():
+    """返回共享的资源包（第一次调用时打开），没有资源包时返回None"""
+    global _pack, _opened
+    if not _opened:
+        _opened = True
+        if os.path.exists(PACK_FILE):
+            try:
+                _pack = AssetPack(PACK_FILE)
+            except (IOError, OSError, ValueError) as e:
+                print(f"警告: 无法打开资源包，改为加载单独的文件 ({e})")
+    return _pack
+
+
+def load_font(name, size, bold=False):
+    """优先从资源包加载字体，否则使用系统字体"""
+    pack = get_pack()
+    font = pack.font(name, size) if pack is not None else None
+    if font is not None:
+        font.set_bold(bold)
+        return font
+    try:
+        return pygame.font.SysFont(name, size, bold=bold)
+    except:
+        # 如果系统字体不可用，使用默认字体
+        return pygame.font.SysFont(None, size, bold=bold)
+
+
+def _image_bytes(path):
+    """把图片解码为显示格式的原始像素"""
+    surface = pygame.image.load(path)
+    return surface.get_size(), pygame.image.tobytes(surface, IMAGE_FORMAT)
+
+
+def build_pack(path=PACK_FILE, images_dir='images', sounds_dir=SOUNDS_DIR):
+    """生成资源包：图集和所有图片、sounds目录下的wav音效、FONTS中能找到的字体"""
+    # sprite_atlas在运行时会导入本模块，只在打包时才需要它
+    import sprite_atlas
+
+    index = {"images": {}, "sprites": {}, "sounds": {}, "fonts": {}, "mixer": None}
+    blobs = []
+    offset = 0
+
+    def add(section, name, data, **info):
+        nonlocal offset
+        index[section][name] = dict(info, offset=offset, length=len(data))
+        blobs.append((offset, data))
+        offset = _align(offset + len(data))
+
+    # 图集和单独的图片
+    with open(os.path.join(images_dir, sprite_atlas.ATLAS_INDEX), 'r') as f:
+        atlas = json.load(f)
+    size, pixels = _image_bytes(os.path.join(images_dir, atlas["image"]))
+    add("images", "atlas", pixels, size=list(size), format=IMAGE_FORMAT)
+    index["sprites"] = atlas["sprites"]
+    for name, source in sprite_atlas._find_sources(images_dir):
+        size, pixels = _image_bytes(source)
+        add("images", name, pixels, size=list(size), format=IMAGE_FORMAT)
+
+    # 音效按混音器的格式保存原始采样
+    wavs = sorted(f for f in os.listdir(sounds_dir) if f.endswith('.wav')) \
+        if os.path.isdir(sounds_dir) else []
+    if wavs:
+        try:
+            pygame.mixer.init()
+            index["mixer"] = list(pygame.mixer.get_init())
+            for filename in wavs:
+                sound = pygame.mixer.Sound(os.path.join(sounds_dir, filename))
+                add("sounds", f"{sounds_dir}/{filename}", sound.get_raw())
+        except pygame.error as e:
+            print(f"警告: 无法初始化混音器，音效没有打包 ({e})")
+            index["sounds"] = {}
+            index["mixer"] = None
+
+    # 字体（找不到的字体运行时仍然使用系统字体）
+    pygame.font.init()
+    for name in FONTS:
+        font_path = pygame.font.match_font(name)
+        if font_path:
+            with open(font_path, 'rb') as f:
+                add("fonts", name, f.read())
+
+    header = json.dumps(index).encode('utf-8')
+    data_start = _align(len(MAGIC) + 4 + len(header))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + len(header).to_bytes(4, 'little') + header)
+        for blob_offset, data in blobs:
+            f.seek(data_start + blob_offset)
+            f.write(data)
+    os.replace(tmp_path, path)
+
+    print(f"已打包 {len(index['images'])} 张图片、{len(index['sounds'])} 个音效、"
+          f"{len(index['fonts'])} 个字体到 {path} ({os.path.getsize(path)} 字节)")
+    return index
+
+
+if __name__ == '__main__':
+    build_pack()
@@ -0,0 +1,128 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+# 距离下一帧时间点不到SPIN秒时不再交给selector休眠（精度只有约1毫秒），
+# 而是反复让出控制权直到时间点
+SPIN = 0.002
+
+
+async def sleep_until(deadline):
+    """等待到deadline（perf_counter时间），期间事件循环可以运行其他任务"""
+    remaining = deadline - perf_counter()
+    if remaining > SPIN:
+        await asyncio.sleep(remaining - SPIN)
+    while perf_counter() < deadline:
+        await asyncio.sleep(0)
+
+
+class FrameBudget:
+    """每帧分配给后台任务的时间窗口
+
+    主循环在一帧的逻辑和渲染之后调用open()打开窗口，然后等待到下一帧的时间点。
+    后台任务在每段工作之前await checkpoint()：窗口内还有时间就继续，
+    否则等到下一帧的窗口，所以后台工作不会把一帧推迟到时间点之后。
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.window_end = 0.0
+        self.deferred = 0
+        self._next_window = None
+
+    def open(self, deadline):
+        """打开这一帧的窗口：最多budget秒，并且在时间点之前留出SPIN"""
+        self.window_end = min(perf_counter() + self.budget, deadline - SPIN)
+        waiting, self._next_window = self._next_window, None
+        if waiting is not None and not waiting.done():
+            waiting.set_result(None)
+
+    async def checkpoint(self):
+        """后台任务调用：等到当前窗口内还有剩余时间"""
+        while perf_counter() >= self.window_end:
+            self.deferred += 1
+            if self._next_window is None:
+                self._next_window = asyncio.get_running_loop().create_future()
+            await self._next_window
+
+
+class BackgroundTasks:
+    """异步主循环中的后台任务
+
+    阻塞的I/O（写文件、初始化混音器）放到单线程的执行器中按提交顺序执行；
+    周期性任务在事件循环中运行，每次执行前先通过FrameBudget.checkpoint()。
+    """
+
+    def __init__(self, budget):
+        self.budget = FrameBudget(budget)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background io")
+        self.tasks = set()
+        self.late_frames = 0
+        self.frames = 0
+
+    def spawn(self, awaitable):
+        """启动一个后台任务（协程或Future）；任务出错时只打印警告"""
+        task = asyncio.ensure_future(awaitable)
+        self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"警告: 后台任务出错 ({task.exception()!r})")
+
+    def run_blocking(self, function, *args):
+        """在执行器中运行阻塞的函数，返回可以await的结果"""
+        return asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def submit(self, function, *args):
+        """提交阻塞的函数，不等待结果（例如DataManager写文件）；退出时会等它完成"""
+        future = self.executor.submit(function, *args)
+        future.add_done_callback(self._submitted_done)
+        return future
+
+    @staticmethod
+    def _submitted_done(future):
+        if future.exception() is not None:
+            print(f"警告: 后台I/O出错 ({future.exception()!r})")
+
+    def every(self, interval, job):
+        """每隔interval秒运行一次异步函数job"""
+        async def periodic():
+            while True:
+                await asyncio.sleep(interval)
+                await self.budget.checkpoint()
+                try:
+                    await job()
+                except Exception as e:
+                    print(f"警告: 周期任务出错 ({e!r})")
+        return self.spawn(periodic())
+
+    async def end_frame(self, delay):
+        """主循环每帧调用：把到下一帧时间点之前的时间交给后台任务"""
+        deadline = perf_counter() + delay
+        self.budget.open(deadline)
+        await sleep_until(deadline)
+        self.frames += 1
+        # 被后台任务拖到时间点之后超过1毫秒才拿回控制权
+        if perf_counter() - deadline > 0.001:
+            self.late_frames += 1
+
+    def get_metrics(self):
+        """后台任务数量、被推迟到下一帧的次数和迟到的帧数"""
+        return {
+            'tasks': len(self.tasks),
+            'deferred': self.budget.deferred,
+            'frames': self.frames,
+            'late_frames': self.late_frames,
+        }
+
+    def close(self):
+        """取消后台任务，等待已提交的写入完成"""
+        for task in list(self.tasks):
+            task.cancel()
+        self.executor.shutdown(wait=True)
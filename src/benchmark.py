@@ -0,0 +1,121 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+"""性能基准测试
+
+在无窗口环境下运行固定的游戏场景，统计每帧的模拟和渲染耗时。
+用法: python benchmark.py [--frames N] [--renderer surface texture ...] [--scenario ...] [--collision rect precise]
+"""
+
+import argparse
+import os
+from time import perf_counter
+
+# 在导入pygame之前设置，保证在无显示器的Linux上也能运行
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from enemy_fire import ENEMY_PROJECTILE
+from renderer import RENDERERS
+from collision import COLLISION_MODES
+
+
+def _start_game(ai_game):
+    """像点击Play按钮一样开始新游戏"""
+    ai_game._check_play_button(ai_game.play_button.rect.center)
+
+
+def scenario_full_fleet(ai_game, frame):
+    """满编舰队，飞船来回移动并持续射击"""
+    ai_game.ship.moving_right = (frame // 120) % 2 == 0
+    ai_game.ship.moving_left = not ai_game.ship.moving_right
+    ai_game._fire_bullet()
+
+
+def scenario_bullet_hell(ai_game, frame):
+    """弹幕模式：外星人持续齐射，飞船来回移动但不射击（保留整个舰队）"""
+    if frame == 0:
+        ai_game.enemy_fire.enabled = True
+        ai_game.enemy_fire.set_mode('bullet_hell')
+    ai_game.ship.moving_right = (frame // 120) % 2 == 0
+    ai_game.ship.moving_left = not ai_game.ship.moving_right
+
+
+SCENARIOS = {
+    'full_fleet': scenario_full_fleet,
+    'bullet_hell': scenario_bullet_hell,
+}
+
+
+def _step(ai_game):
+    """执行一帧游戏逻辑（与run_game中相同的顺序）"""
+    if ai_game.game_active:
+        ai_game.ship.update()
+        ai_game._update_entities()
+        ai_game._update_aliens()
+
+
+def run_benchmark(renderer, scenario, frames, render_scale=None, collision_mode=None):
+    """运行一个场景，返回每帧平均模拟和渲染耗时（毫秒）以及敌方子弹数量的峰值"""
+    ai_game = AlienInvasion(renderer=renderer, render_scale=render_scale)
+    if collision_mode is not None:
+        ai_game.precise_collisions = collision_mode == 'precise'
+    # 基准测试中飞船不会被击毁，避免_ship_hit中的sleep影响计时
+    ai_game._ship_hit = lambda: None
+    _start_game(ai_game)
+
+    drive = SCENARIOS[scenario]
+    sim_time = render_time = 0.0
+    peak_projectiles = 0
+    for frame in range(frames):
+        drive(ai_game, frame)
+        start = perf_counter()
+        _step(ai_game)
+        middle = perf_counter()
+        ai_game._update_screen()
+        end = perf_counter()
+        sim_time += middle - start
+        render_time += end - middle
+        peak_projectiles = max(peak_projectiles, ai_game.world.count_kind(ENEMY_PROJECTILE))
+
+    return {
+        'renderer': ai_game.renderer.name,
+        'scenario': scenario,
+        'collision': 'precise' if ai_game.precise_collisions else 'rect',
+        'sim_ms': sim_time * 1000 / frames,
+        'render_ms': render_time * 1000 / frames,
+        'projectiles': peak_projectiles,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alien Invasion 性能基准测试")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--renderer', nargs='+', choices=RENDERERS,
+                        default=['surface', 'texture_software'])
+    parser.add_argument('--scenario', nargs='+', choices=sorted(SCENARIOS),
+                        default=sorted(SCENARIOS))
+    parser.add_argument('--render-scale', type=float, default=None)
+    parser.add_argument('--collision', nargs='+', choices=COLLISION_MODES,
+                        default=list(COLLISION_MODES))
+    args = parser.parse_args()
+
+    print(f"{'scenario':<16}{'renderer':<18}{'collision':<11}{'sim ms':>10}{'render ms':>12}"
+          f"{'total ms':>12}{'projectiles':>13}")
+    for scenario in args.scenario:
+        for renderer in args.renderer:
+            for collision_mode in args.collision:
+                result = run_benchmark(renderer, scenario, args.frames, args.render_scale,
+                                       collision_mode)
+                total = result['sim_ms'] + result['render_ms']
+                print(f"{result['scenario']:<16}{result['renderer']:<18}{result['collision']:<11}"
+                      f"{result['sim_ms']:>10.3f}{result['render_ms']:>12.3f}{total:>12.3f}"
+                      f"{result['projectiles']:>13}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
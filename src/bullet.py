@@ -1,34 +1,17 @@
 # Copyright (c) 2025 tree_division
 # Licensed under the MIT License
 
-import pygame
-from pygame.sprite import Sprite
+# 子弹是World中的实体（见ecs.py），移动、剔除、碰撞和绘制都由系统批量处理
+BULLET = 1
 
-class Bullet(Sprite):
-    """A class to manage bullets fired from the ship."""
 
-    def __init__(self, ai_game):
-        """Create a bullet object at the ship's current position."""
-        super().__init__()
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings
-        self.color = self.settings.bullet_color
-
-        # Create a bullet rect at (0, 0) and then set correct position.
-        self.rect = pygame.Rect(0, 0, self.settings.bullet_width,
-            self.settings.bullet_height)
-        self.rect.midtop = ai_game.ship.rect.midtop
-
-        # Store the bullet's position as a float.
-        self.y = float(self.rect.y)
-
-    def update(self):
-        """Move the bullet up the screen."""
-        # Update the exact position of the bullet.
-        self.y -= self.settings.bullet_speed
-        # Update the rect position.
-        self.rect.y = self.y
-
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
\ No newline at end of file
+def spawn_bullet(ai_game):
+    """Create a bullet at the ship's current position, return its entity index."""
+    settings = ai_game.settings
+    ship_rect = ai_game.ship.rect
+    return ai_game.world.spawn(
+        BULLET,
+        ship_rect.centerx - settings.bullet_width // 2, ship_rect.top,
+        vy=-settings.bullet_speed,
+        width=settings.bullet_width, height=settings.bullet_height,
+        sprite=ai_game.bullet_sprite)
@@ -3,6 +3,8 @@
 
 import pygame.font
 
+import asset_pack
+
 
 class Button:
     """A class to build buttons for the game."""
@@ -10,6 +12,7 @@ class Button:
     def __init__(self, ai_game, msg):
         """Initialize button attributes."""
         self.screen = ai_game.screen
+        self.renderer = ai_game.renderer
         self.screen_rect = self.screen.get_rect()
 
         # Set the dimensions and properties of the button.
@@ -17,10 +20,7 @@ class Button:
         self.button_color = (0, 135, 0)
         self.text_color = (255, 255, 255)
         # 使用Consolas字体
-        try:
-            self.font = pygame.font.SysFont("Consolas", 48)
-        except:
-            self.font = pygame.font.SysFont(None, 48)
+        self.font = asset_pack.load_font("Consolas", 48)
 
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -38,7 +38,7 @@ class Button:
 
     def draw_button(self):
         """Draw blank button and then draw message."""
-        self.screen.fill(self.button_color, self.rect)
+        self.renderer.fill(self.button_color, self.rect)
         # 关键修复：每次绘制时更新文本位置
         self.msg_image_rect.center = self.rect.center
-        self.screen.blit(self.msg_image, self.msg_image_rect)
\ No newline at end of file
+        self.renderer.blit(self.msg_image, self.msg_image_rect)
\ No newline at end of file
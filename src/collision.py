@@ -0,0 +1,57 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import weakref
+from functools import lru_cache
+
+import pygame
+
+COLLISION_MODES = ('rect', 'precise')
+
+# 图像 -> 碰撞遮罩 的缓存。同一张图像的所有精灵共用一个遮罩（外星人共享图集的子表面），
+# 图像被回收时遮罩随之释放
+_masks = weakref.WeakKeyDictionary()
+
+# 遮罩比较的总次数（运行指标）；矩形比较由调用者计数，见AlienInvasion.collision_checks
+mask_checks = 0
+
+
+def get_mask(image):
+    """返回图像的碰撞遮罩（每张图像只计算一次）"""
+    mask = _masks.get(image)
+    if mask is None:
+        mask = pygame.mask.from_surface(image)
+        _masks[image] = mask
+    return mask
+
+
+@lru_cache(maxsize=32)
+def solid_mask(width, height):
+    """完全不透明的矩形遮罩（用于子弹这类纯色矩形）"""
+    return pygame.mask.Mask((max(1, int(width)), max(1, int(height))), fill=True)
+
+
+def masks_overlap(mask_a, pos_a, mask_b, pos_b):
+    """两个遮罩分别放在pos_a和pos_b（左上角）时是否有重叠的像素"""
+    global mask_checks
+    mask_checks += 1
+    offset = (int(pos_b[0]) - int(pos_a[0]), int(pos_b[1]) - int(pos_a[1]))
+    return mask_a.overlap(mask_b, offset) is not None
+
+
+def collide_sprites(sprite_a, sprite_b):
+    """两个精灵是否像素级重叠；只对矩形已经重叠的精灵比较遮罩"""
+    if not sprite_a.rect.colliderect(sprite_b.rect):
+        return False
+    return masks_overlap(get_mask(sprite_a.image), sprite_a.rect,
+                         get_mask(sprite_b.image), sprite_b.rect)
+
+
+def spritecollideany(sprite, group, precise):
+    """和pygame.sprite.spritecollideany相同，precise为True时对矩形重叠的精灵再比较遮罩"""
+    if not precise:
+        return pygame.sprite.spritecollideany(sprite, group)
+    for other in pygame.sprite.spritecollide(sprite, group, False):
+        if collide_sprites(sprite, other):
+            return other
+    return None
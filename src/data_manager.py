@@ -4,14 +4,70 @@
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from time import perf_counter
+
+from stats_engine import StatisticsEngine
+
+
+def write_text(filename, text):
+    """把序列化好的游戏数据写入文件"""
+    try:
+        with open(filename, 'w') as f:
+            f.write(text)
+        return True
+    except IOError as e:
+        print(f"错误: 无法保存游戏数据 ({e})")
+        return False
+
 
 class DataManager:
     """管理游戏数据的持久化存储"""
     
-    def __init__(self, filename='game_data.json'):
+    def __init__(self, filename='game_data.json', lazy=False, background=False):
         self.filename = filename
-        self.data = self._load_data()
+        self._data = None
+        self._analytics = None
+        # get_statistics的缓存，数据变化时清空
+        self._statistics = None
+        # 执行写入的函数writer(write_text, filename, text)；为None时直接写入，
+        # background为True时交给单独的写入线程按顺序执行，游戏结束保存对局记录时
+        # 游戏线程不等待磁盘；异步主循环中改为交给它的后台线程
+        self.writer = None
+        if background:
+            # 线程池在解释器退出前会执行完已提交的写入
+            self._executor = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix="data writer")
+            self.writer = self._executor.submit
+        # 可选的直方图（metrics_server.Histogram），记录每次写文件的耗时
+        self.write_histogram = None
+        # 延迟模式下第一次访问data时才读取文件
+        if not lazy:
+            self._data = self._load_data()
+
+    @property
+    def data(self):
+        """游戏数据，首次访问时加载"""
+        if self._data is None:
+            self._data = self._load_data()
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._analytics = None
+        self._statistics = None
+
+    @property
+    def analytics(self):
+        """增量统计引擎；旧的数据文件没有统计状态时从对局记录重建"""
+        if self._analytics is None:
+            if "analytics" in self.data:
+                self._analytics = StatisticsEngine.from_dict(self.data["analytics"])
+            else:
+                self._analytics = StatisticsEngine.from_history(self.data["game_history"])
+        return self._analytics
     
     def _load_data(self):
         """加载游戏数据，如果文件不存在则创建默认数据"""
@@ -49,19 +105,27 @@ class DataManager:
         """保存数据到文件"""
         if data is None:
             data = self.data
-            
-        try:
-            with open(self.filename, 'w') as f:
-                json.dump(data, f, indent=4)
+
+        # 在调用者的线程中序列化，之后数据再变化也不影响这次写入的内容
+        text = json.dumps(data, indent=4)
+        if self.writer is not None:
+            self.writer(self._write, self.filename, text)
             return True
-        except IOError as e:
-            print(f"错误: 无法保存游戏数据 ({e})")
-            return False
+        return self._write(self.filename, text)
+
+    def _write(self, filename, text):
+        """写入文件并记录耗时"""
+        start = perf_counter()
+        saved = write_text(filename, text)
+        if self.write_histogram is not None:
+            self.write_histogram.observe(perf_counter() - start)
+        return saved
     
     def update_high_score(self, score):
         """更新最高分"""
         if score > self.data["high_score"]:
             self.data["high_score"] = score
+            self._statistics = None
             self._save_data()
             return True
         return False
@@ -90,11 +154,22 @@ class DataManager:
         # 只保留最近50条记录
         if len(self.data["game_history"]) > 50:
             self.data["game_history"] = self.data["game_history"][:50]
+
+        # 增量更新统计，不再在读取时重新计算
+        self.analytics.add(score, level)
+        self.data["analytics"] = self.analytics.to_dict()
+        self._statistics = None
         
         self._save_data()
     
     def get_statistics(self):
-        """获取游戏统计信息"""
+        """获取游戏统计信息（缓存结果，数据变化后才重新计算）"""
+        if self._statistics is None:
+            self._statistics = self._compute_statistics()
+        return self._statistics
+
+    def _compute_statistics(self):
+        """计算统计信息"""
         games_played = self.data["games_played"]
         if games_played > 0:
             avg_score = self.data["total_score"] / games_played
@@ -105,7 +180,7 @@ class DataManager:
             avg_aliens = 0
             accuracy = 0
             
-        return {
+        statistics = {
             "high_score": self.data["high_score"],
             "games_played": games_played,
             "average_score": round(avg_score),
@@ -115,6 +190,8 @@ class DataManager:
             "best_level": self.data["best_level"],
             "recent_games": self.data["game_history"][:10]  # 最近10场游戏
         }
+        statistics.update(self.analytics.summary())
+        return statistics
     
     def save_settings(self, bg_color, sound_enabled):
         """保存游戏设置 - 完全忽略背景颜色参数"""
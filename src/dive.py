@@ -0,0 +1,109 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import random
+
+import numpy as np
+
+# 俯冲路径最低点相对出发位置的水平偏移：-DIVE_STEP*DIVE_REACH 到 +DIVE_STEP*DIVE_REACH
+DIVE_STEP = 100
+DIVE_REACH = 5
+
+
+def _bezier(p0, p1, p2, p3, frames):
+    """三次贝塞尔曲线上均匀取frames个点，返回形状为(frames, 2)的数组"""
+    t = np.linspace(0, 1, frames)[:, None]
+    u = 1 - t
+    return (u ** 3 * np.array(p0) + 3 * u ** 2 * t * np.array(p1)
+            + 3 * u * t ** 2 * np.array(p2) + t ** 3 * np.array(p3))
+
+
+def _dive_points(dx, depth, frames):
+    """俯冲路径上的逐帧位置，形状为(frames, 2)
+
+    路径由两段贝塞尔曲线组成：先向外侧小幅上扬再俯冲到(dx, depth)，
+    然后从另一侧绕回出发位置(0, 0)。
+    """
+    side = 1 if dx >= 0 else -1
+    half = frames // 2
+    out = _bezier((0, 0), (-side * 60, -40), (dx, depth * 0.4), (dx, depth), half)
+    back = _bezier((dx, depth), (dx + side * 120, depth * 1.1), (-side * 80, -120), (0, 0),
+                   frames - half)
+    return np.vstack((out, back))
+
+
+def tabulate_dive(dx, frames):
+    """把一条俯冲路径预先计算成形状为(frames, 3)的float32表
+
+    三列为x偏移、深度为0时的y偏移、y偏移随深度的变化率。贝塞尔曲线对控制点是线性的，
+    所以同一张表可以在俯冲开始时按外星人当时到飞船的距离展开（见dive_path）。
+    """
+    base = _dive_points(dx, 0, frames)
+    unit = _dive_points(dx, 1, frames)
+    return np.column_stack((base, unit[:, 1] - base[:, 1])).astype(np.float32)
+
+
+def dive_path(table, depth):
+    """按深度展开路径表，返回[(x偏移, y偏移, 朝向角度), ...]
+
+    角度为0时外星人朝下，用于旋转俯冲中的外星人图像。
+    """
+    points = table[:, :2] + np.outer(table[:, 2], (0, depth))
+    heading = np.gradient(points, axis=0)
+    angles = np.degrees(np.arctan2(heading[:, 0], heading[:, 1]))
+    return [(x, y, angle) for (x, y), angle
+            in zip(points.round().astype(int).tolist(), angles.round().astype(int).tolist())]
+
+
+class DiveController:
+    """外星人的俯冲攻击
+
+    每隔interval帧，在俯冲的外星人少于max_divers时，随机选一个外星人离开队形，
+    沿曲线冲向飞船再回到队形中。路径的形状预先计算成查找表，俯冲开始时按外星人
+    当时的高度展开（舰队下移之后最低点仍然在飞船处），每帧每个俯冲的外星人
+    只需查一次表（见Alien.update）。
+    """
+
+    def __init__(self, ai_game):
+        self.ai_game = ai_game
+        settings = ai_game.settings
+        self.enabled = settings.dive_enabled
+        self.max_divers = settings.max_divers
+        self.interval = max(1, settings.dive_interval)
+        self.frames = max(2, settings.dive_frames)
+        # 水平偏移的档位 -> 路径表；与舰队的位置无关，只计算一次
+        self.tables = {}
+        if self.enabled:
+            self.tables = {step: tabulate_dive(step * DIVE_STEP, self.frames)
+                           for step in range(-DIVE_REACH, DIVE_REACH + 1)}
+        self.divers = []
+        self.frame = 0
+
+    def load_wave(self):
+        """新的一波舰队生成后调用"""
+        self.divers = []
+        self.frame = 0
+
+    def update(self):
+        """每帧在移动外星人之前调用：到了间隔时派出新的俯冲者"""
+        if not self.enabled:
+            return
+        self.frame += 1
+        self.divers = [alien for alien in self.divers
+                       if alien.dive_path is not None and alien.alive()]
+        if len(self.divers) >= self.max_divers or self.frame % self.interval:
+            return
+
+        candidates = [alien for alien in self.ai_game.aliens.sprites()
+                      if alien.dive_path is None]
+        if not candidates:
+            return
+        alien = random.choice(candidates)
+
+        # 选择最低点最接近飞船的那条路径，按外星人现在的高度决定俯冲的深度
+        ship_rect = self.ai_game.ship.rect
+        offset = ship_rect.centerx - alien.rect.centerx
+        step = max(-DIVE_REACH, min(DIVE_REACH, round(offset / DIVE_STEP)))
+        depth = max(0, ship_rect.centery - alien.y - ship_rect.height)
+        alien.start_dive(dive_path(self.tables[step], depth))
+        self.divers.append(alien)
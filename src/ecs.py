@@ -0,0 +1,246 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+from time import perf_counter
+
+import numpy as np
+
+
+class World:
+    """实体组件系统（ECS）的核心
+
+    每种组件（类型、位置、速度、碰撞尺寸、精灵、生命值）存放在一个连续的
+    numpy数组中，实体就是数组下标。存活的实体始终紧密排列在[0, count)，
+    系统一次处理整段数组，而不是逐个对象调用Python方法。
+    删除实体时先标记，在每次运行系统之后统一压缩，所以实体下标只在同一帧内有效。
+    """
+
+    # 所有组件数组的属性名；_dead必须在最后
+    COMPONENTS = ('kind', 'position', 'velocity', 'collider', 'sprite', 'health', '_dead')
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.count = 0
+
+        # 组件数组
+        self.kind = np.zeros(capacity, np.int8)
+        self.position = np.zeros((capacity, 2), np.float32)   # 左上角 x, y
+        self.velocity = np.zeros((capacity, 2), np.float32)   # 每帧移动的像素
+        self.collider = np.zeros((capacity, 2), np.float32)   # 宽, 高
+        self.sprite = np.full(capacity, -1, np.int16)         # 精灵表中的下标
+        self.health = np.ones(capacity, np.int16)
+        self._dead = np.zeros(capacity, bool)
+
+        # 精灵表：每项是(图像, 颜色)，图像为None时绘制为纯色矩形
+        self.sprites = []
+
+        # 按阶段组织的系统，按注册顺序运行
+        self.systems = {'update': [], 'render': []}
+        # 每个系统的耗时（毫秒，指数移动平均）
+        self.timings = {}
+
+    def bytes_per_entity(self):
+        """每个实体在组件数组中占用的字节数"""
+        return sum(getattr(self, name)[0].nbytes for name in self.COMPONENTS)
+
+    def register_sprite(self, image=None, color=None):
+        """登记一个精灵（图像或纯色矩形的颜色），返回精灵下标"""
+        self.sprites.append((image, color))
+        return len(self.sprites) - 1
+
+    def _reserve(self, extra):
+        """保证还能再放下extra个实体，不够时容量翻倍"""
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in self.COMPONENTS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def spawn(self, kind, x, y, vx=0.0, vy=0.0, width=0, height=0, sprite=-1, health=1):
+        """创建一个实体，返回它的下标"""
+        self._reserve(1)
+        i = self.count
+        self.kind[i] = kind
+        self.position[i] = (x, y)
+        self.velocity[i] = (vx, vy)
+        self.collider[i] = (width, height)
+        self.sprite[i] = sprite
+        self.health[i] = health
+        self._dead[i] = False
+        self.count = i + 1
+        return i
+
+    def spawn_many(self, kind, positions, velocities, width=0, height=0, sprite=-1, health=1):
+        """批量创建实体；positions和velocities是形状为(n, 2)的数组"""
+        n = len(positions)
+        if n == 0:
+            return
+        self._reserve(n)
+        start, end = self.count, self.count + n
+        self.kind[start:end] = kind
+        self.position[start:end] = positions
+        self.velocity[start:end] = velocities
+        self.collider[start:end] = (width, height)
+        self.sprite[start:end] = sprite
+        self.health[start:end] = health
+        self._dead[start:end] = False
+        self.count = end
+
+    def indices(self, kind):
+        """返回某种类型的所有存活实体的下标"""
+        return np.flatnonzero(self.kind[:self.count] == kind)
+
+    def count_kind(self, kind):
+        """某种类型的实体数量"""
+        return int(np.count_nonzero(self.kind[:self.count] == kind))
+
+    def kill(self, indices):
+        """标记实体为待删除，在flush时统一移除"""
+        self._dead[indices] = True
+
+    def clear(self, kind=None):
+        """删除某种类型的全部实体（kind为None时删除全部）"""
+        if kind is None:
+            self._dead[:self.count] = False
+            self.count = 0
+        else:
+            self.kill(self.indices(kind))
+            self.flush()
+
+    def flush(self):
+        """移除标记为删除的实体，把剩下的实体紧密排列"""
+        n = self.count
+        dead = self._dead[:n]
+        if not dead.any():
+            return
+        keep = ~dead
+        alive = int(np.count_nonzero(keep))
+        for name in self.COMPONENTS[:-1]:
+            array = getattr(self, name)
+            array[:alive] = array[:n][keep]
+        self._dead[:n] = False
+        self.count = alive
+
+    def rects(self, indices):
+        """返回实体的矩形，形状为(n, 4)：x, y, 宽, 高"""
+        return np.hstack((self.position[indices], self.collider[indices]))
+
+    def overlaps(self, indices, rects):
+        """实体和一组矩形(m, 4)的重叠矩阵，形状为(n, m)，与pygame.Rect.colliderect一致"""
+        pos = self.position[indices]
+        size = self.collider[indices]
+        left, top = pos[:, 0:1], pos[:, 1:2]
+        right, bottom = left + size[:, 0:1], top + size[:, 1:2]
+        return ((left < rects[:, 0] + rects[:, 2]) & (right > rects[:, 0])
+                & (top < rects[:, 1] + rects[:, 3]) & (bottom > rects[:, 1]))
+
+    def sweep(self, indices, rects):
+        """连续碰撞检测：实体在这一帧从上一位置（position - velocity）移动到当前位置，
+        返回与每个矩形(m, 4)最早接触的时刻t（0到1），没有接触为inf，形状为(n, m)
+
+        每个轴上分别求出重叠的时间区间，再取交集（分离轴/slab方法），
+        速度再大也不会穿过矩形，计算量和一次重叠测试相当。
+        """
+        pos = self.position[indices]
+        vel = self.velocity[indices]
+        size = self.collider[indices]
+        start = pos - vel
+
+        t_enter = np.zeros((len(indices), len(rects)), np.float32)
+        t_exit = np.ones((len(indices), len(rects)), np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for axis in (0, 1):
+                s = start[:, axis:axis + 1]
+                d = vel[:, axis:axis + 1]
+                low = rects[:, axis] - size[:, axis:axis + 1]
+                high = rects[:, axis] + rects[:, axis + 2]
+                t1 = (low - s) / d
+                t2 = (high - s) / d
+                # 这个轴上没有移动时，要么一直重叠要么一直不重叠
+                overlapping = (s > low) & (s < high)
+                near = np.where(d == 0, np.where(overlapping, -np.inf, np.inf), np.minimum(t1, t2))
+                far = np.where(d == 0, np.where(overlapping, np.inf, -np.inf), np.maximum(t1, t2))
+                t_enter = np.maximum(t_enter, near)
+                t_exit = np.minimum(t_exit, far)
+        return np.where(t_enter < t_exit, t_enter, np.inf)
+
+    def add_system(self, name, system, phase='update'):
+        """注册一个系统；system(world)按注册顺序在对应阶段运行"""
+        self.systems[phase].append((name, system))
+        self.timings[name] = 0.0
+
+    def run(self, phase='update'):
+        """按顺序运行某个阶段的所有系统，并记录每个系统的耗时"""
+        for name, system in self.systems[phase]:
+            start = perf_counter()
+            system(self)
+            self.flush()
+            elapsed = (perf_counter() - start) * 1000
+            self.timings[name] += (elapsed - self.timings[name]) * 0.05
+
+    def get_timings(self):
+        """返回各系统的平均耗时（毫秒）"""
+        return {name: round(ms, 3) for name, ms in self.timings.items()}
+
+
+def movement_system(world):
+    """按速度移动所有实体"""
+    n = world.count
+    world.position[:n] += world.velocity[:n]
+
+
+def make_culling_system(width, height, margin=0):
+    """创建剔除系统：完全离开屏幕（加上margin）的实体被删除"""
+    def culling_system(world):
+        n = world.count
+        pos = world.position[:n]
+        size = world.collider[:n]
+        outside = ((pos[:, 0] + size[:, 0] <= -margin) | (pos[:, 0] >= width + margin)
+                   | (pos[:, 1] + size[:, 1] <= -margin) | (pos[:, 1] >= height + margin))
+        world.kill(np.flatnonzero(outside))
+    return culling_system
+
+
+def render_commands(world):
+    """按精灵分组的绘制命令 [(图像, 颜色, 位置或矩形的列表), ...]
+
+    命令只包含新建的列表和不会被修改的图像，可以交给另一个线程绘制。
+    """
+    n = world.count
+    if n == 0:
+        return []
+    commands = []
+    sprite_ids = world.sprite[:n]
+    for sprite_id in np.unique(sprite_ids):
+        if sprite_id < 0:
+            continue
+        members = np.flatnonzero(sprite_ids == sprite_id)
+        image, color = world.sprites[sprite_id]
+        if image is None:
+            commands.append((None, color, world.rects(members).tolist()))
+        else:
+            commands.append((image, None, world.position[members].tolist()))
+    return commands
+
+
+def draw_commands(renderer, commands):
+    """执行render_commands生成的绘制命令"""
+    for image, color, items in commands:
+        if image is None:
+            renderer.fill_rects(color, items)
+        else:
+            renderer.blits(image, items)
+
+
+def make_render_system(renderer):
+    """创建渲染系统：同一精灵的实体一次批量绘制"""
+    def render_system(world):
+        draw_commands(renderer, render_commands(world))
+    return render_system
@@ -0,0 +1,151 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import math
+import random
+
+import numpy as np
+import pygame
+
+from collision import get_mask, masks_overlap
+
+# 敌方子弹在World中的实体类型
+ENEMY_PROJECTILE = 2
+
+PATTERNS = ('aimed', 'spread', 'spiral')
+
+
+class EnemyFire:
+    """外星人的射击
+
+    按config.json中enemy_fire的设置，每隔fire_interval帧随机选出几个外星人，
+    依次使用patterns中的射击模式发射子弹：
+    aimed 瞄准飞船，spread 向下呈扇形，spiral 每次齐射旋转一个角度。
+    子弹是World中的实体，移动和剔除由World的系统批量完成。
+    """
+
+    def __init__(self, ai_game):
+        self.ai_game = ai_game
+        self.world = ai_game.world
+        settings = ai_game.settings
+
+        self.enabled = settings.enemy_fire_enabled
+        self.modes = settings.enemy_fire_modes
+        self.max_projectiles = settings.max_enemy_projectiles
+        self.patterns = [pattern for pattern in settings.enemy_fire_patterns
+                         if self._check_pattern(pattern)]
+        if not self.patterns:
+            self.enabled = False
+
+        self.set_mode(settings.enemy_fire_mode)
+
+        self.size = settings.enemy_projectile_size
+        self.image = self._make_image(self.size, settings.enemy_projectile_color)
+        self.sprite = self.world.register_sprite(image=self.image)
+        self.reset()
+
+    @staticmethod
+    def _check_pattern(pattern):
+        """检查射击模式的类型是否有效"""
+        if pattern.get("type") in PATTERNS:
+            return True
+        print(f"警告: 未知的射击模式 {pattern}，已忽略")
+        return False
+
+    @staticmethod
+    def _make_image(size, color):
+        """预先绘制一颗圆形子弹，所有敌方子弹共用"""
+        image = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(image, color, (size / 2, size / 2), size / 2)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+
+    def set_mode(self, mode):
+        """切换难度模式（modes中的一项，例如normal或bullet_hell）"""
+        if mode not in self.modes:
+            fallback = 'normal' if 'normal' in self.modes else next(iter(self.modes), None)
+            if fallback is None:
+                print(f"警告: 未知的敌方射击模式 '{mode}'，且没有可用的模式，敌方射击已关闭")
+                self.enabled = False
+                self.mode, self.fire_interval, self.shooters = None, 1, 0
+                return
+            print(f"警告: 未知的敌方射击模式 '{mode}'，改用 {fallback}")
+            mode = fallback
+        self.mode = mode
+        self.fire_interval = max(1, self.modes[mode]["fire_interval"])
+        self.shooters = self.modes[mode]["shooters"]
+
+    def reset(self):
+        """新的一局开始"""
+        self.frame = 0
+        self.volleys = 0
+        self.spiral_angle = 0.0
+
+    def fire_system(self, world):
+        """World的系统：到了射击间隔时让外星人齐射"""
+        if not self.enabled:
+            return
+        self.frame += 1
+        if self.frame % self.fire_interval:
+            return
+
+        aliens = self.ai_game.aliens.sprites()
+        room = self.max_projectiles - world.count_kind(ENEMY_PROJECTILE)
+        if not aliens or room <= 0:
+            return
+
+        for alien in random.sample(aliens, min(self.shooters, len(aliens))):
+            pattern = self.patterns[self.volleys % len(self.patterns)]
+            self.volleys += 1
+            room -= self._fire(world, pattern, alien.rect.centerx, alien.rect.bottom, room)
+            if room <= 0:
+                break
+
+    def _fire(self, world, pattern, x, y, room):
+        """从(x, y)按一种模式发射子弹，返回发射的数量"""
+        count = min(pattern.get("count", 1), room)
+        if count <= 0:
+            return 0
+        spread = math.radians(pattern.get("angle", 0))
+
+        if pattern["type"] == 'aimed':
+            ship_rect = self.ai_game.ship.rect
+            base = math.atan2(ship_rect.centery - y, ship_rect.centerx - x)
+        elif pattern["type"] == 'spiral':
+            base = self.spiral_angle
+            self.spiral_angle += math.radians(pattern.get("rotation", 10))
+        else:
+            base = math.pi / 2  # 正下方
+
+        if count == 1:
+            angles = np.array([base])
+        elif spread >= 2 * math.pi - 1e-6:
+            # 整圈均匀分布，首尾不重合
+            angles = base + np.arange(count) * (2 * math.pi / count)
+        else:
+            angles = base + np.linspace(-spread / 2, spread / 2, count)
+
+        speed = pattern.get("speed", 3.0)
+        velocities = np.column_stack((np.cos(angles), np.sin(angles))) * speed
+        positions = np.tile((x - self.size / 2, y - self.size / 2), (count, 1))
+        world.spawn_many(ENEMY_PROJECTILE, positions, velocities,
+                         self.size, self.size, self.sprite)
+        return count
+
+    def ship_collision_system(self, world):
+        """World的系统：检查敌方子弹是否击中飞船"""
+        projectiles = world.indices(ENEMY_PROJECTILE)
+        if len(projectiles) == 0:
+            return
+        ship = self.ai_game.ship
+        hits = projectiles[world.overlaps(projectiles, np.array([ship.rect], np.float32))[:, 0]]
+        self.ai_game.collision_checks += len(projectiles)
+        if len(hits) and self.ai_game.precise_collisions:
+            # 只对矩形已经重叠的子弹比较遮罩
+            ship_mask, mask = get_mask(ship.image), get_mask(self.image)
+            hits = [i for i in hits
+                    if masks_overlap(ship_mask, ship.rect, mask, world.position[i])]
+        if len(hits):
+            world.kill(hits)
+            self.ai_game._ship_hit()
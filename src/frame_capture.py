@@ -0,0 +1,151 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import os
+import queue
+import shlex
+import subprocess
+import threading
+from datetime import datetime
+
+import numpy as np
+import pygame
+
+CAPTURE_FORMATS = ('raw', 'png', 'pipe')
+
+
+class FrameCapture:
+    """录制游戏画面，不阻塞游戏循环
+
+    游戏线程每隔every帧把画面的像素复制到缓冲池中的一块缓冲区（32位表面只是一次
+    内存复制），交给后台线程转换为RGB并写出：raw把所有帧追加到一个.rgb文件，
+    png写出图片序列，pipe把帧写入外部编码器（例如ffmpeg）的标准输入。
+    缓冲池和队列大小固定，写出跟不上时丢弃新的帧并计数，游戏线程从不等待。
+    """
+
+    def __init__(self, size, fmt='raw', every=1, directory='captures',
+                 command=None, queue_size=8, fps=60):
+        if fmt not in CAPTURE_FORMATS:
+            raise ValueError(f"未知的录制格式 '{fmt}'")
+        self.width, self.height = size
+        self.fmt = fmt
+        self.every = max(1, every)
+        self.frame = 0
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        os.makedirs(directory, exist_ok=True)
+        self.output = None
+        self.process = None
+        if fmt == 'raw':
+            self.path = os.path.join(directory, f"capture-{stamp}_{self.width}x{self.height}.rgb")
+            self.output = open(self.path, 'wb')
+        elif fmt == 'png':
+            self.path = os.path.join(directory, f"capture-{stamp}")
+            os.makedirs(self.path)
+        else:
+            self.path = command.format(width=self.width, height=self.height,
+                                       fps=fps / self.every,
+                                       output=os.path.join(directory, f"capture-{stamp}"))
+            self.process = subprocess.Popen(shlex.split(self.path), stdin=subprocess.PIPE)
+            self.output = self.process.stdin
+
+        # 缓冲池的大小就是队列的上限：缓冲区全部在排队或正在写出时丢弃新的帧
+        self.free = queue.Queue()
+        self.pending = queue.Queue()
+        self.layout = None
+        self.buffer_size = 0
+        self.rgb = np.empty((self.height, self.width, 3), np.uint8)   # 只在后台线程中使用
+        self.pool_size = max(1, queue_size)
+        self._thread = threading.Thread(target=self._run, name="frame capture", daemon=True)
+        self._thread.start()
+
+    def _layout(self, surface):
+        """根据表面的像素格式决定复制方式；32位表面直接复制原始像素"""
+        if surface.get_bytesize() == 4:
+            # 小端机器上每个通道在像素中的字节位置
+            channels = [shift // 8 for shift in surface.get_shifts()[:3]]
+            return ('raw', surface.get_pitch(), channels), surface.get_pitch() * self.height
+        return ('rgb', self.width * 3, None), self.width * self.height * 3
+
+    def capture(self, surface):
+        """在游戏线程中调用：复制这一帧的像素（没有空闲缓冲区时丢弃这一帧）"""
+        self.frame += 1
+        if self.frame % self.every or self.error is not None:
+            return
+        if self.layout is None:
+            self.layout, self.buffer_size = self._layout(surface)
+            for _ in range(self.pool_size):
+                self.free.put(bytearray(self.buffer_size))
+        try:
+            buffer = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+
+        if self.layout[0] == 'raw':
+            pixels = surface.get_buffer()
+            memoryview(buffer)[:] = pixels
+            del pixels   # 释放表面的锁
+        else:
+            buffer[:] = pygame.image.tobytes(surface, 'RGB')
+        self.captured += 1
+        self.pending.put_nowait((self.captured, buffer))
+
+    def _rgb(self, buffer):
+        """把缓冲区中的像素转换为连续的RGB像素"""
+        kind, pitch, channels = self.layout
+        if kind == 'rgb':
+            return buffer
+        pixels = np.frombuffer(buffer, np.uint8).reshape(self.height, pitch // 4, 4)
+        # 逐个通道复制比一次花式索引快得多
+        for i, channel in enumerate(channels):
+            self.rgb[..., i] = pixels[:, :self.width, channel]
+        return self.rgb
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            number, buffer = item
+            try:
+                if self.error is None:
+                    self._write(number, self._rgb(buffer))
+                    self.written += 1
+            except (IOError, OSError, pygame.error) as e:
+                # 磁盘写满或编码器退出时停止录制，游戏继续运行
+                self.error = e
+                print(f"警告: 录制已停止 ({e})")
+            self.free.put(buffer)
+
+    def _write(self, number, rgb):
+        if self.fmt == 'png':
+            image = pygame.image.frombuffer(rgb, (self.width, self.height), 'RGB')
+            pygame.image.save(image, os.path.join(self.path, f"frame_{number:06d}.png"))
+        else:
+            self.output.write(rgb)
+
+    def get_metrics(self):
+        """录制的帧数和丢弃的帧数"""
+        return {
+            'captured': self.captured,
+            'written': self.written,
+            'dropped': self.dropped,
+            'queued': self.pending.qsize(),
+        }
+
+    def close(self):
+        """写完队列中剩余的帧，关闭输出"""
+        self.pending.put(None)
+        self._thread.join()
+        if self.output is not None:
+            try:
+                self.output.close()
+            except (IOError, OSError):
+                pass
+        if self.process is not None:
+            self.process.wait()
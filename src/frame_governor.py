@@ -0,0 +1,123 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+from time import perf_counter, sleep
+
+
+class FrameGovernor:
+    """控制主循环的帧节奏
+
+    每帧都执行游戏逻辑；落后于计划时跳过渲染（最多连续max_frame_skip帧），
+    让游戏速度在性能不足的机器上保持不变。持续高负载时通过under_load
+    通知游戏降低可选的绘制工作（界面半透明遮罩、HUD刷新频率）。
+    """
+
+    # 负载 = 每帧实际耗时 / 每帧预算，超过ENTER_LOAD进入高负载状态，
+    # 低于EXIT_LOAD才退出，避免在临界点来回切换
+    ENTER_LOAD = 0.9
+    EXIT_LOAD = 0.7
+
+    def __init__(self, target_fps=60, max_frame_skip=5, hud_interval=6):
+        self.target_fps = target_fps
+        self.frame_time = 1.0 / target_fps
+        self.max_frame_skip = max_frame_skip
+        self.hud_interval = hud_interval
+
+        self.next_deadline = None
+        self.frame_start = 0.0
+        self.rendering = True
+        self.skipped_in_row = 0
+
+        # 统计数据
+        self.frames = 0
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self.load = 0.0
+        self.under_load = False
+        self.achieved_fps = 0.0
+        self.render_fps = 0.0
+        self._window_start = perf_counter()
+        self._window_frames = 0
+        self._window_rendered = 0
+        # 可选的直方图（metrics_server.Histogram），记录每帧的耗时
+        self.frame_histogram = None
+
+    def begin_frame(self):
+        """在每帧开始时调用"""
+        self.frame_start = perf_counter()
+        if self.next_deadline is None:
+            self.next_deadline = self.frame_start + self.frame_time
+
+    def should_render(self):
+        """游戏逻辑执行完后调用，返回这一帧是否需要渲染"""
+        behind = perf_counter() > self.next_deadline
+        if behind and self.skipped_in_row < self.max_frame_skip:
+            self.skipped_in_row += 1
+            self.frames_skipped += 1
+            self.rendering = False
+        else:
+            self.skipped_in_row = 0
+            self.rendering = True
+        return self.rendering
+
+    def hud_update_allowed(self):
+        """高负载时HUD只每hud_interval帧重新渲染一次"""
+        return not self.under_load or self.frames % self.hud_interval == 0
+
+    def end_frame(self):
+        """在每帧结束时调用，必要时等待到下一帧的时间点"""
+        delay = self.finish_frame()
+        if delay > 0:
+            sleep(delay)
+
+    def finish_frame(self):
+        """更新统计并计算下一帧的时间点，返回需要等待的秒数（不等待）"""
+        now = perf_counter()
+        if self.frame_histogram is not None:
+            self.frame_histogram.observe(now - self.frame_start)
+
+        # 用指数移动平均估计持续负载；单帧的长时间停顿（如飞船被击中时的sleep）
+        # 最多按两帧预算计算
+        cost = min((now - self.frame_start) / self.frame_time, 2.0)
+        self.load += (cost - self.load) * 0.05
+        if self.under_load:
+            self.under_load = self.load > self.EXIT_LOAD
+        else:
+            self.under_load = self.load > self.ENTER_LOAD
+
+        self.frames += 1
+        self._window_frames += 1
+        if self.rendering:
+            self.frames_rendered += 1
+            self._window_rendered += 1
+        self._update_fps(now)
+
+        delay = self.next_deadline - now
+        if now - self.next_deadline > self.frame_time * (self.max_frame_skip + 1):
+            # 落后太多已无法追上，从现在重新计时
+            self.next_deadline = now
+        self.next_deadline += self.frame_time
+        return max(0.0, delay)
+
+    def _update_fps(self, now):
+        """每秒更新一次实际帧率"""
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.achieved_fps = self._window_frames / elapsed
+            self.render_fps = self._window_rendered / elapsed
+            self._window_start = now
+            self._window_frames = 0
+            self._window_rendered = 0
+
+    def get_metrics(self):
+        """返回帧率统计信息"""
+        return {
+            'target_fps': self.target_fps,
+            'achieved_fps': round(self.achieved_fps, 1),
+            'render_fps': round(self.render_fps, 1),
+            'frames': self.frames,
+            'frames_rendered': self.frames_rendered,
+            'frames_skipped': self.frames_skipped,
+            'load': round(self.load, 2),
+            'under_load': self.under_load
+        }
@@ -6,6 +6,7 @@ class GameStats:
 
     def __init__(self, ai_game):
         """Initialize statistics."""
+        self._ai_game = ai_game
         self.settings = ai_game.settings
         self.reset_stats()
 
@@ -0,0 +1,139 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+from collections import deque, namedtuple
+from time import perf_counter
+
+import pygame
+
+from metrics_server import INPUT_BUCKETS, Histogram
+
+# 游戏处理的事件类型；其余类型（大量的MOUSEMOTION等）在SDL中直接丢弃，不进入事件队列
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+                  pygame.WINDOWFOCUSLOST)
+
+# 游戏操作
+LEFT = 'left'
+RIGHT = 'right'
+FIRE = 'fire'
+
+# 按键 -> 操作；方向键和WASD都可以移动
+DEFAULT_KEY_MAP = {
+    pygame.K_LEFT: LEFT,
+    pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT,
+    pygame.K_d: RIGHT,
+    pygame.K_SPACE: FIRE,
+}
+
+
+class InputSnapshot(namedtuple('InputSnapshot', 'tick held pressed')):
+    """一帧游戏逻辑看到的输入，生成后不再修改
+
+      held: 取快照时仍然按住的操作（frozenset）
+      pressed: 上一个快照之后按下的操作，按发生顺序，可以重复
+    """
+
+    __slots__ = ()
+
+    def is_down(self, action):
+        """这一帧中操作是否按下过；在两帧之间按下又松开的短按也算"""
+        return action in self.held or action in self.pressed
+
+    def presses(self, action):
+        return self.pressed.count(action)
+
+
+class InputSystem:
+    """把SDL事件转换为每帧一个的输入快照
+
+    按键通过key_map映射为操作。按住的操作只由KEYDOWN/KEYUP维护（窗口失去焦点时
+    全部松开），游戏逻辑每帧取一次snapshot()，不再另外读取pygame.key.get_pressed()，
+    两个来源不一致导致的左右键失控因此不会再出现。
+
+    同时测量输入延迟：从KEYDOWN发生到处理它的那一帧之后第一次翻转画面（present）。
+    """
+
+    def __init__(self, key_map=None):
+        self.key_map = dict(DEFAULT_KEY_MAP if key_map is None else key_map)
+        self.held_keys = {}   # 按住的键 -> 操作
+        self.pressed = []
+        self.pending = []     # 还没有进入快照的按键的发生时间
+        # (帧号, 发生时间)：已被游戏逻辑处理、还没有显示。模拟线程追加，渲染线程取出
+        self.applied = deque()
+        self.tick = 0
+        # 可以替换为指标服务器中登记的直方图（见AlienInvasion._create_metrics_server）
+        self.latency = Histogram(INPUT_BUCKETS)
+        self.max_latency = 0.0
+
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+
+    def poll(self):
+        """取出队列中的所有事件并更新按键状态；返回事件列表，其他按键和鼠标由游戏处理"""
+        events = pygame.event.get()
+        now = perf_counter()
+        ticks = None
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                action = self.key_map.get(event.key)
+                if action is None:
+                    continue
+                self.pressed.append(action)
+                if event.key in self.held_keys:
+                    # 按住时的自动重复不是新的按键，不计入输入延迟
+                    continue
+                self.held_keys[event.key] = action
+                # 事件带有SDL时间戳（毫秒）时从它算起，包括在队列中等待的时间
+                timestamp = getattr(event, 'timestamp', None)
+                if timestamp is None:
+                    self.pending.append(now)
+                else:
+                    if ticks is None:
+                        ticks = pygame.time.get_ticks()
+                    self.pending.append(now - max(0, ticks - timestamp) / 1000)
+            elif event.type == pygame.KEYUP:
+                self.held_keys.pop(event.key, None)
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                # 失去焦点后收不到松开按键的事件
+                self.release_all()
+        return events
+
+    def release_all(self):
+        self.held_keys.clear()
+
+    def snapshot(self):
+        """每帧游戏逻辑开始时调用一次"""
+        self.tick += 1
+        snapshot = InputSnapshot(self.tick, frozenset(self.held_keys.values()),
+                                 tuple(self.pressed))
+        self.pressed.clear()
+        for pressed_at in self.pending:
+            self.applied.append((self.tick, pressed_at))
+        self.pending.clear()
+        return snapshot
+
+    def presented(self, tick=None):
+        """画面翻转之后调用；tick是画面对应的帧号（默认为最新的一帧）"""
+        applied = self.applied
+        if not applied:
+            return
+        now = perf_counter()
+        if tick is None:
+            tick = self.tick
+        while applied and applied[0][0] <= tick:
+            latency = now - applied.popleft()[1]
+            self.latency.observe(latency)
+            self.max_latency = max(self.max_latency, latency)
+
+    def get_metrics(self):
+        """输入延迟的统计（毫秒）"""
+        latency = self.latency
+        if not latency.count:
+            return {'presses': 0}
+        return {
+            'presses': latency.count,
+            'mean_ms': round(latency.sum / latency.count * 1000, 2),
+            'p95_ms': round(min(latency.quantile(0.95), self.max_latency) * 1000, 2),
+            'max_ms': round(self.max_latency * 1000, 2),
+        }
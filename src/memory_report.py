@@ -0,0 +1,122 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+"""内存占用报告
+
+用tracemalloc统计每种精灵实体的Python堆内存，并估算其引用的图像像素内存；
+World中的实体（子弹等）按组件数组中每个实体占用的字节数统计；
+再运行一个基准测试场景，报告峰值内存和主要的分配位置。
+用法: python memory_report.py [--count N] [--scenario full_fleet] [--frames N] [--check]
+加上--check时，任何实体超出BUDGETS中的预算都会以非零状态退出
+（tests/test_memory.py对预算做同样的检查）。
+"""
+
+import argparse
+import sys
+import tracemalloc
+
+import pygame
+
+from benchmark import SCENARIOS, _start_game, _step
+from alien_invasion import AlienInvasion
+from alien import Alien
+from ship import Ship
+
+# 每个实体的内存预算（字节）：Python堆内存 + 分摊的图像像素内存
+BUDGETS = {
+    'alien': 640,
+    'bullet': 64,
+    'ship': 1024,
+}
+
+
+def _surface_bytes(sprites):
+    """统计精灵引用的图像像素内存，共享的图集只计算一次"""
+    parents = {}
+    for sprite in sprites:
+        image = getattr(sprite, 'image', None)
+        if image is not None:
+            parent = image.get_abs_parent()
+            parents[id(parent)] = parent.get_pitch() * parent.get_height()
+    return sum(parents.values())
+
+
+def measure_entity(ai_game, factory, count):
+    """创建count个实体并加入精灵组，返回每个实体的平均内存（字节）"""
+    group = pygame.sprite.Group()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sprites = [factory(ai_game) for _ in range(count)]
+    group.add(*sprites)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    python_bytes = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return {
+        'python': python_bytes / count,
+        'surface': _surface_bytes(sprites) / count,
+    }
+
+
+def measure_entities(ai_game, count):
+    """测量每种实体的平均内存，返回 名称 -> {'python': 字节, 'surface': 字节}"""
+    entities = {'alien': Alien, 'ship': Ship}
+    results = {name: measure_entity(ai_game, factory, count)
+               for name, factory in entities.items()}
+    # 子弹只占组件数组中的一行
+    results['bullet'] = {'python': ai_game.world.bytes_per_entity(), 'surface': 0}
+    return results
+
+
+def measure_scenario(scenario, frames, top=10):
+    """运行一个场景，返回峰值内存和主要的分配位置"""
+    tracemalloc.start()
+    ai_game = AlienInvasion()
+    ai_game._ship_hit = lambda: None
+    _start_game(ai_game)
+    drive = SCENARIOS[scenario]
+    for frame in range(frames):
+        drive(ai_game, frame)
+        _step(ai_game)
+        ai_game._update_screen()
+    current, peak = tracemalloc.get_traced_memory()
+    sites = tracemalloc.take_snapshot().statistics('lineno')[:top]
+    tracemalloc.stop()
+    return current, peak, sites
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alien Invasion 内存占用报告")
+    parser.add_argument('--count', type=int, default=1000, help="每种实体创建的数量")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='full_fleet')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--check', action='store_true', help="超出内存预算时返回非零状态")
+    args = parser.parse_args()
+
+    ai_game = AlienInvasion()
+    results = measure_entities(ai_game, args.count)
+
+    over_budget = []
+    print(f"{'entity':<10}{'python B':>10}{'surface B':>12}{'total B':>10}{'budget B':>10}")
+    for name, result in results.items():
+        total = result['python'] + result['surface']
+        print(f"{name:<10}{result['python']:>10.0f}{result['surface']:>12.0f}"
+              f"{total:>10.0f}{BUDGETS[name]:>10}")
+        if total > BUDGETS[name]:
+            over_budget.append(name)
+
+    current, peak, sites = measure_scenario(args.scenario, args.frames)
+    print(f"\n场景 {args.scenario} ({args.frames} 帧): 当前 {current / 1024:.1f} KiB, "
+          f"峰值 {peak / 1024:.1f} KiB")
+    print("主要分配位置:")
+    for stat in sites:
+        print(f"  {stat}")
+    pygame.quit()
+
+    if args.check and over_budget:
+        print(f"\n超出内存预算: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 帧耗时的直方图分桶（秒）：60、30、20、10帧每秒的预算附近更细
+FRAME_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.0125, 0.0167, 0.025, 0.0333, 0.05, 0.1, 0.25)
+# 写文件耗时的分桶（秒）
+WRITE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+# 输入延迟的分桶（秒）：60帧每秒时大约是一到几帧
+INPUT_BUCKETS = (0.004, 0.008, 0.0125, 0.0167, 0.025, 0.0333, 0.05, 0.075, 0.1, 0.15, 0.25)
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+class Counter:
+    """只增加的计数器
+
+    每个指标只由一个线程写入（大多是游戏线程；写文件的耗时由执行写入的后台线程记录），
+    指标服务器线程只读取，所以不加锁。
+    """
+
+    kind = 'counter'
+
+    def __init__(self, labels=()):
+        self.labels = labels
+        self.value = 0
+
+    def samples(self, name):
+        yield f"{name}{_labels(self.labels)} {self.value}"
+
+
+class Gauge(Counter):
+    """可以任意设置的数值"""
+
+    kind = 'gauge'
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    """固定分桶的直方图；observe只是几次整数加法，不加锁
+
+    读取时各个分桶可能相差一次观测，对监控来说可以接受。
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, buckets, labels=()):
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """分位数的上界估计：累计次数达到q的第一个分桶的上限"""
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+    def samples(self, name):
+        cumulative = 0
+        labels = list(self.labels)
+        for bound, count in zip(self.buckets + ('+Inf',), list(self.counts)):
+            cumulative += count
+            yield f"{name}_bucket{_labels(labels + [('le', bound)])} {cumulative}"
+        yield f"{name}_sum{_labels(labels)} {self.sum}"
+        yield f"{name}_count{_labels(labels)} {self.count}"
+
+
+class MetricsRegistry:
+    """按名称登记指标，并生成Prometheus文本格式"""
+
+    def __init__(self, prefix='alien_invasion'):
+        self.prefix = prefix
+        self.families = {}   # 名称 -> (说明, [指标, ...])
+
+    def _add(self, metric, name, documentation):
+        name = f"{self.prefix}_{name}"
+        self.families.setdefault(name, (documentation, []))[1].append(metric)
+        return metric
+
+    def counter(self, name, documentation, **labels):
+        return self._add(Counter(tuple(labels.items())), name, documentation)
+
+    def gauge(self, name, documentation, **labels):
+        return self._add(Gauge(tuple(labels.items())), name, documentation)
+
+    def histogram(self, name, documentation, buckets, **labels):
+        return self._add(Histogram(buckets, tuple(labels.items())), name, documentation)
+
+    def render(self):
+        lines = []
+        for name, (documentation, metrics) in list(self.families.items()):
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metrics[0].kind}")
+            for metric in metrics:
+                lines.extend(metric.samples(name))
+        return '\n'.join(lines) + '\n'
+
+
+class GameMetrics:
+    """游戏导出的指标；由游戏每帧或在事件发生时更新（见AlienInvasion._update_metrics）"""
+
+    def __init__(self):
+        self.registry = registry = MetricsRegistry()
+        self.frame_seconds = registry.histogram(
+            'frame_seconds', "每帧游戏逻辑和渲染的耗时", FRAME_BUCKETS)
+        self.fps = registry.gauge('fps', "最近一秒的实际帧率")
+        self.frames = registry.counter('frames_total', "已运行的帧数")
+        self.entities = {kind: registry.gauge('entities', "屏幕上的实体数量", kind=kind)
+                         for kind in ('bullet', 'enemy_projectile', 'alien', 'particle')}
+        self.collision_checks = registry.counter(
+            'collision_checks_total',
+            "碰撞检测中矩形和遮罩比较的次数（子弹与外星人、敌方子弹与飞船、外星人与飞船）")
+        self.collision_checks_frame = registry.gauge(
+            'collision_checks_last_frame', "上一帧的碰撞检测次数")
+        self.write_seconds = registry.histogram(
+            'persistence_write_seconds', "写入游戏数据文件的耗时", WRITE_BUCKETS)
+        self.input_latency = registry.histogram(
+            'input_latency_seconds', "从按键到第一次显示其效果的画面的延迟", INPUT_BUCKETS)
+        self.audio_voices = registry.gauge('audio_voices', "正在播放的混音器声道数")
+        self.level = registry.gauge('level', "当前等级")
+        self.score = registry.gauge('score', "当前分数")
+        self.game_active = registry.gauge('game_active', "是否正在游戏中")
+
+
+class MetricsServer:
+    """在本机地址上提供 /metrics，HTTP请求在后台线程中处理"""
+
+    def __init__(self, registry, port=9108, host='127.0.0.1'):
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split('?')[0] != '/metrics':
+                    handler.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                handler.send_response(200)
+                handler.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                # 不在控制台打印每次请求
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.address = self.httpd.server_address
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics server",
+                                        daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
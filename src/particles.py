@@ -0,0 +1,162 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import numpy as np
+import pygame
+
+from ecs import draw_commands
+
+# 粒子颜色表：每种颜色预先绘制FADE_LEVELS张不同透明度的精灵
+PALETTE = (
+    (255, 220, 120),   # 爆炸火花
+    (255, 140, 40),    # 爆炸火焰
+    (110, 110, 120),   # 碎片
+    (255, 70, 50),     # 飞船被击中
+    (120, 200, 255),   # 引擎尾焰
+)
+SPARK, FLAME, DEBRIS, SHIP_FIRE, TRAIL = range(len(PALETTE))
+FADE_LEVELS = 4
+PARTICLE_SIZE = 3
+
+
+class ParticleSystem:
+    """爆炸、碎片和引擎尾焰的粒子
+
+    粒子的位置、速度、剩余寿命和颜色存放在预先分配的numpy数组中，
+    用一个环形游标写入新粒子：容量用完时直接覆盖最早生成的粒子，
+    所以粒子数量永远不会超过max_particles。每帧新生成的粒子数也有上限
+    spawn_budget，一次消灭很多外星人时不会造成帧时间尖峰。
+    """
+
+    def __init__(self, enabled=True, max_particles=2048, spawn_budget=256,
+                 gravity=0.05, drag=0.97):
+        self.enabled = enabled
+        # 未启用时不预先分配
+        self.capacity = max_particles if enabled else 0
+        self.spawn_budget = spawn_budget
+        self.gravity = gravity
+        self.drag = drag
+
+        capacity = self.capacity
+        self.position = np.zeros((capacity, 2), np.float32)   # 精灵左上角
+        self.velocity = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)            # 剩余帧数，<=0表示空闲
+        self.max_life = np.ones(capacity, np.float32)
+        self.color = np.zeros(capacity, np.int16)
+        self.falls = np.zeros(capacity, bool)                 # 是否受重力影响
+
+        self.cursor = 0
+        self.spawned_this_frame = 0
+        self.evicted = 0
+        self.dropped = 0
+
+        self.sprites = self._make_sprites() if enabled else []
+
+    @staticmethod
+    def _make_sprites():
+        """预先绘制所有颜色、所有透明度的粒子精灵"""
+        convert = pygame.display.get_surface() is not None
+        sprites = []
+        for color in PALETTE:
+            for level in range(FADE_LEVELS):
+                alpha = 255 * (level + 1) // FADE_LEVELS
+                image = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE), pygame.SRCALPHA)
+                image.fill((*color, alpha))
+                sprites.append(image.convert_alpha() if convert else image)
+        return sprites
+
+    def emit(self, x, y, count, color, speed=3.0, life=30, falls=False,
+             direction=None, spread=2 * np.pi):
+        """在(x, y)生成count个粒子
+
+        direction为None时向四周散开，否则沿direction（弧度）在spread范围内散开。
+        超出本帧预算的部分被丢弃；环形缓冲区满时覆盖最早的粒子。
+        """
+        if not self.enabled:
+            return
+        requested = count
+        count = min(count, self.spawn_budget - self.spawned_this_frame, self.capacity)
+        self.dropped += requested - max(count, 0)
+        if count <= 0:
+            return
+        self.spawned_this_frame += count
+
+        slots = (self.cursor + np.arange(count)) % self.capacity
+        self.cursor = (self.cursor + count) % self.capacity
+        self.evicted += int(np.count_nonzero(self.life[slots] > 0))
+
+        if direction is None:
+            angles = np.random.uniform(0, 2 * np.pi, count)
+        else:
+            angles = direction + np.random.uniform(-spread / 2, spread / 2, count)
+        speeds = np.random.uniform(0.3, 1.0, count) * speed
+        lives = np.random.uniform(0.6, 1.0, count) * life
+
+        self.position[slots] = (x - PARTICLE_SIZE / 2, y - PARTICLE_SIZE / 2)
+        self.velocity[slots, 0] = np.cos(angles) * speeds
+        self.velocity[slots, 1] = np.sin(angles) * speeds
+        self.life[slots] = lives
+        self.max_life[slots] = lives
+        self.color[slots] = color
+        self.falls[slots] = falls
+
+    def explosion(self, x, y, count=24):
+        """外星人爆炸：火花、火焰和下落的碎片"""
+        self.emit(x, y, count // 2, SPARK, speed=4.0, life=20)
+        self.emit(x, y, count // 3, FLAME, speed=2.0, life=30)
+        self.emit(x, y, count - count // 2 - count // 3, DEBRIS, speed=2.5, life=45, falls=True)
+
+    def ship_hit(self, x, y, count=60):
+        """飞船被击中"""
+        self.emit(x, y, count // 2, SHIP_FIRE, speed=5.0, life=40)
+        self.emit(x, y, count - count // 2, DEBRIS, speed=3.0, life=60, falls=True)
+
+    def engine_trail(self, x, y):
+        """飞船下方的尾焰"""
+        self.emit(x, y, 2, TRAIL, speed=1.5, life=12, direction=np.pi / 2, spread=0.6)
+
+    def clear(self):
+        """删除所有粒子"""
+        self.life[:] = 0
+
+    def update(self, world=None):
+        """积分所有粒子并回收寿命结束的粒子（可以注册为World的系统）"""
+        self.spawned_this_frame = 0
+        active = self.life > 0
+        if not active.any():
+            return
+        self.velocity *= self.drag
+        self.velocity[active & self.falls, 1] += self.gravity
+        self.position += self.velocity
+        self.life -= 1
+
+    def render_commands(self):
+        """按精灵分组的绘制命令，格式和ecs.render_commands相同"""
+        active = np.flatnonzero(self.life > 0)
+        if len(active) == 0:
+            return []
+        # 剩余寿命越少越透明
+        fade = np.ceil(self.life[active] / self.max_life[active] * FADE_LEVELS).astype(np.int16) - 1
+        keys = self.color[active] * FADE_LEVELS + np.clip(fade, 0, FADE_LEVELS - 1)
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        positions = self.position[active[order]].tolist()
+        unique_keys, starts = np.unique(keys, return_index=True)
+        ends = list(starts[1:]) + [len(keys)]
+        return [(self.sprites[key], None, positions[start:end])
+                for key, start, end in zip(unique_keys, starts, ends)]
+
+    def draw_system(self, renderer):
+        """创建绘制粒子的World渲染系统：同一精灵的粒子一次批量绘制"""
+        def draw(world=None):
+            draw_commands(renderer, self.render_commands())
+        return draw
+
+    def get_metrics(self):
+        """粒子数量以及被覆盖、被丢弃的次数"""
+        return {
+            'active': int(np.count_nonzero(self.life > 0)),
+            'capacity': self.capacity,
+            'evicted': self.evicted,
+            'dropped': self.dropped,
+        }
@@ -0,0 +1,294 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import os
+import weakref
+
+import pygame
+
+RENDERERS = ('surface', 'texture', 'texture_software')
+SCALE_FILTERS = ('smooth', 'nearest')
+
+
+def _scaled_size(size, render_scale):
+    """内部渲染分辨率"""
+    return (max(1, int(size[0] * render_scale)), max(1, int(size[1] * render_scale)))
+
+
+class SurfaceRenderer:
+    """软件渲染后端：直接在display表面上blit（原来的绘制方式）"""
+
+    name = 'surface'
+
+    def __init__(self, size, caption):
+        self.screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+
+    def clear(self, color):
+        """用背景色清空画面"""
+        self.screen.fill(color)
+
+    def blit(self, image, rect):
+        """绘制一张图像"""
+        self.screen.blit(image, rect)
+
+    def fill(self, color, rect):
+        """填充一个纯色矩形"""
+        self.screen.fill(color, rect)
+
+    def blits(self, image, positions):
+        """把同一张图像绘制到多个位置"""
+        self.screen.blits([(image, position) for position in positions], doreturn=False)
+
+    def fill_rects(self, color, rects):
+        """用同一种颜色填充多个矩形"""
+        fill = self.screen.fill
+        for rect in rects:
+            fill(color, rect)
+
+    def draw_sprites(self, group):
+        """绘制精灵组中的所有精灵"""
+        group.draw(self.screen)
+
+    def begin_overlay(self):
+        """返回用于绘制界面（设置、统计）的表面"""
+        return self.screen
+
+    def present(self):
+        """把这一帧显示到屏幕上"""
+        pygame.display.flip()
+
+
+class ScaledSurfaceRenderer(SurfaceRenderer):
+    """以较低的内部分辨率渲染，每帧整体放大到窗口一次
+
+    游戏逻辑仍然使用config.json中的逻辑坐标，绘制时坐标乘以render_scale，
+    精灵图像按render_scale缩放后缓存，不会每帧重新缩放。
+    """
+
+    def __init__(self, size, caption, render_scale, scale_filter='smooth'):
+        super().__init__(size, caption)
+        self.window = self.screen
+        self.render_scale = render_scale
+        self.scale_filter = scale_filter
+        if scale_filter == 'nearest':
+            self._scale = pygame.transform.scale
+        else:
+            self._scale = pygame.transform.smoothscale
+
+        # 内部渲染表面
+        self.target = pygame.Surface(_scaled_size(size, render_scale)).convert()
+
+        # 界面按逻辑分辨率绘制到透明表面上，放大之后再叠加，保证文字清晰
+        self.screen = pygame.Surface(size, pygame.SRCALPHA)
+        self._overlay_used = False
+
+        # 原图 -> 缩放后图像 的缓存；原图被回收时缓存随之释放
+        self._scaled_images = weakref.WeakKeyDictionary()
+
+    def _scaled_image(self, image):
+        """返回按render_scale缩放后的图像（只缩放一次）"""
+        scaled = self._scaled_images.get(image)
+        if scaled is None:
+            size = _scaled_size(image.get_size(), self.render_scale)
+            # smoothscale会丢失colorkey，带colorkey的图像用普通缩放
+            if image.get_bitsize() in (24, 32) and image.get_colorkey() is None:
+                scaled = pygame.transform.smoothscale(image, size)
+            else:
+                scaled = pygame.transform.scale(image, size)
+            self._scaled_images[image] = scaled
+        return scaled
+
+    def _scaled_rect(self, rect):
+        """把逻辑坐标下的矩形换算到内部渲染分辨率"""
+        scale = self.render_scale
+        return pygame.Rect(int(rect[0] * scale), int(rect[1] * scale),
+                           max(1, round(rect[2] * scale)), max(1, round(rect[3] * scale)))
+
+    def clear(self, color):
+        """用背景色清空画面"""
+        self.target.fill(color)
+
+    def blit(self, image, rect):
+        """绘制一张图像"""
+        scale = self.render_scale
+        self.target.blit(self._scaled_image(image),
+                         (int(rect[0] * scale), int(rect[1] * scale)))
+
+    def fill(self, color, rect):
+        """填充一个纯色矩形"""
+        self.target.fill(color, self._scaled_rect(rect))
+
+    def blits(self, image, positions):
+        """把同一张图像绘制到多个位置"""
+        scale = self.render_scale
+        scaled = self._scaled_image(image)
+        self.target.blits([(scaled, (int(x * scale), int(y * scale))) for x, y in positions],
+                          doreturn=False)
+
+    def fill_rects(self, color, rects):
+        """用同一种颜色填充多个矩形"""
+        for rect in rects:
+            self.target.fill(color, self._scaled_rect(rect))
+
+    def draw_sprites(self, group):
+        """绘制精灵组中的所有精灵"""
+        scale = self.render_scale
+        self.target.blits([(self._scaled_image(sprite.image),
+                            (int(sprite.rect.x * scale), int(sprite.rect.y * scale)))
+                           for sprite in group.sprites()], doreturn=False)
+
+    def begin_overlay(self):
+        """返回用于绘制界面的透明表面，在present时叠加到窗口上"""
+        if not self._overlay_used:
+            self.screen.fill((0, 0, 0, 0))
+            self._overlay_used = True
+        return self.screen
+
+    def present(self):
+        """把内部渲染表面放大到窗口，然后显示"""
+        self._scale(self.target, self.window.get_size(), self.window)
+        if self._overlay_used:
+            self.window.blit(self.screen, (0, 0))
+            self._overlay_used = False
+        pygame.display.flip()
+
+
+class TextureRenderer:
+    """SDL2纹理渲染后端：图像上传为纹理后由SDL Renderer批量复制"""
+
+    name = 'texture'
+
+    def __init__(self, size, caption, accelerated=True, render_scale=1.0,
+                 scale_filter='smooth'):
+        from pygame._sdl2 import video
+
+        # 让SDL合并连续的纹理复制命令，必须在创建Renderer之前设置
+        os.environ.setdefault('SDL_RENDER_BATCHING', '1')
+        # 纹理缩放时使用的过滤方式，SDL在创建纹理时读取
+        os.environ['SDL_RENDER_SCALE_QUALITY'] = '0' if scale_filter == 'nearest' else '1'
+
+        self._video = video
+        self.window = video.Window(caption, size)
+        # accelerated=0 使用SDL的软件渲染器，无显卡的Linux上也能运行
+        self.renderer = video.Renderer(self.window, accelerated=1 if accelerated else 0,
+                                       target_texture=(render_scale != 1.0))
+        if not accelerated:
+            self.name = 'texture_software'
+
+        # render_scale不为1时先渲染到较小的目标纹理，坐标由SDL按比例缩放，
+        # 每帧再把目标纹理拉伸到整个窗口
+        self.render_scale = render_scale
+        self._target = None
+        if render_scale != 1.0:
+            self._target = video.Texture(self.renderer, _scaled_size(size, render_scale),
+                                         target=True)
+            self._begin_target()
+
+        # 界面（设置、统计、按钮文字等）仍然用pygame.draw绘制到这个透明表面上，
+        # 需要时整张上传为纹理；它也作为游戏逻辑使用的屏幕尺寸参考
+        self.screen = pygame.Surface(size, pygame.SRCALPHA)
+        self._overlay_texture = None
+        self._overlay_used = False
+
+        # 表面 -> 纹理 的缓存；表面被回收时纹理随之释放
+        self._textures = weakref.WeakKeyDictionary()
+
+    def _begin_target(self):
+        """之后的绘制都进入缩小的目标纹理"""
+        self.renderer.target = self._target
+        self.renderer.scale = (self.render_scale, self.render_scale)
+
+    def _texture_for(self, image):
+        """返回图像对应的纹理和源矩形，图集的子表面共用同一张纹理"""
+        parent = image.get_abs_parent()
+        texture = self._textures.get(parent)
+        if texture is None:
+            texture = self._video.Texture.from_surface(self.renderer, parent)
+            self._textures[parent] = texture
+        if parent is image:
+            return texture, None
+        return texture, pygame.Rect(image.get_abs_offset(), image.get_size())
+
+    def clear(self, color):
+        """用背景色清空画面"""
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def blit(self, image, rect):
+        """绘制一张图像"""
+        texture, area = self._texture_for(image)
+        texture.draw(area, pygame.Rect(rect[0], rect[1], *image.get_size()))
+
+    def fill(self, color, rect):
+        """填充一个纯色矩形"""
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.fill_rect(rect)
+
+    def blits(self, image, positions):
+        """把同一张图像绘制到多个位置，共用一张纹理"""
+        texture, area = self._texture_for(image)
+        width, height = image.get_size()
+        for x, y in positions:
+            texture.draw(area, (x, y, width, height))
+
+    def fill_rects(self, color, rects):
+        """用同一种颜色填充多个矩形"""
+        self.renderer.draw_color = pygame.Color(color)
+        fill_rect = self.renderer.fill_rect
+        for rect in rects:
+            fill_rect(rect)
+
+    def draw_sprites(self, group):
+        """绘制精灵组中的所有精灵"""
+        for sprite in group.sprites():
+            texture, area = self._texture_for(sprite.image)
+            texture.draw(area, sprite.rect)
+
+    def begin_overlay(self):
+        """返回用于绘制界面的透明表面，在present时上传并覆盖在最上层"""
+        if not self._overlay_used:
+            self.screen.fill((0, 0, 0, 0))
+            self._overlay_used = True
+        return self.screen
+
+    def present(self):
+        """把这一帧显示到屏幕上"""
+        if self._target is not None:
+            self.renderer.target = None
+            self.renderer.scale = (1.0, 1.0)
+            self._target.draw()
+        if self._overlay_used:
+            if self._overlay_texture is None:
+                self._overlay_texture = self._video.Texture.from_surface(
+                    self.renderer, self.screen)
+            else:
+                self._overlay_texture.update(self.screen)
+            self._overlay_texture.draw()
+            self._overlay_used = False
+        self.renderer.present()
+        if self._target is not None:
+            self._begin_target()
+
+
+def create_renderer(name, size, caption, render_scale=1.0, scale_filter='smooth'):
+    """按名称创建渲染后端，纹理后端不可用时退回软件渲染"""
+    if render_scale <= 0:
+        print(f"警告: render_scale必须大于0，忽略设置值 {render_scale}")
+        render_scale = 1.0
+    if scale_filter not in SCALE_FILTERS:
+        print(f"警告: 未知的缩放过滤方式 '{scale_filter}'，改用 smooth")
+        scale_filter = 'smooth'
+
+    if name in ('texture', 'texture_software'):
+        try:
+            return TextureRenderer(size, caption, accelerated=(name == 'texture'),
+                                   render_scale=render_scale, scale_filter=scale_filter)
+        except (ImportError, RuntimeError) as e:
+            print(f"警告: 无法创建纹理渲染器，改用软件渲染 ({e})")
+    elif name != 'surface':
+        print(f"警告: 未知的渲染后端 '{name}'，改用软件渲染")
+
+    if render_scale != 1.0:
+        return ScaledSurfaceRenderer(size, caption, render_scale, scale_filter)
+    return SurfaceRenderer(size, caption)
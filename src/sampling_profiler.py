@@ -0,0 +1,149 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import marshal
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from time import perf_counter, sleep
+
+
+def _code_key(code):
+    """pstats使用的函数标识 (文件, 行号, 函数名)"""
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def _label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """采样分析器
+
+    后台线程每隔interval秒读取一次其他线程当前的调用栈（sys._current_frames），
+    不像cProfile那样用sys.setprofile拦截每次函数调用，开销与调用次数无关，
+    可以在正常运行的游戏中随时开启。停止后写出两个文件：
+    .folded为火焰图工具（flamegraph.pl、speedscope）使用的折叠调用栈，
+    .pstats可以用 python -m pstats 或 snakeviz 查看，时间按采样次数估算。
+    """
+
+    def __init__(self, interval=0.005, directory='profiles'):
+        self.interval = interval
+        self.directory = directory
+        self.samples = Counter()   # (线程名, 调用栈) -> 采样次数，调用栈从外到内
+        self.sample_count = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self.samples.clear()
+        self.sample_count = 0
+        self.started = perf_counter()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="sampling profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        next_sample = perf_counter()
+        while self._running:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(names.get(thread_id, str(thread_id)), tuple(stack))] += 1
+            self.sample_count += 1
+
+            # 按固定的时间点采样，不因为采样本身的耗时而变慢
+            next_sample += self.interval
+            delay = next_sample - perf_counter()
+            if delay > 0:
+                sleep(delay)
+            else:
+                next_sample = perf_counter()
+
+    def stop(self):
+        """停止采样，写出结果文件，返回(.folded路径, .pstats路径)"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = perf_counter() - self.started
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory,
+                            f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        folded_path, pstats_path = base + '.folded', base + '.pstats'
+        self.write_folded(folded_path)
+        self.write_pstats(pstats_path)
+        return folded_path, pstats_path
+
+    def write_folded(self, path):
+        """折叠调用栈：每行 '线程;外层函数;...;内层函数 采样次数'"""
+        lines = Counter()
+        for (thread_name, stack), count in self.samples.items():
+            lines[';'.join([thread_name] + [_label(code) for code in stack])] += count
+        with open(path, 'w', encoding='utf-8') as f:
+            for line, count in sorted(lines.items()):
+                f.write(f"{line} {count}\n")
+
+    def create_stats(self):
+        """按cProfile的格式生成统计数据，供pstats.Stats读取
+
+        每个采样代表interval秒：栈顶的函数计入自身时间，栈中的每个函数计入累计时间
+        （递归时只计一次），相邻的两层计入调用关系。
+        """
+        interval = self.interval
+        stats = {}
+
+        def entry(key):
+            if key not in stats:
+                stats[key] = [0, 0, 0.0, 0.0, {}]
+            return stats[key]
+
+        for (_thread_name, stack), count in self.samples.items():
+            keys = [_code_key(code) for code in stack]
+            seen = set()
+            for depth, key in enumerate(keys):
+                row = entry(key)
+                if key not in seen:
+                    seen.add(key)
+                    row[0] += count
+                    row[1] += count
+                    row[3] += count * interval
+                if depth > 0:
+                    callers = row[4]
+                    nc, cc, tt, ct = callers.get(keys[depth - 1], (0, 0, 0.0, 0.0))
+                    callers[keys[depth - 1]] = (nc + count, cc + count, tt, ct + count * interval)
+            leaf = entry(keys[-1]) if keys else None
+            if leaf is not None:
+                leaf[2] += count * interval
+                callers = leaf[4]
+                if len(keys) > 1:
+                    nc, cc, tt, ct = callers[keys[-2]]
+                    callers[keys[-2]] = (nc, cc, tt + count * interval, ct)
+
+        self.stats = {key: (cc, nc, tt, ct, callers)
+                      for key, (cc, nc, tt, ct, callers) in stats.items()}
+
+    def write_pstats(self, path):
+        """写出pstats.Stats.dump_stats格式的文件"""
+        self.create_stats()
+        with open(path, 'wb') as f:
+            marshal.dump(self.stats, f)
+
+    def get_metrics(self):
+        return {
+            'running': self._running,
+            'samples': self.sample_count,
+            'stacks': len(self.samples),
+            'interval_ms': self.interval * 1000,
+        }
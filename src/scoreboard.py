@@ -2,9 +2,10 @@
 # Licensed under the MIT License
 
 import pygame.font
-from pygame.sprite import Group
+from pygame.sprite import Group, Sprite
 
-from ship import Ship
+import asset_pack
+import sprite_atlas
 
 
 class Scoreboard:
@@ -14,6 +15,7 @@ class Scoreboard:
         """Initialize scorekeeping attributes."""
         self.ai_game = ai_game
         self.screen = ai_game.screen
+        self.renderer = ai_game.renderer
         self.screen_rect = self.screen.get_rect()
         self.settings = ai_game.settings
         self.stats = ai_game.stats
@@ -25,10 +27,10 @@ class Scoreboard:
         self.text_color = (255, 255, 255) if brightness < 128 else (30, 30, 30)
         
         # 使用Consolas字体
-        try:
-            self.font = pygame.font.SysFont("Consolas", 48)
-        except:
-            self.font = pygame.font.SysFont(None, 48)
+        self.font = asset_pack.load_font("Consolas", 48)
+
+        # 分数变化后先标记，由update_hud在绘制前统一重新渲染
+        self.score_dirty = False
 
         # Prepare the initial score images.
         self.prep_score()
@@ -40,8 +42,8 @@ class Scoreboard:
         """Turn the score into a rendered image."""
         rounded_score = round(self.stats.score, -1)
         score_str = f"{rounded_score:,}"
-        self.score_image = self.font.render(score_str, True,
-                self.text_color, self.settings.bg_color)
+        # 文字背景透明，直接叠加在星空背景上
+        self.score_image = self.font.render(score_str, True, self.text_color)
 
         # Display the score at the top right of the screen.
         self.score_rect = self.score_image.get_rect()
@@ -52,8 +54,7 @@ class Scoreboard:
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1)
         high_score_str = f"{high_score:,}"
-        self.high_score_image = self.font.render(high_score_str, True,
-                self.text_color, self.settings.bg_color)
+        self.high_score_image = self.font.render(high_score_str, True, self.text_color)
         
         # Center the high score at the top of the screen.
         self.high_score_rect = self.high_score_image.get_rect()
@@ -63,8 +64,7 @@ class Scoreboard:
     def prep_level(self):
         """Turn the level into a rendered image."""
         level_str = str(self.stats.level)
-        self.level_image = self.font.render(level_str, True,
-                self.text_color, self.settings.bg_color)
+        self.level_image = self.font.render(level_str, True, self.text_color)
 
         # Position the level below the score.
         self.level_rect = self.level_image.get_rect()
@@ -74,12 +74,26 @@ class Scoreboard:
     def prep_ships(self):
         """Show how many ships are left."""
         self.ships = Group()
+        ship_image = sprite_atlas.get_image('ship')
         for ship_number in range(self.stats.ships_left):
-            ship = Ship(self.ai_game)
+            ship = Sprite()
+            ship.image = ship_image
+            ship.rect = ship_image.get_rect()
             ship.rect.x = 10 + ship_number * ship.rect.width
             ship.rect.y = 10
             self.ships.add(ship)
 
+    def request_score_update(self):
+        """标记分数需要重新渲染"""
+        self.score_dirty = True
+
+    def update_hud(self, allowed=True):
+        """重新渲染已变化的分数；高负载时由调用者降低刷新频率"""
+        if self.score_dirty and allowed:
+            self.prep_score()
+            self.check_high_score()
+            self.score_dirty = False
+
     def check_high_score(self):
         """Check to see if there's a new high score."""
         if self.stats.score > self.stats.high_score:
@@ -88,7 +102,7 @@ class Scoreboard:
 
     def show_score(self):
         """Draw scores, level, and ships to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.ships.draw(self.screen)
\ No newline at end of file
+        self.renderer.blit(self.score_image, self.score_rect)
+        self.renderer.blit(self.high_score_image, self.high_score_rect)
+        self.renderer.blit(self.level_image, self.level_rect)
+        self.renderer.draw_sprites(self.ships)
\ No newline at end of file
@@ -40,6 +40,118 @@ class Settings:
                 "enabled": True,
                 "music_volume": 0.3,
                 "effects_volume": 0.6
+            },
+            "graphics": {
+                # surface: 软件blit; texture: SDL2纹理渲染; texture_software: SDL软件渲染器
+                "renderer": "surface",
+                # 内部渲染分辨率 = 屏幕尺寸 * render_scale，每帧放大到窗口一次
+                "render_scale": 1.0,
+                # 放大时使用的过滤方式: smooth 或 nearest
+                "scale_filter": "smooth",
+                # 用视差滚动的星空代替纯色背景
+                "starfield": True
+            },
+            "performance": {
+                "target_fps": 60,
+                # 落后于计划时最多连续跳过渲染的帧数
+                "max_frame_skip": 5,
+                # 启动时只初始化显示和事件，混音器、隐藏界面的字体和游戏数据延迟到第一次使用
+                "lazy_init": False,
+                # 在单独的线程中以固定频率运行游戏逻辑，主线程绘制最新的渲染快照
+                "threaded_simulation": False,
+                # 使用asyncio主循环；background_budget_ms为每帧留给后台任务的时间（毫秒）
+                "async_loop": False,
+                "background_budget_ms": 4
+            },
+            "telemetry": {
+                # 每局结束时把事件记录写入directory下的.npz文件
+                "enabled": False,
+                "directory": "telemetry"
+            },
+            "enemy_fire": {
+                # 默认关闭，保持原来的玩法
+                "enabled": False,
+                # normal 或 bullet_hell，对应modes中的一项
+                "mode": "normal",
+                "projectile_size": 6,
+                "projectile_color": [200, 40, 40],
+                # 同时存在的敌方子弹上限
+                "max_projectiles": 8000,
+                "modes": {
+                    # 每fire_interval帧随机选出shooters个外星人射击
+                    "normal": {"fire_interval": 120, "shooters": 1},
+                    "bullet_hell": {"fire_interval": 2, "shooters": 12}
+                },
+                # 齐射时依次使用的射击模式: aimed 瞄准飞船, spread 向下扇形, spiral 旋转
+                "patterns": [
+                    {"type": "aimed", "count": 1, "speed": 4.0},
+                    {"type": "spread", "count": 5, "angle": 60, "speed": 3.0},
+                    {"type": "spiral", "count": 12, "angle": 360, "speed": 2.5, "rotation": 13}
+                ]
+            },
+            "particles": {
+                "enabled": True,
+                # 同时存在的粒子上限，超出时覆盖最早的粒子
+                "max_particles": 2048,
+                # 每帧最多新生成的粒子数
+                "spawn_budget": 256,
+                "engine_trail": True
+            },
+            "collision": {
+                # rect: 只比较矩形; precise: 矩形重叠后再按图像的透明像素精确比较
+                "mode": "precise"
+            },
+            "dive": {
+                "enabled": True,
+                # 同时俯冲的外星人上限
+                "max_divers": 2,
+                # 每隔多少帧尝试派出一个俯冲者
+                "interval": 180,
+                # 一次俯冲（离开并回到队形）持续的帧数
+                "frames": 240
+            },
+            "sprite_effects": {
+                # 俯冲时按飞行方向旋转外星人
+                "rotate_divers": True,
+                # 每一关的外星人使用不同的颜色
+                "level_tint": True,
+                # 旋转/缩放/着色图像缓存的内存预算（KB）和角度量化步长（度）
+                "cache_budget_kb": 4096,
+                "angle_step": 5,
+                # 每一关开始时预先生成俯冲需要的旋转图像
+                "prewarm": True
+            },
+            "spectator": {
+                # 把每帧的游戏状态发布给观战窗口（spectator_viewer.py）
+                "enabled": False,
+                # host:port 为TCP地址，其他字符串为Unix套接字路径
+                "address": "127.0.0.1:7777",
+                # 每隔多少帧发送一个关键帧，其余为增量
+                "keyframe_interval": 120,
+                # 每个观众每秒最多发送的字节数，超出时跳过帧
+                "max_bytes_per_second": 262144,
+                "max_clients": 4
+            },
+            "capture": {
+                # 录制格式: raw（一个.rgb文件）、png（图片序列）或 pipe（写入command启动的编码器）
+                "format": "raw",
+                # 每隔几帧录制一帧
+                "every": 1,
+                "directory": "captures",
+                # 等待写出的帧数上限，超出时丢弃
+                "queue_size": 8,
+                # pipe格式的编码器命令，可以使用{width} {height} {fps} {output}
+                "command": "ffmpeg -y -loglevel error -f rawvideo -pix_fmt rgb24 -s {width}x{height} -r {fps} -i - {output}.mp4"
+            },
+            "profiler": {
+                # 采样分析器（F6开始/停止）的采样间隔（毫秒）和结果文件的目录
+                "interval_ms": 5,
+                "directory": "profiles"
+            },
+            "metrics": {
+                # 在 http://127.0.0.1:port/metrics 上提供Prometheus格式的运行指标
+                "enabled": False,
+                "port": 9108
             }
         }
         
@@ -123,6 +235,77 @@ class Settings:
         self.music_volume = self.config["sound"]["music_volume"]
         self.effects_volume = self.config["sound"]["effects_volume"]
 
+        # Graphics settings
+        self.renderer = self.config["graphics"]["renderer"]
+        self.render_scale = self.config["graphics"]["render_scale"]
+        self.scale_filter = self.config["graphics"]["scale_filter"]
+        self.starfield = self.config["graphics"]["starfield"]
+
+        # Performance settings
+        self.target_fps = self.config["performance"]["target_fps"]
+        self.max_frame_skip = self.config["performance"]["max_frame_skip"]
+        self.lazy_init = self.config["performance"]["lazy_init"]
+        self.threaded_simulation = self.config["performance"]["threaded_simulation"]
+        self.async_loop = self.config["performance"]["async_loop"]
+        self.background_budget_ms = self.config["performance"]["background_budget_ms"]
+
+        # Telemetry settings
+        self.telemetry_enabled = self.config["telemetry"]["enabled"]
+        self.telemetry_directory = self.config["telemetry"]["directory"]
+
+        # Enemy fire settings
+        self.enemy_fire_enabled = self.config["enemy_fire"]["enabled"]
+        self.enemy_fire_mode = self.config["enemy_fire"]["mode"]
+        self.enemy_projectile_size = self.config["enemy_fire"]["projectile_size"]
+        self.enemy_projectile_color = tuple(self.config["enemy_fire"]["projectile_color"])
+        self.max_enemy_projectiles = self.config["enemy_fire"]["max_projectiles"]
+        self.enemy_fire_modes = self.config["enemy_fire"]["modes"]
+        self.enemy_fire_patterns = self.config["enemy_fire"]["patterns"]
+
+        # Particle settings
+        self.particles_enabled = self.config["particles"]["enabled"]
+        self.max_particles = self.config["particles"]["max_particles"]
+        self.particle_spawn_budget = self.config["particles"]["spawn_budget"]
+        self.engine_trail = self.config["particles"]["engine_trail"]
+
+        # Collision settings
+        self.collision_mode = self.config["collision"]["mode"]
+
+        # Dive attack settings
+        self.dive_enabled = self.config["dive"]["enabled"]
+        self.max_divers = self.config["dive"]["max_divers"]
+        self.dive_interval = self.config["dive"]["interval"]
+        self.dive_frames = self.config["dive"]["frames"]
+
+        # Sprite effect settings
+        self.rotate_divers = self.config["sprite_effects"]["rotate_divers"]
+        self.level_tint = self.config["sprite_effects"]["level_tint"]
+        self.transform_cache_kb = self.config["sprite_effects"]["cache_budget_kb"]
+        self.transform_angle_step = self.config["sprite_effects"]["angle_step"]
+        self.prewarm_transforms = self.config["sprite_effects"]["prewarm"]
+
+        # Spectator settings
+        self.spectator_enabled = self.config["spectator"]["enabled"]
+        self.spectator_address = self.config["spectator"]["address"]
+        self.spectator_keyframe_interval = self.config["spectator"]["keyframe_interval"]
+        self.spectator_max_bytes_per_second = self.config["spectator"]["max_bytes_per_second"]
+        self.spectator_max_clients = self.config["spectator"]["max_clients"]
+
+        # Capture settings
+        self.capture_format = self.config["capture"]["format"]
+        self.capture_every = self.config["capture"]["every"]
+        self.capture_directory = self.config["capture"]["directory"]
+        self.capture_queue_size = self.config["capture"]["queue_size"]
+        self.capture_command = self.config["capture"]["command"]
+
+        # Profiler settings
+        self.profiler_interval_ms = self.config["profiler"]["interval_ms"]
+        self.profiler_directory = self.config["profiler"]["directory"]
+
+        # Metrics settings
+        self.metrics_enabled = self.config["metrics"]["enabled"]
+        self.metrics_port = self.config["metrics"]["port"]
+
     def initialize_dynamic_settings(self):
         """Initialize settings that can change throughout the game."""
         # 从配置重新加载初始速度
@@ -171,6 +354,65 @@ class Settings:
             self.config["sound"]["enabled"] = self.sound_enabled
             self.config["sound"]["music_volume"] = self.music_volume
             self.config["sound"]["effects_volume"] = self.effects_volume
+
+            self.config["graphics"]["renderer"] = self.renderer
+            self.config["graphics"]["render_scale"] = self.render_scale
+            self.config["graphics"]["scale_filter"] = self.scale_filter
+            self.config["graphics"]["starfield"] = self.starfield
+
+            self.config["performance"]["target_fps"] = self.target_fps
+            self.config["performance"]["max_frame_skip"] = self.max_frame_skip
+            self.config["performance"]["lazy_init"] = self.lazy_init
+            self.config["performance"]["threaded_simulation"] = self.threaded_simulation
+            self.config["performance"]["async_loop"] = self.async_loop
+            self.config["performance"]["background_budget_ms"] = self.background_budget_ms
+
+            self.config["telemetry"]["enabled"] = self.telemetry_enabled
+            self.config["telemetry"]["directory"] = self.telemetry_directory
+
+            self.config["enemy_fire"]["enabled"] = self.enemy_fire_enabled
+            self.config["enemy_fire"]["mode"] = self.enemy_fire_mode
+            self.config["enemy_fire"]["projectile_size"] = self.enemy_projectile_size
+            self.config["enemy_fire"]["projectile_color"] = list(self.enemy_projectile_color)
+            self.config["enemy_fire"]["max_projectiles"] = self.max_enemy_projectiles
+            self.config["enemy_fire"]["modes"] = self.enemy_fire_modes
+            self.config["enemy_fire"]["patterns"] = self.enemy_fire_patterns
+
+            self.config["particles"]["enabled"] = self.particles_enabled
+            self.config["particles"]["max_particles"] = self.max_particles
+            self.config["particles"]["spawn_budget"] = self.particle_spawn_budget
+            self.config["particles"]["engine_trail"] = self.engine_trail
+
+            self.config["collision"]["mode"] = self.collision_mode
+
+            self.config["dive"]["enabled"] = self.dive_enabled
+            self.config["dive"]["max_divers"] = self.max_divers
+            self.config["dive"]["interval"] = self.dive_interval
+            self.config["dive"]["frames"] = self.dive_frames
+
+            self.config["sprite_effects"]["rotate_divers"] = self.rotate_divers
+            self.config["sprite_effects"]["level_tint"] = self.level_tint
+            self.config["sprite_effects"]["cache_budget_kb"] = self.transform_cache_kb
+            self.config["sprite_effects"]["angle_step"] = self.transform_angle_step
+            self.config["sprite_effects"]["prewarm"] = self.prewarm_transforms
+
+            self.config["spectator"]["enabled"] = self.spectator_enabled
+            self.config["spectator"]["address"] = self.spectator_address
+            self.config["spectator"]["keyframe_interval"] = self.spectator_keyframe_interval
+            self.config["spectator"]["max_bytes_per_second"] = self.spectator_max_bytes_per_second
+            self.config["spectator"]["max_clients"] = self.spectator_max_clients
+
+            self.config["capture"]["format"] = self.capture_format
+            self.config["capture"]["every"] = self.capture_every
+            self.config["capture"]["directory"] = self.capture_directory
+            self.config["capture"]["queue_size"] = self.capture_queue_size
+            self.config["capture"]["command"] = self.capture_command
+
+            self.config["profiler"]["interval_ms"] = self.profiler_interval_ms
+            self.config["profiler"]["directory"] = self.profiler_directory
+
+            self.config["metrics"]["enabled"] = self.metrics_enabled
+            self.config["metrics"]["port"] = self.metrics_port
             
             # 保存到文件
             with open('config.json', 'w') as f:
@@ -1,22 +1,27 @@
 # Copyright (c) 2025 tree_division
 # Licensed under the MIT License
 
-import pygame
 from pygame.sprite import Sprite
 
+import sprite_atlas
+
 
 class Ship(Sprite):
     """A class to manage the ship."""
 
+    # 属性放在__slots__中（Sprite没有定义__slots__，实例仍有一个空的__dict__）
+    __slots__ = ('_Sprite__g', 'renderer', 'settings', 'screen_rect', 'image', 'rect', 'x',
+                 'moving_right', 'moving_left')
+
     def __init__(self, ai_game):
         """Initialize the ship and set its starting position."""
         super().__init__()
-        self.screen = ai_game.screen
+        self.renderer = ai_game.renderer
         self.settings = ai_game.settings
         self.screen_rect = ai_game.screen.get_rect()
 
         # Load the ship image and get its rect.
-        self.image = pygame.image.load('images/ship.png')
+        self.image = sprite_atlas.get_image('ship')
         self.rect = self.image.get_rect()
 
         # Start each new ship at the bottom center of the screen.
@@ -47,4 +52,4 @@ class Ship(Sprite):
 
     def blitme(self):
         """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
\ No newline at end of file
+        self.renderer.blit(self.image, self.rect)
\ No newline at end of file
@@ -0,0 +1,111 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import threading
+from collections import namedtuple
+
+# 一帧渲染所需的全部数据。模拟线程生成后不再修改：列表都是新建的，
+# 图像表面只会被替换而不会被就地修改，渲染线程读取时不需要加锁。
+#   background: 星空各层的滚动位置（None表示纯色背景）
+#   entities, particles: ecs.render_commands格式的绘制命令
+#   ship: (图像, 左上角)；aliens, hud: ((图像, 左上角), ...)
+#   input_tick: 已经处理的最后一个输入快照（用于测量输入延迟）
+RenderSnapshot = namedtuple(
+    'RenderSnapshot',
+    'tick background entities particles ship aliens hud game_active input_tick')
+
+
+class SnapshotBuffer:
+    """双缓冲的渲染快照
+
+    模拟线程写入后台槽位，然后交换前后台；渲染线程总是读取前台槽位中完整的一帧。
+    """
+
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+        self._condition = threading.Condition()
+        self.published = 0
+
+    def publish(self, snapshot):
+        """模拟线程调用：发布新的一帧"""
+        back = 1 - self._front
+        self._slots[back] = snapshot
+        with self._condition:
+            self._front = back
+            self.published += 1
+            self._condition.notify_all()
+
+    def wait(self, seen, timeout):
+        """渲染线程调用：等待比seen更新的一帧，返回(序号, 快照)；超时时返回当前的一帧"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.published != seen, timeout)
+            return self.published, self._slots[self._front]
+
+    def wake(self):
+        """唤醒等待中的渲染线程（模拟线程出错时）"""
+        with self._condition:
+            self._condition.notify_all()
+
+
+class SimulationThread:
+    """在单独的线程中以固定频率运行游戏逻辑
+
+    每一帧在持有lock时调用ai_game._simulate()并生成渲染快照，然后发布到snapshots；
+    主线程处理事件时也持有lock，绘制快照时不需要。绘制（SDL的blit会释放GIL）
+    和下一帧的模拟可以同时进行，输入延迟不超过一个模拟周期。
+    """
+
+    def __init__(self, ai_game):
+        self.ai_game = ai_game
+        self.lock = threading.Lock()
+        self.snapshots = SnapshotBuffer()
+        self.rendered = 0
+        self.superseded = 0
+        self.error = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        ai_game = self.ai_game
+        governor = ai_game.governor
+        try:
+            while self._running:
+                governor.begin_frame()
+                with self.lock:
+                    ai_game._simulate()
+                    snapshot = ai_game._make_snapshot()
+                self.snapshots.publish(snapshot)
+                governor.end_frame()
+        except Exception as e:
+            # 交给主线程重新抛出
+            self.error = e
+            self.snapshots.wake()
+
+    def check(self):
+        """模拟线程出错时在主线程中抛出异常"""
+        if self.error is not None:
+            raise RuntimeError("模拟线程出错") from self.error
+
+    def record_render(self, seen, last_rendered):
+        """统计已绘制的快照和没来得及绘制就被新快照替换的快照"""
+        self.rendered += 1
+        self.superseded += max(0, seen - last_rendered - 1)
+
+    def get_metrics(self):
+        return {
+            'simulated': self.snapshots.published,
+            'rendered': self.rendered,
+            'superseded': self.superseded,
+        }
+
+    def stop(self):
+        """停止模拟线程（等待当前这一帧结束）"""
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
@@ -3,72 +3,66 @@
 
 import pygame
 import os
+import threading
+
+import asset_pack
 
 class SoundManager:
     """管理游戏中的所有音效"""
     
-    def __init__(self, settings):
-        """初始化音效管理器"""
+    def __init__(self, settings, lazy=False):
+        """初始化音效管理器
+
+        lazy: 为True时等到第一次需要播放声音时才初始化混音器并加载音效
+        """
         self.settings = settings
-        pygame.mixer.init()
+        # 混音器初始化并加载完音效之后才为True；异步主循环中加载在后台线程进行，
+        # 游戏线程看到True时混音器一定已经可用
+        self.initialized = False
+        self._load_lock = threading.Lock()
         self.sounds_loaded = False
         self.music_available = False
-        self._load_sounds()
+        # 打包的音效已是混音器格式的原始采样，不用逐个检查文件是否存在
+        self.pack = asset_pack.get_pack()
+        if not lazy:
+            self._ensure_loaded()
+
+    def _ensure_loaded(self):
+        """初始化混音器并加载音效（只执行一次；其他线程正在加载时等它完成）"""
+        if self.initialized:
+            return
+        with self._load_lock:
+            if self.initialized:
+                return
+            mixer_format = self.pack.mixer_format() if self.pack is not None else None
+            if mixer_format:
+                # 使用打包时的格式，资源包中的音效可以直接使用，不需要重新采样
+                pygame.mixer.init(*mixer_format)
+            else:
+                pygame.mixer.init()
+            self._load_sounds()
+            self.initialized = True
+
+    def _ready(self):
+        """确保音效已加载，返回音效是否可用"""
+        self._ensure_loaded()
+        return self.sounds_loaded
     
     def _load_sounds(self):
         """加载所有音效文件"""
         # 确保sounds目录存在
-        if not os.path.exists('sounds'):
+        if not os.path.exists('sounds') and not self._has_packed_sounds():
             os.makedirs('sounds')
             print("创建了sounds目录，请将音效文件放入此目录")
             self._create_dummy_sounds()
             return
             
         try:
-            # 检查并加载射击音效
-            if os.path.exists('sounds/shoot.wav'):
-                self.shoot_sound = pygame.mixer.Sound('sounds/shoot.wav')
-                self.shoot_sound.set_volume(self.settings.effects_volume * 0.5)
-                print("加载射击音效成功")
-            else:
-                print("警告: 找不到 sounds/shoot.wav 文件")
-                self.shoot_sound = None
-            
-            # 检查并加载外星人爆炸音效
-            if os.path.exists('sounds/explosion.wav'):
-                self.alien_explosion_sound = pygame.mixer.Sound('sounds/explosion.wav')
-                self.alien_explosion_sound.set_volume(self.settings.effects_volume * 0.6)
-                print("加载爆炸音效成功")
-            else:
-                print("警告: 找不到 sounds/explosion.wav 文件")
-                self.alien_explosion_sound = None
-            
-            # 检查并加载飞船被撞音效
-            if os.path.exists('sounds/ship_hit.wav'):
-                self.ship_hit_sound = pygame.mixer.Sound('sounds/ship_hit.wav')
-                self.ship_hit_sound.set_volume(self.settings.effects_volume * 0.7)
-                print("加载飞船被撞音效成功")
-            else:
-                print("警告: 找不到 sounds/ship_hit.wav 文件")
-                self.ship_hit_sound = None
-            
-            # 检查并加载游戏结束音效
-            if os.path.exists('sounds/game_over.wav'):
-                self.game_over_sound = pygame.mixer.Sound('sounds/game_over.wav')
-                self.game_over_sound.set_volume(self.settings.effects_volume * 0.8)
-                print("加载游戏结束音效成功")
-            else:
-                print("警告: 找不到 sounds/game_over.wav 文件")
-                self.game_over_sound = None
-            
-            # 检查并加载等级提升音效
-            if os.path.exists('sounds/level_up.wav'):
-                self.level_up_sound = pygame.mixer.Sound('sounds/level_up.wav')
-                self.level_up_sound.set_volume(self.settings.effects_volume * 0.6)
-                print("加载等级提升音效成功")
-            else:
-                print("警告: 找不到 sounds/level_up.wav 文件")
-                self.level_up_sound = None
+            self.shoot_sound = self._load_sound('sounds/shoot.wav', 0.5, "射击")
+            self.alien_explosion_sound = self._load_sound('sounds/explosion.wav', 0.6, "爆炸")
+            self.ship_hit_sound = self._load_sound('sounds/ship_hit.wav', 0.7, "飞船被撞")
+            self.game_over_sound = self._load_sound('sounds/game_over.wav', 0.8, "游戏结束")
+            self.level_up_sound = self._load_sound('sounds/level_up.wav', 0.6, "等级提升")
             
             # 检查背景音乐
             if os.path.exists('sounds/background_music.mp3'):
@@ -119,6 +113,25 @@ class SoundManager:
             print("游戏将继续运行，但没有音效")
             self._create_dummy_sounds()
     
+    def _has_packed_sounds(self):
+        return self.pack is not None and self.pack.mixer_format() is not None
+
+    def _sound_exists(self, path):
+        """音效在资源包中或者文件存在"""
+        return (self.pack is not None and self.pack.has_sound(path)) or os.path.exists(path)
+
+    def _load_sound(self, path, volume_scale, name):
+        """优先从资源包加载音效，否则加载文件；找不到时返回None"""
+        sound = self.pack.sound(path) if self.pack is not None else None
+        if sound is None:
+            if not os.path.exists(path):
+                print(f"警告: 找不到 {path} 文件")
+                return None
+            sound = pygame.mixer.Sound(path)
+        sound.set_volume(self.settings.effects_volume * volume_scale)
+        print(f"加载{name}音效成功")
+        return sound
+    
     def _create_dummy_sounds(self):
         """创建空的音效对象作为备选"""
         self.shoot_sound = None
@@ -131,32 +144,35 @@ class SoundManager:
     
     def play_shoot(self):
         """播放射击音效"""
-        if self.settings.sound_enabled and self.sounds_loaded and self.shoot_sound:
+        if self.settings.sound_enabled and self._ready() and self.shoot_sound:
             self.shoot_sound.play()
     
     def play_alien_explosion(self):
         """播放外星人爆炸音效"""
-        if self.settings.sound_enabled and self.sounds_loaded and self.alien_explosion_sound:
+        if self.settings.sound_enabled and self._ready() and self.alien_explosion_sound:
             self.alien_explosion_sound.play()
     
     def play_ship_hit(self):
         """播放飞船被击中音效"""
-        if self.settings.sound_enabled and self.sounds_loaded and self.ship_hit_sound:
+        if self.settings.sound_enabled and self._ready() and self.ship_hit_sound:
             self.ship_hit_sound.play()
     
     def play_game_over(self):
         """播放游戏结束音效"""
-        if self.settings.sound_enabled and self.sounds_loaded and self.game_over_sound:
+        if self.settings.sound_enabled and self._ready() and self.game_over_sound:
             self.game_over_sound.play()
     
     def play_level_up(self):
         """播放等级提升音效"""
-        if self.settings.sound_enabled and self.sounds_loaded and self.level_up_sound:
+        if self.settings.sound_enabled and self._ready() and self.level_up_sound:
             self.level_up_sound.play()
     
     def play_background_music(self):
         """播放背景音乐"""
-        if not self.settings.sound_enabled or not self.music_available:
+        if not self.settings.sound_enabled:
+            return
+        self._ensure_loaded()
+        if not self.music_available:
             return
             
         try:
@@ -170,15 +186,17 @@ class SoundManager:
     
     def stop_background_music(self):
         """停止背景音乐"""
-        pygame.mixer.music.stop()
+        if self.initialized:
+            pygame.mixer.music.stop()
     
     def pause_background_music(self):
         """暂停背景音乐"""
-        pygame.mixer.music.pause()
+        if self.initialized:
+            pygame.mixer.music.pause()
     
     def unpause_background_music(self):
         """恢复背景音乐"""
-        if self.settings.sound_enabled and self.music_available:
+        if self.settings.sound_enabled and self.initialized and self.music_available:
             pygame.mixer.music.unpause()
     
     def set_volume(self, volume):
@@ -202,6 +220,13 @@ class SoundManager:
         if self.music_available:
             pygame.mixer.music.set_volume(volume)
     
+    def busy_channels(self):
+        """正在播放的声道数"""
+        if not self.initialized or not pygame.mixer.get_init():
+            return 0
+        return sum(pygame.mixer.Channel(i).get_busy()
+                   for i in range(pygame.mixer.get_num_channels()))
+    
     def are_sounds_available(self):
         """检查是否有任何音效可用"""
         return self.sounds_loaded and self.settings.sound_enabled
@@ -213,15 +238,15 @@ class SoundManager:
     def get_missing_sounds(self):
         """返回缺失的音效文件列表"""
         missing = []
-        if not os.path.exists('sounds/shoot.wav'):
+        if not self._sound_exists('sounds/shoot.wav'):
             missing.append('shoot.wav')
-        if not os.path.exists('sounds/explosion.wav'):
+        if not self._sound_exists('sounds/explosion.wav'):
             missing.append('explosion.wav')
-        if not os.path.exists('sounds/ship_hit.wav'):
+        if not self._sound_exists('sounds/ship_hit.wav'):
             missing.append('ship_hit.wav')
-        if not os.path.exists('sounds/game_over.wav'):
+        if not self._sound_exists('sounds/game_over.wav'):
             missing.append('game_over.wav')
-        if not os.path.exists('sounds/level_up.wav'):
+        if not self._sound_exists('sounds/level_up.wav'):
             missing.append('level_up.wav')
         if not os.path.exists('sounds/background_music.mp3'):
             missing.append('background_music.mp3')
@@ -0,0 +1,288 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+"""观战数据流
+
+游戏每帧把状态（飞船、子弹、敌方子弹、外星人、分数、等级）发布到TCP或Unix套接字，
+另一个进程（spectator_viewer.py）接收并绘制。每个观众先收到一个关键帧，之后是相对于
+上一次发给这个观众的帧的增量，定期再发送关键帧。
+
+消息格式: 长度(u32, 不含自身) + 类型(u8) + 帧号(u32) + zlib压缩的数据。
+数据依次为标量、（仅关键帧）尺寸信息、三个实体列表；每个列表是
+标志(u8: 0完整坐标, 1相对上一帧的差值) + 数量(u16) + int16坐标(x, y)。
+"""
+
+import os
+import selectors
+import socket
+import struct
+import threading
+import zlib
+from collections import namedtuple
+from time import perf_counter
+
+import numpy as np
+
+# 消息类型
+KEYFRAME = 0
+DELTA = 1
+
+MESSAGE_HEADER = struct.Struct('<IBI')
+LIST_HEADER = struct.Struct('<BH')
+# 分数, 等级, 剩余飞船, 游戏是否进行中, 飞船x, 飞船y
+SCALARS = struct.Struct('<iHBBhh')
+# 屏幕、飞船、外星人、子弹、敌方子弹的宽和高
+META = struct.Struct('<10H')
+# 实体列表的顺序
+LISTS = ('bullets', 'projectiles', 'aliens')
+
+# 一帧游戏状态；lists中每一项是形状为(n, 2)的int16坐标数组（左上角）
+Frame = namedtuple('Frame', 'tick scalars lists')
+
+
+def parse_address(address):
+    """'host:port' 为TCP地址，其他字符串为Unix套接字路径"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+
+def make_points(points):
+    """转换为只读的int16坐标数组，发布之后游戏不能再修改它"""
+    points = np.array(points, np.int16).reshape(-1, 2)
+    points.flags.writeable = False
+    return points
+
+
+def encode_frame(frame, meta, base=None):
+    """编码一帧：base为None时编码为关键帧，否则编码为相对base的增量"""
+    parts = [SCALARS.pack(*frame.scalars)]
+    if base is None:
+        parts.append(META.pack(*meta))
+    for points, base_points in zip(frame.lists, base.lists if base else (None,) * len(LISTS)):
+        if base_points is not None and len(base_points) == len(points):
+            # 数量不变时只发送差值：整个舰队同步移动时差值都相同，压缩后很小
+            parts.append(LIST_HEADER.pack(1, len(points)))
+            parts.append((points - base_points).astype('<i2').tobytes())
+        else:
+            parts.append(LIST_HEADER.pack(0, len(points)))
+            parts.append(points.astype('<i2').tobytes())
+    payload = zlib.compress(b''.join(parts), 1)
+    kind = KEYFRAME if base is None else DELTA
+    return MESSAGE_HEADER.pack(MESSAGE_HEADER.size - 4 + len(payload), kind, frame.tick) + payload
+
+
+class SpectatorDecoder:
+    """观众端：把收到的字节流还原为帧"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.frame = None
+        self.meta = None
+
+    def feed(self, data):
+        """加入收到的数据，返回其中完整的帧解码后的最新一帧（没有时返回None）"""
+        self.buffer += data
+        latest = None
+        while len(self.buffer) >= MESSAGE_HEADER.size:
+            length, kind, tick = MESSAGE_HEADER.unpack_from(self.buffer)
+            end = 4 + length
+            if len(self.buffer) < end:
+                break
+            payload = zlib.decompress(bytes(self.buffer[MESSAGE_HEADER.size:end]))
+            del self.buffer[:end]
+            frame = self._decode(kind, tick, payload)
+            if frame is not None:
+                latest = self.frame = frame
+        return latest
+
+    def _decode(self, kind, tick, payload):
+        base = self.frame
+        if kind == DELTA and base is None:
+            # 还没有收到关键帧
+            return None
+        scalars = SCALARS.unpack_from(payload)
+        offset = SCALARS.size
+        if kind == KEYFRAME:
+            self.meta = META.unpack_from(payload, offset)
+            offset += META.size
+            base = None
+
+        lists = []
+        for i in range(len(LISTS)):
+            is_delta, count = LIST_HEADER.unpack_from(payload, offset)
+            offset += LIST_HEADER.size
+            points = np.frombuffer(payload, '<i2', count * 2, offset).reshape(-1, 2)
+            offset += points.nbytes
+            if is_delta:
+                points = base.lists[i] + points
+            lists.append(points.astype(np.int16))
+        return Frame(tick, scalars, tuple(lists))
+
+
+class _Client:
+    """一个观众连接的发送状态"""
+
+    __slots__ = ('sock', 'base', 'keyframe_tick', 'pending', 'tokens', 'refilled')
+
+    def __init__(self, sock, budget):
+        self.sock = sock
+        self.base = None            # 上一次发给这个观众的帧
+        self.keyframe_tick = 0
+        self.pending = b''          # 没有发送完的数据
+        self.tokens = budget
+        self.refilled = perf_counter()
+
+
+class SpectatorServer:
+    """把游戏状态发布给观众
+
+    游戏线程调用publish()只保存对最新一帧的引用；编码和发送在后台线程中进行，
+    套接字都是非阻塞的。观众来不及接收（上一条消息还没发完）或者超出
+    每秒字节数预算时，跳过这一帧而不是排队，下一条增量相对于实际发出的帧计算。
+    """
+
+    def __init__(self, address, meta, keyframe_interval=120,
+                 max_bytes_per_second=256 * 1024, max_clients=4):
+        self.meta = meta
+        self.keyframe_interval = keyframe_interval
+        self.max_bytes_per_second = max_bytes_per_second
+        self.max_clients = max_clients
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+
+        family, self.address = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(self.address):
+            os.unlink(self.address)
+        self.listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self.listener.bind(self.address)
+            self.listener.listen()
+        except OSError:
+            self.listener.close()
+            raise
+        self.listener.setblocking(False)
+        self.address = self.listener.getsockname()
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.clients = []
+        self._latest = None
+        self._wake = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="spectator", daemon=True)
+        self._thread.start()
+
+    def publish(self, frame):
+        """游戏线程每帧调用；不等待网络"""
+        self._latest = frame
+        self._wake.set()
+
+    def _run(self):
+        while self._running:
+            self._wake.wait(0.1)
+            self._wake.clear()
+            for key, _mask in self.selector.select(0):
+                if key.fileobj is self.listener:
+                    self._accept()
+                else:
+                    self._receive(key.data)
+            frame = self._latest
+            for client in list(self.clients):
+                self._serve(client, frame)
+
+    def _accept(self):
+        try:
+            sock, _address = self.listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        if len(self.clients) >= self.max_clients:
+            sock.close()
+            return
+        sock.setblocking(False)
+        client = _Client(sock, self.max_bytes_per_second)
+        self.clients.append(client)
+        self.selector.register(sock, selectors.EVENT_READ, client)
+
+    def _receive(self, client):
+        """观众不发送数据，可读只意味着连接已关闭"""
+        try:
+            if client.sock.recv(4096):
+                return
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            pass
+        self._drop_client(client)
+
+    def _drop_client(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+            self.selector.unregister(client.sock)
+            client.sock.close()
+
+    def _send(self, client):
+        """尽量发送待发数据，返回是否已全部发出"""
+        try:
+            sent = client.sock.send(client.pending)
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            self._drop_client(client)
+            return False
+        self.bytes_sent += sent
+        client.pending = client.pending[sent:]
+        return not client.pending
+
+    def _serve(self, client, frame):
+        if client.pending and not self._send(client):
+            if frame is not None and frame is not client.base:
+                self.frames_dropped += 1
+            return
+        if frame is None or frame is client.base:
+            return
+
+        # 按时间补充可发送的字节数，最多积累一秒的预算
+        now = perf_counter()
+        client.tokens = min(self.max_bytes_per_second,
+                            client.tokens + (now - client.refilled) * self.max_bytes_per_second)
+        client.refilled = now
+        if client.tokens <= 0:
+            self.frames_dropped += 1
+            return
+
+        base = client.base
+        if base is None or frame.tick - client.keyframe_tick >= self.keyframe_interval:
+            base = None
+            client.keyframe_tick = frame.tick
+        client.pending = encode_frame(frame, self.meta, base)
+        # 关键帧可能超出剩余预算，超出的部分从之后的预算中扣除
+        client.tokens -= len(client.pending)
+        client.base = frame
+        self.frames_sent += 1
+        self._send(client)
+
+    def get_metrics(self):
+        """观众数量和发送统计"""
+        return {
+            'clients': len(self.clients),
+            'frames_sent': self.frames_sent,
+            'frames_dropped': self.frames_dropped,
+            'bytes_sent': self.bytes_sent,
+        }
+
+    def close(self):
+        """停止发送线程并关闭所有连接"""
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+        for client in list(self.clients):
+            self._drop_client(client)
+        self.selector.close()
+        self.listener.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
@@ -0,0 +1,133 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+"""观战窗口：连接到游戏的观战数据流并绘制
+
+用法: python spectator_viewer.py [地址]   （默认使用config.json中spectator的address）
+"""
+
+import argparse
+import json
+import socket
+import sys
+
+import pygame
+
+import sprite_atlas
+from spectator import SpectatorDecoder, parse_address
+
+BG_COLOR = (10, 10, 30)
+TEXT_COLOR = (230, 230, 230)
+BULLET_COLOR = (255, 220, 60)
+PROJECTILE_COLOR = (255, 80, 80)
+
+
+def _default_address():
+    try:
+        with open('config.json', 'r') as f:
+            return json.load(f)["spectator"]["address"]
+    except (IOError, json.JSONDecodeError, KeyError):
+        return '127.0.0.1:7777'
+
+
+def _connect(address):
+    family, address = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(address)
+    sock.setblocking(False)
+    return sock
+
+
+def _receive(sock, decoder):
+    """读取所有已到达的数据，返回最新的帧；连接关闭时抛出ConnectionError"""
+    latest = None
+    while True:
+        try:
+            data = sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return latest
+        if not data:
+            raise ConnectionError("游戏已关闭观战连接")
+        latest = decoder.feed(data) or latest
+
+
+def _draw(screen, frame, meta, images, font):
+    _screen_w, _screen_h, ship_w, ship_h, alien_w, alien_h, \
+        bullet_w, bullet_h, projectile_w, projectile_h = meta
+    score, level, ships_left, active, ship_x, ship_y = frame.scalars
+    bullets, projectiles, aliens = frame.lists
+
+    screen.fill(BG_COLOR)
+    alien_image = images.get('alien')
+    for x, y in aliens.tolist():
+        if alien_image is not None:
+            screen.blit(alien_image, (x, y))
+        else:
+            screen.fill((120, 220, 120), (x, y, alien_w, alien_h))
+    for x, y in bullets.tolist():
+        screen.fill(BULLET_COLOR, (x, y, bullet_w, bullet_h))
+    for x, y in projectiles.tolist():
+        screen.fill(PROJECTILE_COLOR, (x, y, projectile_w, projectile_h))
+    if images.get('ship') is not None:
+        screen.blit(images['ship'], (ship_x, ship_y))
+    else:
+        screen.fill((200, 200, 255), (ship_x, ship_y, ship_w, ship_h))
+
+    status = f"Score {score:,}   Level {level}   Ships {ships_left}"
+    if not active:
+        status += "   (waiting)"
+    screen.blit(font.render(status, True, TEXT_COLOR), (10, 10))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alien Invasion 观战窗口")
+    parser.add_argument('address', nargs='?', default=None,
+                        help="游戏的观战地址，host:port 或 Unix套接字路径")
+    args = parser.parse_args()
+    address = args.address or _default_address()
+
+    try:
+        sock = _connect(address)
+    except OSError as e:
+        print(f"错误: 无法连接到 {address} ({e})")
+        sys.exit(1)
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_caption(f"Alien Invasion - 观战 {address}")
+    screen = pygame.display.set_mode((400, 300))
+    font = pygame.font.SysFont(None, 28)
+    clock = pygame.time.Clock()
+    decoder = SpectatorDecoder()
+    images = {}
+    frame = None
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                sock.close()
+                return
+
+        try:
+            frame = _receive(sock, decoder) or frame
+        except (ConnectionError, OSError) as e:
+            print(f"观战结束 ({e})")
+            sock.close()
+            return
+
+        if frame is not None:
+            if screen.get_size() != tuple(decoder.meta[:2]):
+                # 收到第一个关键帧后按游戏的画面大小打开窗口，并加载精灵图像
+                screen = pygame.display.set_mode(decoder.meta[:2])
+                for name in ('alien', 'ship'):
+                    try:
+                        images[name] = sprite_atlas.get_image(name)
+                    except (pygame.error, FileNotFoundError):
+                        images[name] = None
+            _draw(screen, frame, decoder.meta, images, font)
+        pygame.display.flip()
+        clock.tick(60)
+
+
+if __name__ == '__main__':
+    main()
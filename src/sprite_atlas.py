@@ -0,0 +1,163 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import json
+import os
+
+import pygame
+
+import asset_pack
+
+IMAGES_DIR = 'images'
+ATLAS_IMAGE = 'atlas.png'
+ATLAS_INDEX = 'atlas.json'
+
+# 图块之间留1像素间隔，避免缩放或旋转时相邻图块的像素渗入
+PADDING = 1
+
+
+class SpriteAtlas:
+    """管理打包后的精灵图集，所有精灵共享同一张图集的子表面"""
+
+    def __init__(self, images_dir=IMAGES_DIR):
+        self.images_dir = images_dir
+        self.sheet = None
+        self.index = None
+        self.images = {}
+
+    def _load(self):
+        """第一次取图时加载图集和索引"""
+        self.index = {}
+        pack = asset_pack.get_pack()
+        if pack is not None and pack.image('atlas') is not None:
+            # 资源包中保存的是已解码的像素，不需要再读取和解码PNG
+            self.sheet = self._convert(pack.image('atlas'))
+            self.index = pack.sprites()
+            return
+        index_path = os.path.join(self.images_dir, ATLAS_INDEX)
+        try:
+            with open(index_path, 'r') as f:
+                data = json.load(f)
+            self.sheet = pygame.image.load(
+                os.path.join(self.images_dir, data["image"]))
+            self.sheet = self._convert(self.sheet)
+            self.index = data["sprites"]
+        except (IOError, json.JSONDecodeError, KeyError, pygame.error) as e:
+            print(f"警告: 无法加载精灵图集，改为加载单独的图片 ({e})")
+            self.sheet = None
+
+    def _convert(self, surface):
+        """转换为显示格式；显示模式尚未设置时保持原样"""
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha()
+
+    def get_image(self, name):
+        """按名称返回精灵图像，例如 'alien' 或 'frames/alien_1'"""
+        image = self.images.get(name)
+        if image is not None:
+            return image
+
+        if self.index is None:
+            self._load()
+
+        if self.sheet is not None and name in self.index:
+            image = self.sheet.subsurface(pygame.Rect(self.index[name]))
+        else:
+            # 图集中没有这个精灵（例如新加的图片还没重新打包）
+            pack = asset_pack.get_pack()
+            image = pack.image(name) if pack is not None else None
+            if image is None:
+                image = pygame.image.load(os.path.join(self.images_dir, f"{name}.png"))
+            image = self._convert(image)
+
+        self.images[name] = image
+        return image
+
+    def reload(self):
+        """丢弃已加载的图集，下次取图时重新加载"""
+        self.sheet = None
+        self.index = None
+        self.images = {}
+
+
+_atlas = SpriteAtlas()
+
+
+def get_image(name):
+    """从共享图集中获取精灵图像"""
+    return _atlas.get_image(name)
+
+
+def reload():
+    """重新加载共享图集"""
+    _atlas.reload()
+
+
+def _find_sources(images_dir):
+    """找出需要打包的所有png文件（包括子目录中的动画帧）"""
+    sources = []
+    for root, _dirs, files in os.walk(images_dir):
+        for filename in files:
+            if not filename.endswith('.png'):
+                continue
+            path = os.path.join(root, filename)
+            relpath = os.path.relpath(path, images_dir).replace(os.sep, '/')
+            if relpath == ATLAS_IMAGE:
+                continue
+            sources.append((relpath[:-len('.png')], path))
+    return sorted(sources)
+
+
+def _pack(sizes, max_width):
+    """简单的货架式装箱：按高度从大到小逐行排放"""
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], name))
+    positions = {}
+    x = y = shelf_height = 0
+    width = 0
+    for name in order:
+        w, h = sizes[name]
+        if x > 0 and x + w > max_width:
+            # 当前行放不下，换到下一行
+            x = 0
+            y += shelf_height + PADDING
+            shelf_height = 0
+        positions[name] = (x, y, w, h)
+        x += w + PADDING
+        width = max(width, x - PADDING)
+        shelf_height = max(shelf_height, h)
+    return positions, (width, y + shelf_height)
+
+
+def build_atlas(images_dir=IMAGES_DIR, max_width=1024):
+    """把images目录下的png打包成一张图集和一个json索引"""
+    sources = _find_sources(images_dir)
+    if not sources:
+        print(f"警告: {images_dir} 中没有找到png图片")
+        return None
+
+    surfaces = {name: pygame.image.load(path) for name, path in sources}
+    sizes = {name: surface.get_size() for name, surface in surfaces.items()}
+    positions, atlas_size = _pack(sizes, max(max_width, *(w for w, _h in sizes.values())))
+
+    sheet = pygame.Surface(atlas_size, pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    for name, (x, y, _w, _h) in positions.items():
+        sheet.blit(surfaces[name], (x, y))
+
+    pygame.image.save(sheet, os.path.join(images_dir, ATLAS_IMAGE))
+    index = {
+        "image": ATLAS_IMAGE,
+        "size": list(atlas_size),
+        "sprites": {name: list(rect) for name, rect in sorted(positions.items())}
+    }
+    with open(os.path.join(images_dir, ATLAS_INDEX), 'w') as f:
+        json.dump(index, f, indent=4)
+
+    print(f"已打包 {len(positions)} 张图片到 {ATLAS_IMAGE} ({atlas_size[0]} x {atlas_size[1]})")
+    return index
+
+
+if __name__ == '__main__':
+    # 重新生成图集：python sprite_atlas.py
+    build_atlas()
@@ -0,0 +1,75 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import random
+
+import pygame
+
+# 每一层: (每帧向下滚动的像素, 星星数量, 星星大小, 亮度)，从远到近
+LAYERS = (
+    (0.15, 180, 1, 110),
+    (0.4, 80, 2, 170),
+    (0.9, 30, 2, 240),
+)
+
+
+class Starfield:
+    """视差滚动的星空背景
+
+    每一层星星在创建时预先绘制到一张和屏幕一样大、上下可以无缝拼接的表面上，
+    之后每帧每层只需要两次blit（当前位置和绕回的部分），不再逐颗绘制星星。
+    最远的一层用背景色填充，其余层用colorkey透明，blit时只复制星星所在的像素。
+    """
+
+    def __init__(self, size, bg_color, layers=LAYERS, seed=1):
+        self.width, self.height = size
+        # 单独的随机数生成器，不影响游戏逻辑中的随机序列
+        rng = random.Random(seed)
+        # 浅色背景上用深色的星星（和Scoreboard选择文字颜色的方法相同）
+        light = (bg_color[0] * 299 + bg_color[1] * 587 + bg_color[2] * 114) / 1000 >= 128
+        self.layers = []
+        for i, (speed, count, star_size, brightness) in enumerate(layers):
+            if light:
+                brightness = 255 - brightness
+            tile = self._make_tile(rng, bg_color if i == 0 else None, count, star_size, brightness)
+            self.layers.append([tile, speed, 0.0])
+
+    def _make_tile(self, rng, bg_color, count, star_size, brightness):
+        """绘制一层可以上下拼接的星星"""
+        tile = pygame.Surface((self.width, self.height))
+        if pygame.display.get_surface() is not None:
+            tile = tile.convert()
+        if bg_color is not None:
+            tile.fill(bg_color)
+        else:
+            # 透明色选一个星星不会用到的颜色（星星的蓝色分量至少为15）
+            tile.fill((0, 0, 0))
+            tile.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+
+        color = (brightness, brightness, min(255, brightness + 15))
+        for _ in range(count):
+            x = rng.randrange(self.width)
+            y = rng.randrange(self.height)
+            tile.fill(color, (x, y, star_size, star_size))
+            if y + star_size > self.height:
+                # 超出底边的部分画到顶部，保证拼接处连续
+                tile.fill(color, (x, y - self.height, star_size, star_size))
+        return tile
+
+    def update(self):
+        """每帧滚动各层"""
+        for layer in self.layers:
+            layer[2] = (layer[2] + layer[1]) % self.height
+
+    def offsets(self):
+        """各层当前的滚动位置（用于渲染快照）"""
+        return tuple(layer[2] for layer in self.layers)
+
+    def draw(self, renderer, offsets=None):
+        """代替清屏：从远到近绘制各层；offsets为None时使用当前位置"""
+        if offsets is None:
+            offsets = self.offsets()
+        for (tile, _speed, _offset), offset in zip(self.layers, offsets):
+            y = int(offset)
+            renderer.blit(tile, (0, y))
+            renderer.blit(tile, (0, y - self.height))
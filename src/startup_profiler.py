@@ -0,0 +1,44 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class StartupProfiler:
+    """记录从启动到第一帧显示之间各阶段的耗时"""
+
+    def __init__(self, start=None):
+        self.start = perf_counter() if start is None else start
+        self.stages = []
+        self.first_frame = None
+
+    @contextmanager
+    def stage(self, name):
+        """统计with语句块的耗时，记为一个启动阶段"""
+        stage_start = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, perf_counter() - stage_start))
+
+    def add_stage(self, name, seconds):
+        """直接记录一个阶段（例如在profiler创建之前就发生的模块导入）"""
+        self.stages.append((name, seconds))
+
+    def mark_first_frame(self):
+        """第一帧显示到屏幕上时调用"""
+        if self.first_frame is None:
+            self.first_frame = perf_counter() - self.start
+
+    def report(self):
+        """打印各阶段耗时"""
+        total = self.first_frame if self.first_frame is not None else perf_counter() - self.start
+        print("=== 启动耗时 ===")
+        for name, seconds in self.stages:
+            share = seconds / total * 100 if total > 0 else 0
+            print(f"{name:<24}{seconds * 1000:>9.1f} ms {share:>6.1f}%")
+        other = total - sum(seconds for _name, seconds in self.stages)
+        print(f"{'其他':<24}{max(other, 0) * 1000:>9.1f} ms")
+        print(f"{'到第一帧':<24}{total * 1000:>9.1f} ms")
+        print("===============")
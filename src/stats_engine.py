@@ -0,0 +1,162 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import math
+from collections import deque
+
+
+class ScoreSketch:
+    """分数分布的有界内存草图（DDSketch）
+
+    按对数刻度分桶计数，分位数的相对误差不超过relative_accuracy；
+    桶数超过max_buckets时合并最低的桶，内存占用与对局数无关。
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=512):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        """加入一个分数"""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            # 合并最低的两个桶，只影响最低分段的精度
+            lowest, second = sorted(self.buckets)[:2]
+            self.buckets[second] += self.buckets.pop(lowest)
+
+    def quantile(self, q):
+        """返回第q分位数（0 <= q <= 1）的近似值"""
+        if self.count == 0:
+            return 0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "buckets": {str(index): count for index, count in self.buckets.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.buckets = {int(index): count for index, count in data["buckets"].items()}
+        return sketch
+
+
+class StatisticsEngine:
+    """增量维护的对局统计：每加入一局只做O(1)的更新
+
+    包括分数的均值和方差（Welford算法）、最近7局和30局的滚动平均、
+    分数分位数草图以及每个等级的最高分。
+    """
+
+    ROLLING_WINDOWS = (7, 30)
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        # 最近的分数，最新的在最后，长度不超过最大的滚动窗口
+        self.recent_scores = deque(maxlen=max(self.ROLLING_WINDOWS))
+        self.rolling_sums = {window: 0 for window in self.ROLLING_WINDOWS}
+        self.sketch = ScoreSketch()
+        self.best_per_level = {}
+
+    def add(self, score, level):
+        """加入一局的结果"""
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+
+        # 滚动窗口：加上新分数，减去刚好移出窗口的旧分数
+        for window in self.ROLLING_WINDOWS:
+            self.rolling_sums[window] += score
+            if len(self.recent_scores) >= window:
+                self.rolling_sums[window] -= self.recent_scores[-window]
+        self.recent_scores.append(score)
+
+        self.sketch.add(score)
+
+        key = str(level)
+        if score > self.best_per_level.get(key, -1):
+            self.best_per_level[key] = score
+
+    @property
+    def variance(self):
+        """分数的样本方差"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def rolling_average(self, window):
+        """最近window局的平均分"""
+        games = min(window, len(self.recent_scores))
+        return self.rolling_sums[window] / games if games else 0
+
+    def summary(self):
+        """返回用于显示的统计结果"""
+        return {
+            "score_mean": round(self.mean),
+            "score_std_dev": round(math.sqrt(self.variance)),
+            "rolling_average_7": round(self.rolling_average(7)),
+            "rolling_average_30": round(self.rolling_average(30)),
+            "score_p50": round(self.sketch.quantile(0.5)),
+            "score_p90": round(self.sketch.quantile(0.9)),
+            "score_p99": round(self.sketch.quantile(0.99)),
+            "best_per_level": {int(level): score for level, score
+                               in sorted(self.best_per_level.items(), key=lambda item: int(item[0]))}
+        }
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "recent_scores": list(self.recent_scores),
+            "rolling_sums": {str(window): total for window, total in self.rolling_sums.items()},
+            "sketch": self.sketch.to_dict(),
+            "best_per_level": self.best_per_level
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        engine = cls()
+        engine.count = data["count"]
+        engine.mean = data["mean"]
+        engine.m2 = data["m2"]
+        engine.recent_scores.extend(data["recent_scores"])
+        engine.rolling_sums = {int(window): total for window, total in data["rolling_sums"].items()}
+        engine.sketch = ScoreSketch.from_dict(data["sketch"])
+        engine.best_per_level = dict(data["best_per_level"])
+        return engine
+
+    @classmethod
+    def from_history(cls, history):
+        """从旧的对局记录（最新的在前）重建统计"""
+        engine = cls()
+        for session in reversed(history):
+            engine.add(session["score"], session["level"])
+        return engine
@@ -0,0 +1,152 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import os
+import sys
+import threading
+import zipfile
+from array import array
+from datetime import datetime
+from time import perf_counter
+
+# 事件类型
+SHOT = 0
+KILL = 1
+SHIP_HIT = 2
+LEVEL_UP = 3
+
+
+def _typecode(candidates, itemsize):
+    """选择在当前平台上占itemsize字节的array类型码（I/i、L/l的大小与平台有关）"""
+    for typecode in candidates:
+        if array(typecode).itemsize == itemsize:
+            return typecode
+    raise ValueError(f"没有{itemsize}字节的类型码: {candidates}")
+
+
+UINT32 = _typecode('IL', 4)
+INT32 = _typecode('il', 4)
+
+# 列名 -> (array类型码, numpy数据类型的种类)；字节数按类型码的实际大小写入文件头
+COLUMNS = {
+    'event': ('B', 'u'),
+    'frame': (UINT32, 'u'),
+    'time': ('f', 'f'),
+    'x': ('f', 'f'),
+    'y': ('f', 'f'),
+    'value': (INT32, 'i'),
+}
+
+
+def _npy_bytes(typecode, kind, data):
+    """把一列数据编码为.npy格式（不依赖numpy）"""
+    if sys.byteorder != 'little':
+        data = array(typecode, data)
+        data.byteswap()
+    dtype = f"{kind}{data.itemsize}"
+    byte_order = '|' if data.itemsize == 1 else '<'
+    header = (f"{{'descr': '{byte_order}{dtype}', 'fortran_order': False, "
+              f"'shape': ({len(data)},), }}")
+    # 头部按64字节对齐，并以换行结尾
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = (header + ' ' * padding + '\n').encode('latin1')
+    return b'\x93NUMPY\x01\x00' + len(header).to_bytes(2, 'little') + header + data.tobytes()
+
+
+def write_npz(path, columns):
+    """写入.npz文件，可以直接用numpy.load读取"""
+    tmp_path = path + '.tmp'
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, (typecode, kind, data) in columns.items():
+            archive.writestr(f"{name}.npy", _npy_bytes(typecode, kind, data))
+    os.replace(tmp_path, path)
+
+
+class TelemetryRecorder:
+    """记录每局游戏中的事件（射击、击杀、被击中、升级）
+
+    事件写入预先分配的定长数组中，每个事件只是几次数组赋值，不创建字典；
+    游戏结束时把数据复制出来，在后台线程中写成列式的.npz文件。
+    """
+
+    def __init__(self, enabled=False, directory='telemetry', capacity=4096):
+        self.enabled = enabled
+        self.directory = directory
+        # 未启用时不预先分配
+        self.capacity = capacity if enabled else 0
+        self.columns = {name: array(typecode, bytes(array(typecode).itemsize * self.capacity))
+                        for name, (typecode, _kind) in COLUMNS.items()}
+        self.size = 0
+        self.frame = 0
+        self.game_start = perf_counter()
+        self.writers = []
+
+    def start_game(self):
+        """新的一局开始"""
+        self.size = 0
+        self.frame = 0
+        self.game_start = perf_counter()
+
+    def tick(self):
+        """每帧游戏逻辑执行后调用"""
+        self.frame += 1
+
+    def record(self, event, x=0.0, y=0.0, value=0):
+        """记录一个事件"""
+        if not self.enabled:
+            return
+        if self.size == self.capacity:
+            self._grow()
+
+        i = self.size
+        columns = self.columns
+        columns['event'][i] = event
+        columns['frame'][i] = self.frame
+        columns['time'][i] = perf_counter() - self.game_start
+        columns['x'][i] = x
+        columns['y'][i] = y
+        columns['value'][i] = value
+        self.size = i + 1
+
+    def _grow(self):
+        """容量不足时翻倍（很少发生）"""
+        extra = max(self.capacity, 1024)
+        for column in self.columns.values():
+            column.extend(array(column.typecode, bytes(column.itemsize * extra)))
+        self.capacity += extra
+
+    def finish_game(self, score, level):
+        """一局结束：复制本局数据并在后台写入文件"""
+        if not self.enabled:
+            return None
+
+        columns = {name: (typecode, kind, self.columns[name][:self.size])
+                   for name, (typecode, kind) in COLUMNS.items()}
+        columns['final_score'] = ('q', 'i', array('q', [score]))
+        columns['final_level'] = (INT32, 'i', array(INT32, [level]))
+        columns['frames'] = (UINT32, 'u', array(UINT32, [self.frame]))
+
+        filename = f"game_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.npz"
+        path = os.path.join(self.directory, filename)
+
+        # 非守护线程：退出游戏时也会等文件写完
+        writer = threading.Thread(target=self._write, args=(path, columns),
+                                  name="telemetry-writer")
+        writer.start()
+        self.writers = [w for w in self.writers if w.is_alive()] + [writer]
+        self.size = 0
+        return path
+
+    def _write(self, path, columns):
+        """后台线程中写入文件"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_npz(path, columns)
+        except (IOError, OSError) as e:
+            print(f"警告: 无法保存遥测数据 ({e})")
+
+    def wait(self):
+        """等待所有后台写入完成"""
+        for writer in self.writers:
+            writer.join()
+        self.writers = []
@@ -0,0 +1,122 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+from collections import OrderedDict
+
+import pygame
+
+
+class TransformCache:
+    """旋转、缩放、着色后的图像缓存
+
+    rotozoom和逐像素着色开销很大，不能每帧调用。结果按
+    (原图, 量化后的角度, 量化后的缩放, 颜色) 缓存，总像素内存超过budget_bytes时
+    淘汰最久没有使用的图像（LRU）。hits/misses用来评估预算是否合适。
+    """
+
+    def __init__(self, budget_bytes=4 * 1024 * 1024, angle_step=5, scale_step=0.05):
+        self.budget_bytes = budget_bytes
+        self.angle_step = angle_step
+        self.scale_step = scale_step
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, image, angle, scale, tint):
+        """量化角度和缩放，使相近的变换共用一个缓存项"""
+        angle = round(angle / self.angle_step) * self.angle_step % 360
+        scale = round(round(scale / self.scale_step) * self.scale_step, 3)
+        return (image, angle, scale, tuple(tint) if tint else None)
+
+    def get(self, image, angle=0, scale=1.0, tint=None):
+        """返回变换后的图像；没有任何变换时直接返回原图"""
+        key = self._key(image, angle, scale, tint)
+        _image, angle, scale, tint = key
+        if angle == 0 and scale == 1.0 and tint is None:
+            return image
+
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if tint is not None and (angle or scale != 1.0):
+            # 先取着色后的图像（同样会被缓存），再旋转缩放
+            surface = pygame.transform.rotozoom(self.get(image, tint=tint), angle, scale)
+        elif tint is not None:
+            surface = image.copy()
+            surface.fill((*tint, 255), special_flags=pygame.BLEND_RGBA_MULT)
+        else:
+            surface = pygame.transform.rotozoom(image, angle, scale)
+        self._store(key, surface)
+        return surface
+
+    def _store(self, key, surface):
+        """加入缓存，超出预算时淘汰最久没有使用的图像"""
+        size = surface.get_pitch() * surface.get_height()
+        if size > self.budget_bytes:
+            return
+        self.entries[key] = surface
+        self.bytes += size
+        while self.bytes > self.budget_bytes:
+            _key, old = self.entries.popitem(last=False)
+            self.bytes -= old.get_pitch() * old.get_height()
+            self.evictions += 1
+
+    def prewarm(self, image, angles=(0,), scales=(1.0,), tints=(None,)):
+        """预先生成一组变换（例如在每一关开始时），避免游戏中第一次使用时卡顿"""
+        for tint in tints:
+            for scale in scales:
+                for angle in angles:
+                    self.get(image, angle, scale, tint)
+
+    def clear(self):
+        """清空缓存"""
+        self.entries.clear()
+        self.bytes = 0
+
+    def get_metrics(self):
+        """缓存命中率和内存占用"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'budget_bytes': self.budget_bytes,
+        }
+
+
+_cache = TransformCache()
+
+
+def configure(budget_bytes, angle_step):
+    """设置共享缓存的预算和角度量化步长（会清空缓存）"""
+    global _cache
+    _cache = TransformCache(budget_bytes, angle_step)
+
+
+def get(image, angle=0, scale=1.0, tint=None):
+    """从共享缓存中获取变换后的图像"""
+    return _cache.get(image, angle, scale, tint)
+
+
+def prewarm(image, angles=(0,), scales=(1.0,), tints=(None,)):
+    """预先生成共享缓存中的一组变换"""
+    _cache.prewarm(image, angles, scales, tints)
+
+
+def angle_step():
+    """共享缓存的角度量化步长"""
+    return _cache.angle_step
+
+
+def get_metrics():
+    """共享缓存的命中率和内存占用"""
+    return _cache.get_metrics()
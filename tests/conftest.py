@@ -0,0 +1,27 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import os
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+@pytest.fixture(scope='session', autouse=True)
+def in_src():
+    """游戏按相对路径读取config.json和图像，测试在src目录中运行"""
+    cwd = os.getcwd()
+    os.chdir(SRC)
+    yield
+    os.chdir(cwd)
+
+
+@pytest.fixture(scope='session')
+def ai_game(in_src):
+    from alien_invasion import AlienInvasion
+    return AlienInvasion()
@@ -0,0 +1,79 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import math
+
+import numpy as np
+import pytest
+
+from bullet import BULLET
+from ecs import World
+
+# 外星人矩形：x, y, 宽, 高
+ALIEN_RECT = np.array([[90, 100, 60, 58]], np.float32)
+
+
+def _bullet(world, x, y, vx=0.0, vy=-300.0):
+    return np.array([world.spawn(BULLET, x, y, vx, vy, width=3, height=15)])
+
+
+def test_sweep_hits_rect_crossed_between_frames():
+    world = World()
+    # 上一帧在外星人下方（y=300），这一帧已经在上方（y=0）
+    bullets = _bullet(world, 110, 0)
+    start = _bullet(world, 110, 300, vy=0.0)
+    assert not world.overlaps(bullets, ALIEN_RECT).any()
+    assert not world.overlaps(start, ALIEN_RECT).any()
+
+    t = world.sweep(bullets, ALIEN_RECT)[0, 0]
+    assert math.isfinite(t)
+    # 子弹顶部从300移动到外星人底部158的时刻
+    assert t == pytest.approx((300 - 158) / 300)
+
+
+def test_sweep_misses_when_stationary_axis_outside_rect():
+    world = World()
+    # 水平方向不动，而且完全在外星人左侧，竖直方向的路径穿过外星人
+    bullets = _bullet(world, 10, 0)
+    assert world.sweep(bullets, ALIEN_RECT)[0, 0] == np.inf
+
+    # 对照：同样的路径在外星人的水平范围内
+    world.clear()
+    bullets = _bullet(world, 110, 0)
+    assert math.isfinite(world.sweep(bullets, ALIEN_RECT)[0, 0])
+
+
+@pytest.fixture
+def empty_field(ai_game):
+    ai_game.settings.initialize_dynamic_settings()
+    ai_game.world.clear()
+    ai_game.aliens.empty()
+    yield ai_game
+    ai_game.world.clear()
+    ai_game.aliens.empty()
+
+
+@pytest.mark.parametrize('near_first', [True, False])
+def test_bullet_hits_only_nearest_alien_on_path(empty_field, near_first):
+    game = empty_field
+    height = game.settings.screen_height
+    # 同一列的两个外星人，子弹从下往上一帧穿过两者
+    positions = [(100, 300), (100, 100)]
+    if not near_first:
+        positions.reverse()
+    for x, y in positions:
+        game._create_alien(x, y)
+    near, far = sorted(game.aliens.sprites(), key=lambda alien: -alien.y)
+    # 留一个不在路径上的外星人，避免消灭全部外星人后进入下一关
+    game._create_alien(600, 100)
+
+    game.world.spawn(BULLET, near.rect.centerx, 0, 0.0, -(height - 10), width=3, height=15)
+    times = game.world.sweep(game.world.indices(BULLET),
+                             np.array([near.rect, far.rect], np.float32))
+    assert np.isfinite(times).all() and times[0, 0] < times[0, 1]
+
+    game._check_bullet_alien_collisions()
+    game.world.flush()
+    assert near not in game.aliens
+    assert far in game.aliens
+    assert game.world.count_kind(BULLET) == 0
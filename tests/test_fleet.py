@@ -0,0 +1,61 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import pytest
+
+# 俯冲路径中旋转45度的一段，旋转后的图像比队形中的外星人大
+ROTATED_PATH = [(0, 0, 45)] * 5
+
+
+@pytest.fixture
+def fleet(ai_game, monkeypatch):
+    monkeypatch.setattr(ai_game.settings, 'rotate_divers', True)
+    # 和开始新的一局时一样，舰队向右移动
+    ai_game.settings.initialize_dynamic_settings()
+    ai_game.world.clear()
+    ai_game.aliens.empty()
+    ai_game._create_fleet()
+    yield ai_game
+    ai_game.aliens.empty()
+
+
+def _dive(alien):
+    """让外星人开始俯冲并走一帧，rect变为旋转后的图像"""
+    alien.start_dive(ROTATED_PATH)
+    alien.update()
+    assert alien.rect.size > alien.base_image.get_size()
+
+
+def test_diving_edge_alien_does_not_turn_fleet(fleet):
+    alien = fleet.fleet_right
+    _dive(alien)
+    width = alien.base_image.get_width()
+    y_before = alien.y
+
+    # 队形中的右边缘离屏幕边缘还差几像素，旋转后的图像已经超过边缘
+    alien.x = fleet.settings.screen_width - width - 5
+    assert alien.x + alien.rect.width >= fleet.settings.screen_width
+    fleet._check_fleet_edges()
+    assert fleet.settings.fleet_direction == 1
+    assert alien.y == y_before
+
+    alien.x = fleet.settings.screen_width - width
+    fleet._check_fleet_edges()
+    assert fleet.settings.fleet_direction == -1
+
+
+def test_diving_bottom_alien_does_not_end_the_round(fleet, monkeypatch):
+    hits = []
+    monkeypatch.setattr(fleet, '_ship_hit', lambda: hits.append(1))
+    alien = fleet.fleet_bottom
+    _dive(alien)
+    height = alien.base_image.get_height()
+
+    alien.y = fleet.settings.screen_height - height - 5
+    assert alien.y + alien.rect.height >= fleet.settings.screen_height
+    fleet._check_aliens_bottom()
+    assert hits == []
+
+    alien.y = fleet.settings.screen_height - height
+    fleet._check_aliens_bottom()
+    assert hits == [1]
@@ -0,0 +1,105 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import pygame
+import pytest
+
+from input_system import FIRE, LEFT, RIGHT, InputSystem
+
+
+@pytest.fixture
+def input_system(ai_game):
+    """新的InputSystem，事件队列为空"""
+    pygame.event.clear()
+    return InputSystem()
+
+
+def post(event_type, **attributes):
+    pygame.event.post(pygame.event.Event(event_type, **attributes))
+
+
+def tick(input_system):
+    input_system.poll()
+    return input_system.snapshot()
+
+
+def test_held_key_stays_down_until_released(input_system):
+    post(pygame.KEYDOWN, key=pygame.K_RIGHT)
+    assert tick(input_system).is_down(RIGHT)
+    assert tick(input_system).is_down(RIGHT)
+
+    post(pygame.KEYUP, key=pygame.K_RIGHT)
+    snapshot = tick(input_system)
+    assert not snapshot.is_down(RIGHT)
+    assert not snapshot.is_down(LEFT)
+
+
+def test_unmapped_keys_do_not_affect_movement(input_system):
+    """普通按键不会让左右键失控"""
+    post(pygame.KEYDOWN, key=pygame.K_LEFT)
+    post(pygame.KEYDOWN, key=pygame.K_m)
+    post(pygame.KEYUP, key=pygame.K_LEFT)
+    post(pygame.KEYUP, key=pygame.K_m)
+    tick(input_system)
+    snapshot = tick(input_system)
+    assert snapshot.held == frozenset()
+    assert not snapshot.is_down(LEFT)
+
+
+def test_tap_between_ticks_moves_for_one_tick(input_system):
+    post(pygame.KEYDOWN, key=pygame.K_a)
+    post(pygame.KEYUP, key=pygame.K_a)
+    assert tick(input_system).is_down(LEFT)
+    assert not tick(input_system).is_down(LEFT)
+
+
+def test_both_keys_for_an_action_must_be_released(input_system):
+    post(pygame.KEYDOWN, key=pygame.K_RIGHT)
+    post(pygame.KEYDOWN, key=pygame.K_d)
+    post(pygame.KEYUP, key=pygame.K_RIGHT)
+    assert tick(input_system).held == frozenset({RIGHT})
+
+
+def test_focus_loss_releases_held_keys(input_system):
+    post(pygame.KEYDOWN, key=pygame.K_LEFT)
+    assert tick(input_system).is_down(LEFT)
+    # 失去焦点后收不到KEYUP
+    post(pygame.WINDOWFOCUSLOST, window=None)
+    assert not tick(input_system).is_down(LEFT)
+
+
+def test_every_fire_press_counts(input_system):
+    post(pygame.KEYDOWN, key=pygame.K_SPACE)
+    post(pygame.KEYUP, key=pygame.K_SPACE)
+    post(pygame.KEYDOWN, key=pygame.K_SPACE)
+    assert tick(input_system).presses(FIRE) == 2
+    assert tick(input_system).presses(FIRE) == 0
+
+
+def test_snapshot_is_immutable(input_system):
+    post(pygame.KEYDOWN, key=pygame.K_RIGHT)
+    snapshot = tick(input_system)
+    post(pygame.KEYUP, key=pygame.K_RIGHT)
+    tick(input_system)
+    assert snapshot.is_down(RIGHT)
+    with pytest.raises(AttributeError):
+        snapshot.held = frozenset()
+
+
+def test_unused_events_are_dropped(input_system):
+    post(pygame.MOUSEMOTION, pos=(1, 1), rel=(1, 1), buttons=(0, 0, 0))
+    post(pygame.KEYDOWN, key=pygame.K_q)
+    assert [event.type for event in input_system.poll()] == [pygame.KEYDOWN]
+
+
+def test_latency_recorded_once_per_press(input_system):
+    post(pygame.KEYDOWN, key=pygame.K_RIGHT)
+    # 按住时的自动重复
+    post(pygame.KEYDOWN, key=pygame.K_RIGHT)
+    snapshot = tick(input_system)
+    assert input_system.latency.count == 0
+    input_system.presented(snapshot.tick - 1)
+    assert input_system.latency.count == 0
+    input_system.presented(snapshot.tick)
+    assert input_system.latency.count == 1
+    assert input_system.get_metrics()['presses'] == 1
@@ -0,0 +1,26 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import pytest
+
+import memory_report
+
+
+@pytest.fixture(scope='module')
+def results(ai_game):
+    return memory_report.measure_entities(ai_game, 500)
+
+
+@pytest.mark.parametrize('name', sorted(memory_report.BUDGETS))
+def test_entity_within_memory_budget(results, name):
+    """每个实体的Python堆内存加分摊的图像内存不超过BUDGETS中的预算"""
+    total = results[name]['python'] + results[name]['surface']
+    assert total <= memory_report.BUDGETS[name], \
+        f"{name}: {total:.0f} B > {memory_report.BUDGETS[name]} B"
+
+
+def test_sprite_attributes_live_in_slots(ai_game):
+    """属性都在__slots__中，实例的__dict__保持为空"""
+    from alien import Alien
+    assert vars(Alien(ai_game)) == {}
+    assert vars(ai_game.ship) == {}
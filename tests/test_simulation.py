@@ -0,0 +1,74 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import threading
+from time import perf_counter
+
+import pytest
+
+from simulation import SimulationThread, SnapshotBuffer
+
+
+def test_wait_times_out_on_empty_buffer():
+    assert SnapshotBuffer().wait(0, 0.01) == (0, None)
+
+
+def test_wait_returns_latest_published_snapshot():
+    buffer = SnapshotBuffer()
+    buffer.publish('a')
+    assert buffer.wait(0, 0.01) == (1, 'a')
+    buffer.publish('b')
+    buffer.publish('c')
+    # 来不及绘制的一帧被新的一帧替换
+    assert buffer.wait(1, 0.01) == (3, 'c')
+
+
+def test_wait_without_new_snapshot_returns_current_after_timeout():
+    buffer = SnapshotBuffer()
+    buffer.publish('a')
+    start = perf_counter()
+    assert buffer.wait(1, 0.05) == (1, 'a')
+    assert perf_counter() - start >= 0.04
+
+
+def test_publish_wakes_waiting_renderer():
+    buffer = SnapshotBuffer()
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(buffer.wait(0, 5)))
+    start = perf_counter()
+    waiter.start()
+    buffer.publish('a')
+    waiter.join()
+    assert result == [(1, 'a')]
+    assert perf_counter() - start < 1
+
+
+def test_record_render_counts_superseded_snapshots():
+    simulation = SimulationThread(ai_game=None)
+    simulation.record_render(1, 0)
+    simulation.record_render(2, 1)
+    simulation.record_render(5, 2)
+    # 重复绘制同一帧不会算作被替换
+    simulation.record_render(5, 5)
+    assert simulation.rendered == 4
+    assert simulation.superseded == 2
+
+
+def test_check_reraises_simulation_error():
+    simulation = SimulationThread(ai_game=None)
+    simulation.check()
+    simulation.error = ValueError("boom")
+    with pytest.raises(RuntimeError) as info:
+        simulation.check()
+    assert isinstance(info.value.__cause__, ValueError)
+
+
+def test_cursor_change_is_deferred_in_threaded_mode(ai_game, monkeypatch):
+    """模拟线程中不直接调用pygame.mouse，由主线程执行"""
+    calls = []
+    monkeypatch.setattr('pygame.mouse.set_visible', calls.append)
+    monkeypatch.setattr(ai_game, 'simulation', SimulationThread(ai_game))
+    ai_game._set_cursor_visible(True)
+    assert calls == []
+    assert ai_game.pending_cursor is True
+    monkeypatch.setattr(ai_game, 'pending_cursor', None)
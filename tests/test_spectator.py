@@ -0,0 +1,107 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import zlib
+
+import numpy as np
+
+from spectator import (DELTA, KEYFRAME, LIST_HEADER, MESSAGE_HEADER, SCALARS, Frame,
+                       SpectatorDecoder, encode_frame, make_points)
+
+META = (1200, 800, 60, 48, 60, 58, 3, 15, 6, 6)
+
+
+def make_frame(tick, shift=0, aliens=3, score=0):
+    bullets = make_points([(100 + shift, 500 - tick), (120, 400)])
+    projectiles = make_points([])
+    fleet = make_points([(60 + 120 * i + shift, 58 + tick) for i in range(aliens)])
+    return Frame(tick, (score, 1, 3, 1, 570 + shift, 752), (bullets, projectiles, fleet))
+
+
+def assert_same_frame(decoded, frame):
+    assert decoded.tick == frame.tick
+    assert decoded.scalars == frame.scalars
+    for points, expected in zip(decoded.lists, frame.lists):
+        assert points.dtype == np.int16
+        np.testing.assert_array_equal(points, expected)
+
+
+def message_kind(message):
+    return MESSAGE_HEADER.unpack_from(message)[1]
+
+
+def test_keyframe_round_trip():
+    frame = make_frame(1, score=1250)
+    message = encode_frame(frame, META)
+    assert message_kind(message) == KEYFRAME
+
+    decoder = SpectatorDecoder()
+    assert_same_frame(decoder.feed(message), frame)
+    assert decoder.meta == META
+
+
+def test_deltas_chain_on_previous_frame():
+    decoder = SpectatorDecoder()
+    previous = make_frame(1)
+    decoder.feed(encode_frame(previous, META))
+    for tick in range(2, 6):
+        frame = make_frame(tick, shift=tick * 3, score=tick * 50)
+        message = encode_frame(frame, META, base=previous)
+        assert message_kind(message) == DELTA
+        assert_same_frame(decoder.feed(message), frame)
+        previous = frame
+
+
+def test_list_length_change_sends_full_coordinates():
+    decoder = SpectatorDecoder()
+    base = make_frame(1, aliens=3)
+    decoder.feed(encode_frame(base, META))
+
+    # 一个外星人被击落，数量变化的列表改为发送完整坐标
+    frame = make_frame(2, shift=2, aliens=2)
+    message = encode_frame(frame, META, base=base)
+    assert_same_frame(decoder.feed(message), frame)
+
+
+def test_list_length_change_uses_full_coordinates_flag():
+    base = make_frame(1, aliens=3)
+    frame = make_frame(2, aliens=2)
+    payload = zlib.decompress(encode_frame(frame, META, base=base)[MESSAGE_HEADER.size:])
+    offset = SCALARS.size
+    flags = []
+    for points in frame.lists:
+        is_delta, count = LIST_HEADER.unpack_from(payload, offset)
+        flags.append(is_delta)
+        assert count == len(points)
+        offset += LIST_HEADER.size + count * 4
+    # 子弹和敌方子弹数量不变（差值），外星人数量变化（完整坐标）
+    assert flags == [1, 1, 0]
+
+
+def test_message_split_across_feeds():
+    frame = make_frame(1)
+    message = encode_frame(frame, META)
+    decoder = SpectatorDecoder()
+    # 头部都还没有收完
+    assert decoder.feed(message[:5]) is None
+    assert decoder.feed(message[5:-3]) is None
+    assert_same_frame(decoder.feed(message[-3:]), frame)
+    assert decoder.buffer == bytearray()
+
+
+def test_several_messages_in_one_feed_return_latest():
+    first, second = make_frame(1), make_frame(2, shift=4)
+    data = encode_frame(first, META) + encode_frame(second, META, base=first)
+    assert_same_frame(SpectatorDecoder().feed(data), second)
+
+
+def test_delta_before_keyframe_is_dropped():
+    first, second = make_frame(1), make_frame(2, shift=4)
+    decoder = SpectatorDecoder()
+    assert decoder.feed(encode_frame(second, META, base=first)) is None
+    assert decoder.frame is None
+    assert decoder.buffer == bytearray()
+
+    # 之后的关键帧正常解码
+    third = make_frame(3, shift=8)
+    assert_same_frame(decoder.feed(encode_frame(third, META)), third)
@@ -0,0 +1,67 @@
+# Copyright (c) 2025 tree_division
+# Licensed under the MIT License
+
+import json
+
+import numpy as np
+import pytest
+
+from stats_engine import StatisticsEngine
+
+
+@pytest.fixture
+def history():
+    """45局对局记录，最新的在前，包括若干0分"""
+    rng = np.random.default_rng(7)
+    scores = rng.integers(50, 20000, size=45)
+    scores[[0, 3, 17, 40]] = 0
+    levels = rng.integers(1, 8, size=45)
+    return [{"score": int(score), "level": int(level)} for score, level in zip(scores, levels)]
+
+
+def _expected_summary(history):
+    scores = np.array([session["score"] for session in history], float)
+    best = {}
+    for session in history:
+        best[session["level"]] = max(best.get(session["level"], -1), session["score"])
+    return {
+        "score_mean": round(scores.mean()),
+        "score_std_dev": round(scores.std(ddof=1)),
+        "rolling_average_7": round(scores[:7].mean()),
+        "rolling_average_30": round(scores[:30].mean()),
+        "best_per_level": dict(sorted(best.items())),
+    }, scores
+
+
+def test_summary_matches_direct_calculation(history):
+    summary = StatisticsEngine.from_history(history).summary()
+    expected, scores = _expected_summary(history)
+    for key, value in expected.items():
+        assert summary[key] == value, key
+
+    # 分位数来自草图，相对误差不超过1%（再加上取整）
+    for q, key in ((0.5, "score_p50"), (0.9, "score_p90"), (0.99, "score_p99")):
+        exact = np.quantile(scores, q, method='lower')
+        assert summary[key] == pytest.approx(exact, rel=0.01, abs=1), key
+
+
+def test_zero_scores_in_low_quantiles():
+    history = [{"score": 0, "level": 1}] * 20 + [{"score": 1000, "level": 2}] * 20
+    summary = StatisticsEngine.from_history(history).summary()
+    assert summary["score_p50"] == 0
+    assert summary["score_p90"] == pytest.approx(1000, rel=0.01)
+    assert summary["rolling_average_7"] == 0
+    assert summary["rolling_average_30"] == round(10 * 1000 / 30)
+    assert summary["best_per_level"] == {1: 0, 2: 1000}
+
+
+def test_round_trip_preserves_summary(history):
+    engine = StatisticsEngine.from_history(history)
+    # 和DataManager一样经过JSON保存和读取
+    restored = StatisticsEngine.from_dict(json.loads(json.dumps(engine.to_dict())))
+    assert restored.summary() == engine.summary()
+
+    # 恢复后继续加入对局，结果和没有中断过一样
+    engine.add(1234, 3)
+    restored.add(1234, 3)
+    assert restored.summary() == engine.summary()